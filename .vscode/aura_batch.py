@@ -0,0 +1,48 @@
+"""
+Batch mode: transcribe WAV files and detect objects in videos offline
+Usage: python aura_batch.py recordings/ more.wav --out results.jsonl --workers 4
+"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Ensure project root is on sys.path so `modules` package can be imported
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.batch import BatchOptions, run_batch
+from modules.inference_config import InferenceConfig
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="AURA-AI offline batch processing")
+    parser.add_argument("paths", nargs="+", help="WAV/MP4 files or directories")
+    parser.add_argument("--out", default="aura_results.jsonl", help="JSONL output file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--threads", type=int, default=1, help="torch threads per worker (0 = default)")
+    parser.add_argument("--batch", type=int, default=8, help="video frames per model call")
+    parser.add_argument("--stride", type=int, default=1, help="detect every Nth video frame")
+    parser.add_argument("--whisper", default="whisper-base", help="speech model name")
+    parser.add_argument("--yolo", default="yolov8n", help="detection model name")
+    parser.add_argument("--no-vad", action="store_true", help="transcribe silence too")
+    args = parser.parse_args(argv)
+
+    options = BatchOptions(whisper=args.whisper, yolo=args.yolo, batch_size=args.batch,
+                           stride=args.stride, use_vad=not args.no_vad,
+                           threads_per_worker=args.threads, config=InferenceConfig.from_env())
+
+    def progress(report):
+        status = f"❌ {report.error}" if report.error else f"✓ {len(report.records)} records"
+        print(f"  {report.path}: {status} ({report.seconds:.1f}s)")
+
+    print(f"=== AURA-AI Batch Mode ({args.workers} workers) ===")
+    totals = run_batch(args.paths, args.out, workers=args.workers, options=options, on_report=progress)
+    print(f"📝 Wrote {totals['records']} records from {totals['files']} files to {args.out}")
+    print(f"⏱️  {totals['audio_seconds_per_sec']:.1f} audio-seconds/sec, "
+          f"{totals['frames_per_sec']:.1f} frames/sec in {totals['seconds']:.1f}s")
+    return 1 if totals["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,3 +1,4 @@
+import os
 import sys
 from pathlib import Path
 
@@ -6,27 +7,93 @@ ROOT = Path(__file__).resolve().parent.parent
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from modules import speech_to_text, sound_alert, object_detection, voice_object_detection
+from modules.lazy import lazy_import
+
+# Mode modules are executed on first use so the menu appears before any of
+# them (or numpy, cv2 and torch behind them) is loaded
+speech_to_text = lazy_import("modules.speech_to_text")
+sound_alert = lazy_import("modules.sound_alert")
+object_detection = lazy_import("modules.object_detection")
+voice_object_detection = lazy_import("modules.voice_object_detection")
+model_registry = lazy_import("modules.model_registry")
+supervisor = lazy_import("modules.supervisor")
+metrics = lazy_import("modules.metrics")
+
+# Models to start loading while the menu is showing (none by default), e.g. AURA_PRELOAD="yolov8n,whisper-base"
+PRELOAD = [name for name in os.environ.get("AURA_PRELOAD", "").split(",") if name]
+
+def preload_models():
+    """Warm up the models of the installed modes in the background"""
+    available = []
+    if object_detection.HAS_VISION or voice_object_detection.HAS_VOICE_VISION:
+        available += [name for name in PRELOAD if name.startswith("yolo")]
+    if speech_to_text.HAS_WHISPER:
+        available += [name for name in PRELOAD if name.startswith("whisper")]
+    if available:
+        model_registry.preload(*available)
+
+def run_combined():
+    """Ask which modes to run together, e.g. alerts,detection"""
+    print(f"Available: {', '.join(supervisor.MODES)}")
+    try:
+        answer = input("Modes to combine [alerts,detection]: ")
+    except EOFError:
+        return
+    modes = [m.strip() for m in answer.split(",") if m.strip()] or ["alerts", "detection"]
+    unknown = [m for m in modes if m not in supervisor.MODES]
+    if unknown:
+        print(f"Invalid choice: {', '.join(unknown)}")
+        return
+    supervisor.run(modes)
+
+def start_metrics():
+    """Print a metrics summary every AURA_METRICS_INTERVAL seconds, if set"""
+    interval = float(os.environ.get("AURA_METRICS_INTERVAL", "0") or 0)
+    if interval > 0:
+        metrics.metrics.start_reporter(interval)
+
+def save_metrics():
+    """Write the metrics so far to AURA_METRICS_FILE (.prom for Prometheus, else JSON)"""
+    path = os.environ.get("AURA_METRICS_FILE")
+    if path:
+        metrics.metrics.dump(path)
+        print(f"📊 Metrics saved to {path}")
 
 def main():
-    print("=== AURA-AI Assistive System ===")
-    print("1 - Speech to Text (Deaf)")
-    print("2 - Sound Alert (Deaf)")
-    print("3 - Object Detection (Blind)")
-    print("4 - Voice Object Detection (Blind)")
-    choice = input("Choose mode: ")
-
-    if choice == "1":
-        speech_to_text.run()
-    elif choice == "2":
-        sound_alert.run()
-    elif choice == "3":
-        object_detection.run()
-    elif choice == "4":
-        voice_object_detection.run()
-    else:
-        print("Invalid choice")
+    preload_models()
+    start_metrics()
+    while True:
+        print("=== AURA-AI Assistive System ===")
+        print("1 - Speech to Text (Deaf)")
+        print("2 - Sound Alert (Deaf)")
+        print("3 - Object Detection (Blind)")
+        print("4 - Voice Object Detection (Blind)")
+        print("5 - Live Captions (Deaf)")
+        print("6 - Combined Modes (Deaf-Blind)")
+        print("0 - Exit")
+        try:
+            choice = input("Choose mode: ")
+        except EOFError:
+            break
+
+        if choice == "1":
+            speech_to_text.run()
+        elif choice == "2":
+            sound_alert.run()
+        elif choice == "3":
+            object_detection.run()
+        elif choice == "4":
+            voice_object_detection.run()
+        elif choice == "5":
+            speech_to_text.run_live()
+        elif choice == "6":
+            run_combined()
+        elif choice == "0":
+            break
+        else:
+            print("Invalid choice")
+            continue
+        save_metrics()
 
 if __name__ == "__main__":
     main()
-
@@ -0,0 +1,128 @@
+"""
+Compare detector backends (PyTorch vs cached ONNX export) on identical frames
+Usage: python benchmarks/bench_backends.py [clip.mp4] [--backends torch,onnx] [--frames 100]
+       [--weights yolov8n.pt] [--imgsz 640] [--json out.json]
+
+Each backend runs in a fresh process so startup and memory are not shared:
+startup is import + load + first inference (an ONNX export is built on the
+very first run and reported separately), latency is per-frame p50/p95
+after that, and peak RSS is the process high-water mark. "agree" is the
+share of frames where the backend finds as many boxes as the first one.
+Without a clip, random frames are used (latency only means something then).
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_frames(path, limit):
+    import cv2  # type: ignore
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise SystemExit(f"❌ Error: no frames read from {path}")
+    return frames
+
+
+def measure(name, weights, frames, imgsz, results):
+    try:
+        results.put(_measure(name, weights, frames, imgsz))
+    except Exception as e:
+        results.put({"backend": name, "error": f"{type(e).__name__}: {e}"})
+
+
+def _measure(name, weights, frames, imgsz):
+    """Child process: everything from the first import is timed"""
+    started = time.perf_counter()
+    from modules.backends import BACKENDS
+    backend = BACKENDS[name]
+    exports = 0
+    if hasattr(backend, "prepare"):
+        before = time.perf_counter()
+        cached = backend.artifact(weights).exists()
+        backend.prepare(weights)
+        exports = 0.0 if cached else time.perf_counter() - before
+    model = backend.load(weights)
+    model(frames[0], imgsz=imgsz, verbose=False)
+    startup = time.perf_counter() - started - exports
+
+    latencies, counts = [], []
+    for frame in frames:
+        t0 = time.perf_counter()
+        result = model(frame, imgsz=imgsz, verbose=False)[0]
+        latencies.append(time.perf_counter() - t0)
+        counts.append(len(result.boxes))
+    lat = np.asarray(latencies) * 1000
+    return {
+        "backend": name, "startup_s": startup, "export_s": exports,
+        "p50_ms": float(np.percentile(lat, 50)), "p95_ms": float(np.percentile(lat, 95)),
+        "fps": len(frames) / float(np.sum(latencies)), "peak_rss_mb": peak_rss_mb(), "counts": counts,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("video", nargs="?")
+    parser.add_argument("--backends", default="torch,onnx")
+    parser.add_argument("--frames", type=int, default=100)
+    parser.add_argument("--weights", default="yolov8n.pt")
+    parser.add_argument("--imgsz", type=int, default=640)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    if args.video:
+        frames = load_frames(args.video, args.frames)
+    else:
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(args.frames)]
+
+    ctx = mp.get_context("spawn")
+    rows = []
+    print(f"{'backend':>8} {'startup s':>10} {'export s':>9} {'p50 ms':>8} {'p95 ms':>8} {'fps':>7} "
+          f"{'peak MB':>8} {'agree':>6}")
+    for name in args.backends.split(","):
+        results = ctx.Queue()
+        proc = ctx.Process(target=measure, args=(name, args.weights, frames, args.imgsz, results))
+        proc.start()
+        row = results.get()
+        proc.join()
+        if "error" in row:
+            raise SystemExit(f"❌ Error: {name} backend failed: {row['error']}")
+        reference = rows[0]["counts"] if rows else row["counts"]
+        row["agree"] = float(np.mean(np.asarray(row["counts"]) == np.asarray(reference)))
+        rows.append(row)
+        print(f"{name:>8} {row['startup_s']:10.2f} {row['export_s']:9.2f} {row['p50_ms']:8.1f} "
+              f"{row['p95_ms']:8.1f} {row['fps']:7.1f} {row['peak_rss_mb']:8.0f} {row['agree']:6.0%}")
+
+    if args.json:
+        for row in rows:
+            del row["counts"]
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Per-frame detection post-processing: time and memory per frame, per-box objects vs DetectionFrame
+Usage: python benchmarks/bench_detections.py [--objects 20] [--frames 2000] [--json out.json]
+
+Each frame carries ``--objects`` detections in an ultralytics-shaped
+result (torch-like tensors faked with NumPy). Three ways of turning it into
+what the announcer, event log and overlay need are compared:
+
+* per-box: iterate ``boxes`` and index each box's tensors (``int(box.cls[0])``,
+  ``names[cls]``) into a dict per detection;
+* arrays: pull xyxy, cls and conf out as three arrays, names via a list
+  comprehension;
+* DetectionFrame: one copy of ``boxes.data`` into a structured array, names
+  through the interned label table.
+
+Each path then does the same consumer work: a spoken summary, queuing the
+frame in an EventLog, and integer overlay coordinates with captions.
+Reported: µs per frame (p50/p95) and peak bytes allocated per frame
+(tracemalloc). Exits 1 if DetectionFrame is slower than per-box.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from modules.announcer import summarize
+from modules.detections import DetectionFrame
+from modules.event_log import EventLog
+from modules.replay import Result
+
+NAMES = {i: f"class {i}" for i in range(80)}
+NAMES.update({0: "person", 2: "car", 16: "dog", 56: "chair", 62: "tv", 63: "laptop"})
+
+
+def results(frames, objects, seed=0):
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(frames):
+        xy = rng.uniform(0, 560, (objects, 2))
+        data = np.column_stack((xy, xy + rng.uniform(20, 80, (objects, 2)), rng.uniform(0.25, 1.0, objects),
+                                rng.choice([0, 0, 0, 2, 16, 56, 62, 63], objects)))
+        out.append(Result(NAMES, data))
+    return out
+
+
+def per_box(result, log, seq):
+    names = result.names
+    detections = []
+    for box in result.boxes:
+        cls = int(box.cls[0])
+        detections.append({"label": names[cls], "conf": float(box.conf[0]), "xyxy": box.xyxy[0].tolist()})
+    labels = [d["label"] for d in detections]
+    text = summarize(labels)
+    log.detections(labels, [d["conf"] for d in detections], [d["xyxy"] for d in detections], frame=seq)
+    overlay = [([int(v) for v in d["xyxy"]], d["label"]) for d in detections]
+    return text, overlay
+
+
+def arrays(result, log, seq):
+    boxes = result.boxes
+    xyxy, classes, conf = boxes.xyxy.cpu().numpy(), boxes.cls.cpu().numpy().astype(int), boxes.conf.cpu().numpy()
+    labels = [result.names[c] for c in classes]
+    text = summarize(labels)
+    log.detections(labels, conf, xyxy, frame=seq)
+    overlay = list(zip(xyxy.astype(np.int32).tolist(), labels))
+    return text, overlay
+
+
+def detection_frame(result, log, seq):
+    frame = DetectionFrame.from_results(result, seq=seq)
+    labels = frame.names()
+    text = summarize(labels)
+    log.log_frame(frame)
+    overlay = list(zip(frame.boxes.astype(np.int32).tolist(), labels))
+    return text, overlay
+
+
+PATHS = {"per-box": per_box, "arrays": arrays, "DetectionFrame": detection_frame}
+
+
+def measure(fn, frames, root):
+    log = EventLog(root)
+    times = np.empty(len(frames))
+    for i, result in enumerate(frames):
+        started = time.perf_counter()
+        fn(result, log, i)
+        times[i] = time.perf_counter() - started
+    peaks = []
+    tracemalloc.start()
+    for i, result in enumerate(frames[:200]):
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        fn(result, log, i)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return {"p50_us": float(np.percentile(times, 50) * 1e6), "p95_us": float(np.percentile(times, 95) * 1e6),
+            "peak_kb": float(np.median(peaks) / 1024)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--objects", type=int, default=20, help="detections per frame")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    frames = results(args.frames, args.objects)
+    rows = {}
+    with tempfile.TemporaryDirectory() as root:
+        for name, fn in PATHS.items():
+            rows[name] = measure(fn, frames, Path(root) / name)
+
+    print(f"{args.objects} detections per frame")
+    print(f"{'path':>16} {'p50 µs':>8} {'p95 µs':>8} {'peak KB':>8}")
+    for name, row in rows.items():
+        print(f"{name:>16} {row['p50_us']:8.1f} {row['p95_us']:8.1f} {row['peak_kb']:8.1f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+    if rows["DetectionFrame"]["p50_us"] > rows["per-box"]["p50_us"]:
+        print("❌ DetectionFrame is slower than per-box post-processing")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
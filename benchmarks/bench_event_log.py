@@ -0,0 +1,125 @@
+"""
+Event log write throughput at 30 FPS detection rates, and query latency
+Usage: python benchmarks/bench_event_log.py [--minutes 10] [--objects 5] [--budget-us 200] [--json out.json]
+
+Feeds ``--minutes`` of simulated 30 FPS detections (``--objects`` per
+frame, plus an alert every 10 s and a transcript every 5 s) into an
+EventLog with its background flush thread running, as fast as the writer
+can go. Reported: the per-frame cost of ``detections()`` on the caller's
+thread, sustained frames/sec including flushes, flush time, bytes per
+event, and the time for typical review queries on the result.
+
+Exits 1 if the log cannot keep up with 30 FPS or the per-frame p95 cost
+exceeds ``--budget-us``.
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from modules.event_log import FLUSH, EventLog
+
+FPS = 30
+LABELS = ["person", "chair", "car", "dog", "cup", "laptop", "bicycle", "bottle"]
+
+
+def write(log, minutes, objects, seed=0):
+    """Feed the log; returns per-frame call times in seconds and the wall time"""
+    rng = np.random.default_rng(seed)
+    frames = int(minutes * 60 * FPS)
+    boxes = rng.uniform(0, 640, (frames, objects, 4)).astype(np.float32)
+    scores = rng.uniform(0.25, 1.0, (frames, objects)).astype(np.float32)
+    labels = [[LABELS[i] for i in row] for row in rng.integers(0, len(LABELS), (frames, objects))]
+    calls = np.empty(frames)
+    started = time.perf_counter()
+    for frame in range(frames):
+        t = frame / FPS
+        call = time.perf_counter()
+        log.detections(labels[frame], scores[frame], boxes[frame], frame=frame, t=t)
+        calls[frame] = time.perf_counter() - call
+        if frame % (10 * FPS) == 0:
+            log.alert("doorbell", 0.8, -15.0, t=t)
+        if frame % (5 * FPS) == 0:
+            log.transcript(f"caption number {frame // (5 * FPS)}", duration=5.0, t=t)
+    log.stop()
+    return calls, time.perf_counter() - started
+
+
+def time_query(fn, repeat=20):
+    best = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best.append(time.perf_counter() - started)
+    return float(np.median(best))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=10.0, help="simulated minutes of detections")
+    parser.add_argument("--objects", type=int, default=5, help="detections per frame")
+    parser.add_argument("--segment-mb", type=float, default=8.0)
+    parser.add_argument("--flush-interval", type=float, default=0.25)
+    parser.add_argument("--budget-us", type=float, default=200.0, help="p95 per-frame write cost allowed")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as root:
+        log = EventLog(root, segment_bytes=int(args.segment_mb * (1 << 20)), max_bytes=1 << 40,
+                       flush_interval=args.flush_interval).start()
+        calls, wall = write(log, args.minutes, args.objects)
+        log = EventLog(root)  # reopen from disk for the queries
+        end = args.minutes * 60
+        queries = {
+            "last minute": lambda: log.query(end - 60, end),
+            "last minute, person": lambda: log.query(end - 60, end, labels="person"),
+            "all alerts": lambda: log.query(kind="alert"),
+            "counts, last 10 min": lambda: log.counts(end - 600, end),
+            "transcripts, last 5 min": lambda: log.transcripts(end - 300, end),
+        }
+        result = {
+            "frames": len(calls),
+            "events": log.count,
+            "segments": len(log.segments),
+            "call_p50_us": float(np.percentile(calls, 50) * 1e6),
+            "call_p95_us": float(np.percentile(calls, 95) * 1e6),
+            "sustained_fps": len(calls) / wall,
+            "events_per_sec": log.count / wall,
+            "flush_p95_ms": FLUSH.quantile(0.95) * 1000,
+            "bytes_per_event": log.nbytes / log.count,
+            "queries_ms": {name: time_query(fn) * 1000 for name, fn in queries.items()},
+        }
+
+    print(f"{result['frames']} frames, {result['events']} events in {result['segments']} segments")
+    print(f"detections() per frame: p50 {result['call_p50_us']:.1f} µs, p95 {result['call_p95_us']:.1f} µs")
+    print(f"sustained: {result['sustained_fps']:.0f} frames/s ({result['sustained_fps'] / FPS:.0f}x real time), "
+          f"{result['events_per_sec']:.0f} events/s, flush p95 {result['flush_p95_ms']:.1f} ms")
+    print(f"storage: {result['bytes_per_event']:.1f} bytes/event")
+    print(f"{'query':>26} {'ms':>8}")
+    for name, ms in result["queries_ms"].items():
+        print(f"{name:>26} {ms:8.2f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+
+    failed = []
+    if result["sustained_fps"] < FPS:
+        failed.append(f"cannot sustain {FPS} FPS")
+    if result["call_p95_us"] > args.budget_us:
+        failed.append(f"p95 per-frame cost over {args.budget_us:.0f} µs")
+    if failed:
+        print("❌ " + "; ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Compare handing camera frames to a worker process by copy (pickled through a
+multiprocessing.Queue) vs through the shared-memory FrameBus
+Usage: python benchmarks/bench_frame_bus.py [--video clip.mp4] [--frames 300] [--json out.json]
+
+For each frame size the producer sends ``--frames`` frames to one consumer
+process, which touches every frame (a mean over a row) like a detector
+pre-processing step would. Reported: frames/sec and producer-to-consumer
+latency p50/p95.
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from modules.frame_bus import FrameBus, VideoSource
+
+SIZES = [(480, 640, 3), (720, 1280, 3), (1080, 1920, 3)]
+SLOTS = 8
+
+
+def queue_consumer(frames, count, latencies):
+    out = []
+    for _ in range(count):
+        sent, frame = frames.get()
+        frame[frame.shape[0] // 2].mean()
+        out.append(time.monotonic() - sent)
+    latencies.put(out)
+
+
+def shm_consumer(spec, count, consumed, latencies):
+    bus = FrameBus.attach(**spec)
+    reader = bus.subscribe()
+    reader.poll = 0.0001
+    reader.last_seq = -1
+    out = []
+    for _ in range(count):
+        frame = reader.next(timeout=10)
+        frame.image[frame.image.shape[0] // 2].mean()
+        out.append(time.monotonic() - frame.timestamp)
+        consumed.value = frame.seq + 1
+    latencies.put(out)
+    bus.release()
+
+
+def run_queue(ctx, frames, count):
+    queue, latencies = ctx.Queue(maxsize=SLOTS), ctx.Queue()
+    worker = ctx.Process(target=queue_consumer, args=(queue, count, latencies))
+    worker.start()
+    time.sleep(0.5)  # let the worker finish importing
+    start = time.perf_counter()
+    for i in range(count):
+        queue.put((time.monotonic(), frames[i % len(frames)]))
+    result = latencies.get()
+    elapsed = time.perf_counter() - start
+    worker.join()
+    return elapsed, result
+
+
+def run_shm(ctx, frames, count):
+    bus = FrameBus(frames[0].shape, slots=SLOTS)
+    consumed, latencies = ctx.Value("q", 0, lock=False), ctx.Queue()
+    worker = ctx.Process(target=shm_consumer, args=(bus.spec, count, consumed, latencies))
+    worker.start()
+    time.sleep(0.5)
+    try:
+        start = time.perf_counter()
+        for i in range(count):
+            while i - consumed.value >= SLOTS - 1:  # never lap the consumer
+                time.sleep(0.0001)
+            bus.publish(frames[i % len(frames)], time.monotonic())
+        result = latencies.get()
+        elapsed = time.perf_counter() - start
+        worker.join()
+    finally:
+        bus.release()
+    return elapsed, result
+
+
+def load_video(path, limit):
+    source = VideoSource(str(path), realtime=False)
+    bus = source.open_bus(slots=limit + 1)
+    reader = bus.subscribe()
+    try:
+        with bus:
+            frames = [frame.image.copy() for _, frame in zip(range(limit), reader)]
+    finally:
+        bus.release()
+    return frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--video", help="decode frames from this clip instead of synthetic ones")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    ctx = mp.get_context("spawn")
+    rng = np.random.default_rng(0)
+    if args.video:
+        clip = load_video(args.video, 60)
+        inputs = {clip[0].shape: clip}
+    else:
+        inputs = {shape: [rng.integers(0, 255, shape, dtype=np.uint8) for _ in range(4)] for shape in SIZES}
+
+    rows = []
+    print(f"{'frame':>14} {'handoff':>8} {'fps':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for shape, frames in inputs.items():
+        for name, fn in (("copy", run_queue), ("shm", run_shm)):
+            elapsed, lat = fn(ctx, frames, args.frames)
+            lat = np.asarray(lat) * 1000
+            row = {
+                "shape": list(shape), "handoff": name, "fps": args.frames / elapsed,
+                "p50_ms": float(np.percentile(lat, 50)), "p95_ms": float(np.percentile(lat, 95)),
+            }
+            rows.append(row)
+            label = f"{shape[1]}x{shape[0]}"
+            print(f"{label:>14} {name:>8} {row['fps']:8.1f} {row['p50_ms']:8.2f} {row['p95_ms']:8.2f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
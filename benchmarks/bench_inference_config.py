@@ -0,0 +1,98 @@
+"""
+Sweep inference settings over a recorded clip: FPS vs detection recall
+Usage: python benchmarks/bench_inference_config.py clip.mp4 [--frames 300] [--json out.json]
+
+Recall is measured against the "accurate" preset (full-size input, whole
+frame): a reference box counts as found when a box of the same class
+overlaps it with IoU >= 0.5.
+"""
+
+import argparse
+import itertools
+import json
+import sys
+import time
+from dataclasses import asdict, replace
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import cv2  # type: ignore
+import numpy as np
+
+from modules.inference_config import PRESETS, ConfiguredDetector
+from modules.model_registry import get_model
+from modules.tracker import iou_matrix
+
+
+def load_frames(path, limit):
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise SystemExit(f"❌ Error: no frames read from {path}")
+    return frames
+
+
+def detect_all(detector, frames):
+    boxes, started = [], time.perf_counter()
+    for frame in frames:
+        result = detector(frame)[0]
+        boxes.append((result.boxes.xyxy.cpu().numpy(), result.boxes.cls.cpu().numpy().astype(int)))
+    return boxes, len(frames) / (time.perf_counter() - started)
+
+
+def recall(reference, candidate, threshold=0.5):
+    found = total = 0
+    for (ref_xyxy, ref_cls), (xyxy, cls) in zip(reference, candidate):
+        total += len(ref_cls)
+        if len(ref_cls) and len(cls):
+            iou = np.where(ref_cls[:, None] == cls[None, :], iou_matrix(ref_xyxy, xyxy), 0.0)
+            found += int(np.count_nonzero(iou.max(axis=1) >= threshold))
+    return found / total if total else 1.0
+
+
+def sweep():
+    base = PRESETS["accurate"]
+    configs = {"accurate": base}
+    for imgsz, roi, letterbox in itertools.product((640, 480, 320), (1.0, 0.8), (False, True)):
+        name = f"imgsz={imgsz} roi={roi} letterbox={letterbox}"
+        configs[name] = replace(base, imgsz=imgsz, roi=roi, letterbox=letterbox)
+    configs.update({f"preset:{name}": config for name, config in PRESETS.items() if name != "accurate"})
+    return configs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("clip")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--model", default="yolov8n")
+    parser.add_argument("--json", help="also write results to this file")
+    args = parser.parse_args()
+
+    frames = load_frames(args.clip, args.frames)
+    model = get_model(args.model)
+    reference = None
+    rows = []
+    print(f"{'Config':<40} {'FPS':>7} {'Recall':>7}")
+    print("-" * 56)
+    for name, config in sweep().items():
+        boxes, fps = detect_all(ConfiguredDetector(model, config), frames)
+        if reference is None:
+            reference = boxes
+        rows.append({"name": name, "config": asdict(config), "fps": fps, "recall": recall(reference, boxes)})
+        print(f"{name:<40} {fps:>7.1f} {rows[-1]['recall']:>7.1%}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
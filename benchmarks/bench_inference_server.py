@@ -0,0 +1,120 @@
+"""
+Detection throughput of the multi-process inference server vs worker count
+Usage: python benchmarks/bench_inference_server.py clip.mp4 [--workers 1,2,4] [--frames 200]
+       [--threads 1] [--max-batch 4] [--plot fps.png] [--json out.json]
+
+Every frame of the clip is detected (no drops) as fast as the workers
+allow; FPS is measured from the first submitted frame to the last result,
+after all workers have loaded their model. Speedup is relative to the
+first worker count in the list.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import cv2  # type: ignore
+
+from modules.frame_bus import FrameBus
+from modules.inference_config import PRESETS
+from modules.inference_server import InferenceServer
+
+
+def load_frames(path, limit):
+    cap = cv2.VideoCapture(str(path))
+    frames = []
+    while len(frames) < limit:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise SystemExit(f"❌ Error: no frames read from {path}")
+    return frames
+
+
+def measure(frames, workers, args):
+    bus = FrameBus(frames[0].shape, slots=max(8, workers * args.max_batch + 2))
+    try:
+        with InferenceServer(bus, workers=workers, model=args.model, config=PRESETS[args.preset],
+                             threads_per_worker=args.threads, max_batch=args.max_batch) as server:
+            started = time.perf_counter()
+            done = 0
+            for frame in frames:
+                server.submit(bus.publish(frame))
+                done += len(server.ready())
+            done += len(server.drain())
+            elapsed = time.perf_counter() - started
+            stats = server.stats()
+    finally:
+        bus.release()
+    return {"workers": workers, "threads": args.threads, "frames": done, "fps": done / elapsed,
+            "batch_sizes": stats["batch_sizes"], "stale": stats["stale"]}
+
+
+def ascii_plot(rows, width=40):
+    top = max(row["fps"] for row in rows)
+    for row in rows:
+        bar = "#" * max(1, round(width * row["fps"] / top))
+        print(f"{row['workers']:>3} workers | {bar} {row['fps']:.1f}")
+
+
+def save_plot(rows, path):
+    try:
+        import matplotlib  # type: ignore
+        matplotlib.use("Agg")
+        import matplotlib.pyplot as plt  # type: ignore
+    except ImportError:
+        print("⚠️  --plot requires: pip install matplotlib")
+        return
+    workers = [row["workers"] for row in rows]
+    fig, ax = plt.subplots(figsize=(5, 3.5))
+    ax.plot(workers, [row["fps"] for row in rows], marker="o")
+    ax.set_xlabel("worker processes")
+    ax.set_ylabel("frames / s")
+    ax.set_xticks(workers)
+    ax.grid(alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(path)
+    print(f"Saved plot to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("video")
+    parser.add_argument("--workers", default="1,2,4", help="comma-separated worker counts")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=1, help="torch threads per worker")
+    parser.add_argument("--max-batch", type=int, default=4)
+    parser.add_argument("--model", default="yolov8n")
+    parser.add_argument("--preset", default="accurate", choices=sorted(PRESETS))
+    parser.add_argument("--plot", help="save an FPS vs workers plot (PNG) here")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    frames = load_frames(args.video, args.frames)
+    rows = []
+    print(f"{'workers':>8} {'fps':>8} {'speedup':>8}  batch sizes")
+    for workers in (int(w) for w in args.workers.split(",")):
+        row = measure(frames, workers, args)
+        row["speedup"] = row["fps"] / rows[0]["fps"] if rows else 1.0
+        rows.append(row)
+        print(f"{workers:>8} {row['fps']:8.1f} {row['speedup']:7.2f}x  {row['batch_sizes']}")
+
+    print()
+    ascii_plot(rows)
+    if args.plot:
+        save_plot(rows, args.plot)
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+CPU per audio-second of live captioning: every window from scratch vs cached log-mel features
+Usage: python benchmarks/bench_mel_cache.py [--minutes 10] [--window 5] [--step 0.5] [--wav long.wav]
+       [--model whisper-tiny] [--json out.json]
+
+Streams a long recording (``--wav``, or synthetic speech with pauses)
+through StreamingTranscriber in microphone-sized blocks, twice:
+
+* independent: each window is handed to the model as audio, so the
+  log-mel spectrogram of the window plus Whisper's 30 s of padding is
+  recomputed on every step;
+* incremental: a MelCache computes each frame once as audio arrives and
+  the window is decoded from the cached features.
+
+Without ``--model`` the decoder is a stub, so only feature extraction is
+timed (the part this change removes; decoding costs the same either way).
+With ``--model`` and openai-whisper installed, real decoding is included.
+
+Reported: process CPU seconds per audio second, frames computed, and the
+speed-up. Exits 1 if the incremental path is not cheaper.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from modules.mel_cache import MelCache, log_mel
+from modules.streaming_stt import SAMPLE_RATE, StreamingTranscriber
+from modules.synthetic_audio import voice
+
+BLOCK = 1600  # 100 ms, as live captions read the microphone
+
+
+class FeatureWhisper:
+    """Stub model: pays for Whisper's spectrogram, then returns a fixed caption"""
+
+    def __init__(self):
+        self.frames = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.frames += len(log_mel(audio)[0])
+        return {"text": " hello there"}
+
+
+def stub_decode(model, mel, prompt=None):
+    return "hello there"
+
+
+def recording(minutes, seed=0):
+    """Speech-like bursts of 2-8 s separated by short pauses, over room noise"""
+    rng = np.random.default_rng(seed)
+    parts, total = [], int(minutes * 60 * SAMPLE_RATE)
+    while sum(map(len, parts)) < total:
+        parts.append(voice(rng.uniform(2, 8), pitch=rng.uniform(100, 220)))
+        parts.append(np.zeros(int(rng.uniform(0.2, 1.0) * SAMPLE_RATE), np.float32))
+    audio = np.concatenate(parts)[:total]
+    return audio + rng.normal(0, 0.005, len(audio)).astype(np.float32)
+
+
+def run(audio, model, incremental, window, step, decode=None):
+    transcriber = StreamingTranscriber(model, window=window, step=step, overlap=1.0)
+    if incremental:
+        transcriber.mel_cache = MelCache(transcriber.buffer, decode=decode)
+    captions = 0
+    started = time.process_time()
+    for i in range(0, len(audio), BLOCK):
+        transcriber.callback(audio[i:i + BLOCK])
+        captions += transcriber.poll() is not None
+    captions += transcriber.flush() is not None
+    cpu = time.process_time() - started
+    seconds = len(audio) / SAMPLE_RATE
+    if incremental:
+        frames = transcriber.mel_cache.computed + transcriber.mel_cache.provisional
+    else:
+        frames = getattr(model, "frames", None)  # not visible inside real Whisper
+    return {"cpu_s": cpu, "cpu_per_audio_s": cpu / seconds, "captions": captions, "frames_computed": frames}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--minutes", type=float, default=10.0, help="length of the synthetic recording")
+    parser.add_argument("--wav", help="caption this file instead")
+    parser.add_argument("--window", type=float, default=5.0)
+    parser.add_argument("--step", type=float, default=0.5)
+    parser.add_argument("--model", help="e.g. whisper-tiny to include real decoding (needs openai-whisper)")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    if args.wav:
+        from modules.audio_io import load_wav
+        audio = load_wav(args.wav, SAMPLE_RATE)
+    else:
+        audio = recording(args.minutes)
+    print(f"{len(audio) / SAMPLE_RATE / 60:.1f} min of audio, window {args.window:g} s, step {args.step:g} s")
+
+    if args.model:
+        from modules.model_registry import get_model
+        model = get_model(args.model)
+        independent = run(audio, model, False, args.window, args.step)
+        incremental = run(audio, model, True, args.window, args.step)
+    else:
+        independent = run(audio, FeatureWhisper(), False, args.window, args.step)
+        incremental = run(audio, None, True, args.window, args.step, decode=stub_decode)
+
+    rows = {"independent": independent, "incremental": incremental}
+    print(f"{'path':>12} {'CPU s':>8} {'CPU s/audio s':>14} {'frames':>10} {'captions':>9}")
+    for name, row in rows.items():
+        frames = "-" if row["frames_computed"] is None else row["frames_computed"]
+        print(f"{name:>12} {row['cpu_s']:8.2f} {row['cpu_per_audio_s']:14.4f} {frames:>10} {row['captions']:9d}")
+    speedup = independent["cpu_per_audio_s"] / incremental["cpu_per_audio_s"]
+    print(f"incremental features: {speedup:.1f}x less CPU per audio second")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps({**rows, "speedup": speedup}, indent=2))
+    if speedup <= 1.0:
+        print("❌ incremental path is not cheaper")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
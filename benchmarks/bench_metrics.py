@@ -0,0 +1,84 @@
+"""
+Overhead of the metrics layer per call, enabled vs disabled
+Usage: python benchmarks/bench_metrics.py [--calls 200000] [--json out.json]
+
+Times a bare loop, then the same loop with a counter increment, a
+histogram observation, a ``with timer.time():`` block and a decorated
+function call, on an enabled registry and on a disabled one.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.metrics import MetricsRegistry
+
+
+def per_call_ns(fn, calls):
+    started = time.perf_counter()
+    fn(calls)
+    return (time.perf_counter() - started) / calls * 1e9
+
+
+def cases(reg):
+    counter, hist, timer = reg.counter("c"), reg.histogram("h"), reg.timer("t")
+
+    @timer
+    def decorated():
+        pass
+
+    def plain():
+        pass
+
+    def bare(n):
+        for _ in range(n):
+            plain()
+
+    def inc(n):
+        for _ in range(n):
+            counter.inc()
+
+    def observe(n):
+        for _ in range(n):
+            hist.observe(0.01)
+
+    def timed(n):
+        for _ in range(n):
+            with timer.time():
+                pass
+
+    def wrapped(n):
+        for _ in range(n):
+            decorated()
+
+    return {"bare call": bare, "counter.inc": inc, "histogram.observe": observe,
+            "with timer.time()": timed, "@timer call": wrapped}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--calls", type=int, default=200000)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    on, off = cases(MetricsRegistry(enabled=True)), cases(MetricsRegistry(enabled=False))
+    rows = []
+    print(f"{'operation':>20} {'enabled ns':>11} {'disabled ns':>12}")
+    for name in on:
+        row = {"operation": name, "enabled_ns": per_call_ns(on[name], args.calls),
+               "disabled_ns": per_call_ns(off[name], args.calls)}
+        rows.append(row)
+        print(f"{name:>20} {row['enabled_ns']:11.0f} {row['disabled_ns']:12.0f}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+
+
+if __name__ == "__main__":
+    main()
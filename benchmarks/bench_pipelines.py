@@ -0,0 +1,262 @@
+"""
+Latency, throughput and peak memory of each mode's processing path, with regression baselines
+Usage: python benchmarks/bench_pipelines.py [--cases sound_alert,speech_to_text,object_detection,voice_object_detection]
+       [--seconds 60] [--frames 300] [--video clip.mp4] [--baseline file.json] [--tolerance 0.25]
+       [--update] [--json out.json]
+
+Devices are replaced so only AURA's own processing is timed. The audio
+cases get a synthetic scene (alarms, knocks and speech over room noise)
+written into the AudioBus in microphone-sized blocks. The vision cases get
+frames from ``--video`` (or a synthetic moving object) and a stub detector
+that "finds" the bright object. The TTS engine is a no-op.
+
+Each case runs in a fresh process, so peak RSS is the case's own
+high-water mark. Latency is per block or frame. Throughput is audio
+seconds or frames processed per second of processing time.
+
+With ``--update`` the results become the new baseline for their cases.
+Otherwise the script exits 1 when any case is worse than its baseline by
+more than ``--tolerance``: p50/p95 latency or peak RSS higher, or
+throughput lower.
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+import numpy as np
+
+from modules.replay import SR, StubWhisper, StubYolo, alert_scene, moving_object, speech_scene
+
+DEFAULT_BASELINE = Path(__file__).with_name("pipelines_baseline.json")
+# metric, and whether a larger value is worse
+CHECKS = (("p50_ms", True), ("p95_ms", True), ("throughput", False), ("peak_rss_mb", True))
+
+
+def peak_rss_mb():
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def load_frames(args):
+    if not args.video:
+        return [moving_object(i) for i in range(args.frames)]
+    import cv2  # type: ignore
+    cap = cv2.VideoCapture(str(args.video))
+    frames = []
+    while len(frames) < args.frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise RuntimeError(f"no frames read from {args.video}")
+    return frames
+
+
+def sound_alert_case(args):
+    """Loudness monitor and sound labeller reading a shared AudioBus"""
+    from modules.audio_bus import AudioBus
+    from modules.loudness import LoudnessMonitor
+    from modules.sound_classifier import EventLabeler, SoundClassifier
+
+    monitor = LoudnessMonitor(samplerate=SR)
+    bus = AudioBus(samplerate=SR)
+    reader = bus.subscribe()
+    labeler = EventLabeler(SoundClassifier(SR), bus.buffer, origin=reader.position)
+
+    def step(block):
+        bus.write(block)
+        for event in monitor.process(reader.read(), bus.buffer.last_write_time):
+            labeler.add(event)
+        labeler.ready()
+        return len(block) / SR
+
+    audio = alert_scene(args.seconds)
+    return "audio_s", [partial(step, audio[i:i + monitor.hop]) for i in range(0, len(audio), monitor.hop)]
+
+
+def speech_to_text_case(args):
+    """Live captions: VAD-gated streaming windows sent to a stub Whisper"""
+    from modules.audio_bus import AudioBus
+    from modules.streaming_stt import StreamingTranscriber
+    from modules.vad import VoiceActivityDetector
+
+    transcriber = StreamingTranscriber(StubWhisper(), vad=VoiceActivityDetector(samplerate=SR))
+    bus = AudioBus(samplerate=SR)
+    reader = bus.subscribe()
+
+    def step(block):
+        bus.write(block)
+        transcriber.callback(reader.read())
+        transcriber.poll()
+        return len(block) / SR
+
+    audio = speech_scene(args.seconds)
+    blocksize = SR // 10
+    return "audio_s", [partial(step, audio[i:i + blocksize]) for i in range(0, len(audio), blocksize)]
+
+
+def object_detection_case(args):
+    """Change gate and configured detector on every frame"""
+    from modules.change_gate import ChangeGate
+    from modules.inference_config import PRESETS, ConfiguredDetector
+
+    gate = ChangeGate()
+    detector = gate.wrap(ConfiguredDetector(StubYolo(), PRESETS[args.preset]))
+
+    def step(frame):
+        detector(frame)
+        return 1
+
+    return "frames", [partial(step, frame) for frame in load_frames(args)]
+
+
+def voice_object_detection_case(args):
+    """Detection every third frame, tracker, announcer and overlay"""
+    from modules.announcer import Announcer, summarize
+    from modules.change_gate import ChangeGate
+    from modules.detections import DetectionFrame, draw_detections, label_table
+    from modules.inference_config import PRESETS, ConfiguredDetector
+    from modules.tracker import IoUTracker
+
+    gate = ChangeGate()
+    detector = ConfiguredDetector(StubYolo(), PRESETS[args.preset])
+    tracker = IoUTracker()
+    announcer = Announcer(lambda text: None).start()
+    labels = label_table(StubYolo.names)
+    index = [0]
+
+    def step(frame):
+        if index[0] % 3 == 0:
+            detections = DetectionFrame.from_results(gate.run(frame, detector)[0], seq=index[0])
+            update = tracker.update(detections.boxes, detections.classes, detections.confidences)
+        else:
+            update = tracker.predict(steps=1 / 3)
+        index[0] += 1
+        if update.appeared:
+            announcer.announce_frame(DetectionFrame.from_tracks(update.appeared, labels))
+        if update.departed:
+            text = summarize(DetectionFrame.from_tracks(update.departed, labels).names()) + " gone"
+            announcer.say(text, key="departed")
+        draw_detections(frame, DetectionFrame.from_tracks(update.tracks, labels))
+        return 1
+
+    return "frames", [partial(step, frame) for frame in load_frames(args)]
+
+
+CASES = {
+    "sound_alert": sound_alert_case,
+    "speech_to_text": speech_to_text_case,
+    "object_detection": object_detection_case,
+    "voice_object_detection": voice_object_detection_case,
+}
+
+
+def run_case(name, args):
+    """Time every step of one case after a short warm-up"""
+    unit, steps = CASES[name](args)
+    warmup = min(len(steps) // 10, 20)
+    latencies, units = [], 0.0
+    for i, step in enumerate(steps):
+        started = time.perf_counter()
+        amount = step()
+        elapsed = time.perf_counter() - started
+        if i >= warmup:
+            latencies.append(elapsed)
+            units += amount
+    lat = np.asarray(latencies) * 1000
+    return {
+        "case": name, "unit": unit, "steps": len(latencies),
+        "p50_ms": float(np.percentile(lat, 50)), "p95_ms": float(np.percentile(lat, 95)),
+        "throughput": units / (lat.sum() / 1000), "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _child(name, args, results):
+    try:
+        results.put(run_case(name, args))
+    except Exception as e:
+        results.put({"case": name, "error": f"{type(e).__name__}: {e}"})
+
+
+def regressions(row, reference, tolerance):
+    """Metrics of ``row`` worse than ``reference`` by more than ``tolerance``"""
+    worse = []
+    for key, higher_is_worse in CHECKS:
+        base, value = reference.get(key), row[key]
+        if not base or value != value:  # missing, zero or NaN
+            continue
+        ratio = value / base
+        if (ratio > 1 + tolerance) if higher_is_worse else (ratio < 1 - tolerance):
+            worse.append(f"{key} {value:.2f} vs {base:.2f}")
+    return worse
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--cases", default=",".join(CASES))
+    parser.add_argument("--seconds", type=float, default=60.0, help="audio per audio case")
+    parser.add_argument("--frames", type=int, default=300, help="frames per vision case")
+    parser.add_argument("--video", help="use frames from this clip instead of synthetic ones")
+    parser.add_argument("--preset", default="accurate")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--update", action="store_true", help="save these results as the baseline")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.cases.split(",") if name.strip()]
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+
+    baseline_path = Path(args.baseline)
+    baseline = json.loads(baseline_path.read_text()) if baseline_path.exists() else {}
+    ctx = mp.get_context("spawn")
+    rows, failures = [], []
+    print(f"{'case':>24} {'p50 ms':>8} {'p95 ms':>8} {'throughput':>16} {'peak MB':>8}  vs baseline")
+    for name in names:
+        results = ctx.Queue()
+        proc = ctx.Process(target=_child, args=(name, args, results))
+        proc.start()
+        row = results.get()
+        proc.join()
+        if "error" in row:
+            raise SystemExit(f"❌ Error: {name} failed: {row['error']}")
+        rows.append(row)
+        if name not in baseline:
+            verdict = "no baseline"
+        else:
+            worse = regressions(row, baseline[name], args.tolerance)
+            failures += [f"{name}: {w}" for w in worse]
+            verdict = "❌ " + "; ".join(worse) if worse else "✓"
+        rate = f"{row['throughput']:.1f} {row['unit']}/s"
+        print(f"{name:>24} {row['p50_ms']:8.3f} {row['p95_ms']:8.3f} {rate:>16} {row['peak_rss_mb']:8.0f}  {verdict}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+    if args.update:
+        baseline.update({row["case"]: row for row in rows})
+        baseline_path.write_text(json.dumps(baseline, indent=2) + "\n")
+        print(f"Saved baseline to {baseline_path}")
+        return
+    if failures:
+        print(f"❌ {len(failures)} regression(s) beyond {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
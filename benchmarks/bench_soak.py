@@ -0,0 +1,104 @@
+"""
+Soak every mode on hours of replayed input: throughput, latency drift and memory growth
+Usage: python benchmarks/bench_soak.py [--hours 1] [--modes sound_alert,speech_to_text,object_detection,voice_object_detection]
+       [--speed 0] [--video clip.mp4] [--wav room.wav] [--interval 5] [--max-drift 1.5] [--max-growth-mb 50]
+       [--json out.json]
+
+Each mode's own ``run()`` loop is driven through ReplayDevices: a fake
+camera and microphone replaying ``--video`` / ``--wav`` (looped), or
+synthetic scenes, into a headless window and a recording voice. Models are
+stubs, so what is measured is AURA's own processing around them. With
+``--speed 0`` input is fed as fast as each mode takes it; ``--speed 1``
+replays in real time, as a camera and microphone would.
+
+Each mode runs in a fresh process so RSS is its own. Reported: input
+played, wall time, throughput, mean latency of the mode's main stage early
+and late in the run, and RSS growth after warm-up. Exits 1 if latency
+drifts up by more than ``--max-drift`` or RSS grows by more than
+``--max-growth-mb``.
+"""
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.replay import MODES
+
+
+def _child(mode, args, results):
+    from modules.replay import soak
+    try:
+        results.put(soak(mode, seconds=args.hours * 3600, speed=args.speed or None, interval=args.interval,
+                         video=args.video, audio=args.wav))
+    except Exception as e:
+        results.put({"mode": mode, "errors": [f"{type(e).__name__}: {e}"]})
+
+
+def problems(row, args):
+    found = list(row.get("errors", []))
+    if "latency_drift" in row:
+        if not row["latency_drift"] <= args.max_drift:  # also catches NaN: no latency measured
+            found.append(f"latency drift {row['latency_drift']:.2f}x")
+        if row["memory_growth_mb"] > args.max_growth_mb:
+            found.append(f"RSS grew {row['memory_growth_mb']:.1f} MB")
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--hours", type=float, default=1.0, help="input per mode")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--speed", type=float, default=0.0, help="replay speed (0: as fast as possible)")
+    parser.add_argument("--video", help="replay this clip instead of a synthetic scene")
+    parser.add_argument("--wav", help="replay this recording instead of a synthetic scene")
+    parser.add_argument("--interval", type=float, default=5.0, help="seconds between samples")
+    parser.add_argument("--max-drift", type=float, default=1.5)
+    parser.add_argument("--max-growth-mb", type=float, default=50.0)
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    names = [name.strip() for name in args.modes.split(",") if name.strip()]
+    unknown = [name for name in names if name not in MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+
+    os.environ.setdefault("AURA_EVENT_DIR", tempfile.mkdtemp(prefix="aura-soak-"))
+    ctx = mp.get_context("spawn")
+    rows, failures = [], []
+    print(f"{args.hours:g} h of input per mode at {'max' if not args.speed else f'{args.speed:g}x'} speed")
+    print(f"{'mode':>24} {'wall s':>8} {'throughput':>16} {'early ms':>9} {'late ms':>9} {'drift':>6} "
+          f"{'RSS MB':>7} {'growth':>7}")
+    for name in names:
+        results = ctx.Queue()
+        proc = ctx.Process(target=_child, args=(name, args, results))
+        proc.start()
+        row = results.get()
+        proc.join()
+        rows.append(row)
+        found = problems(row, args)
+        failures += [f"{name}: {p}" for p in found]
+        if "latency_drift" not in row:
+            print(f"{name:>24}  ❌ {'; '.join(found)}")
+            continue
+        rate = f"{row['throughput']:.1f} {row['unit']}/s"
+        print(f"{name:>24} {row['wall_s']:8.1f} {rate:>16} {row['latency_early_ms']:9.3f} "
+              f"{row['latency_late_ms']:9.3f} {row['latency_drift']:6.2f} {row['rss_peak_mb']:7.0f} "
+              f"{row['memory_growth_mb']:7.1f}  {'❌ ' + '; '.join(found) if found else '✓'}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(rows, indent=2))
+    if failures:
+        print(f"❌ {len(failures)} problem(s)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
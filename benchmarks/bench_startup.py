@@ -0,0 +1,105 @@
+"""
+Measure how long the main menu takes to appear, with an -X importtime breakdown
+Usage: python benchmarks/bench_startup.py [--runs 5] [--top 15] [--baseline startup.json]
+       [--tolerance 0.25] [--update] [--json out.json]
+
+Each run starts ``.vscode/aura_main.py`` in a fresh interpreter and stops
+the clock when the "Choose mode" prompt is printed, then answers 0 to
+exit. The median over the runs is compared with the baseline file: the
+script exits non-zero when it is more than ``--tolerance`` slower.
+``--update`` records the current median as the new baseline. The slowest
+top-level imports of the last run are listed to show where time went.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+MAIN = ROOT / ".vscode" / "aura_main.py"
+PROMPT = b"Choose mode"
+DEFAULT_BASELINE = Path(__file__).with_name("startup_baseline.json")
+
+
+def menu_ready(timeout=60.0):
+    """Seconds until the menu prompt appears, and the importtime report"""
+    started = time.perf_counter()
+    proc = subprocess.Popen([sys.executable, "-X", "importtime", str(MAIN)], cwd=ROOT,
+                            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    seen = b""
+    while PROMPT not in seen:
+        chunk = os.read(proc.stdout.fileno(), 4096)
+        if not chunk or time.perf_counter() - started > timeout:
+            proc.kill()
+            raise SystemExit(f"❌ Error: menu never appeared\n{proc.stderr.read().decode()[-2000:]}")
+        seen += chunk
+    elapsed = time.perf_counter() - started
+    _, stderr = proc.communicate(b"0\n", timeout=timeout)
+    return elapsed, stderr.decode(errors="replace")
+
+
+def parse_importtime(report):
+    """(cumulative_us, self_us, module) for every top-level import"""
+    rows = []
+    for line in report.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative, name = (part for part in line[len("import time:"):].split("|"))
+        if name.startswith(" ") and not name.startswith("  ") and self_us.strip().isdigit():
+            rows.append((int(cumulative), int(self_us), name.strip()))
+    return sorted(rows, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="how many imports to list")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline")
+    parser.add_argument("--update", action="store_true", help="record this run as the baseline")
+    parser.add_argument("--json", help="write results to this file")
+    args = parser.parse_args()
+
+    times = []
+    for _ in range(args.runs):
+        elapsed, report = menu_ready()
+        times.append(elapsed)
+    median = statistics.median(times)
+    imports = parse_importtime(report)
+
+    print(f"{'cumulative ms':>14} {'self ms':>8}  module")
+    for cumulative, self_us, name in imports[:args.top]:
+        print(f"{cumulative / 1000:14.1f} {self_us / 1000:8.1f}  {name}")
+    print(f"\nMenu ready in {median * 1000:.0f} ms (median of {args.runs}, "
+          f"min {min(times) * 1000:.0f} ms, max {max(times) * 1000:.0f} ms)")
+
+    result = {"menu_ready_s": median, "runs": times,
+              "imports": [{"module": n, "cumulative_ms": c / 1000, "self_ms": s / 1000}
+                          for c, s, n in imports[:args.top]]}
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2))
+
+    baseline = Path(args.baseline)
+    if args.update:
+        baseline.write_text(json.dumps({"menu_ready_s": median}, indent=2) + "\n")
+        print(f"Saved baseline to {baseline}")
+        return
+    if not baseline.exists():
+        print(f"No baseline at {baseline}; run with --update to record one")
+        return
+    reference = json.loads(baseline.read_text())["menu_ready_s"]
+    limit = reference * (1 + args.tolerance)
+    if median > limit:
+        print(f"❌ Startup regressed: {median * 1000:.0f} ms > {limit * 1000:.0f} ms "
+              f"(baseline {reference * 1000:.0f} ms + {args.tolerance:.0%})")
+        sys.exit(1)
+    print(f"✓ Within {args.tolerance:.0%} of the baseline ({reference * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Non-blocking, deduplicated speech announcements for detected objects"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import Counter
+
+from .metrics import metrics
+
+# Lower numbers are spoken first; anything not listed gets DEFAULT_PRIORITY
+PRIORITIES = {
+    "car": 0, "bus": 0, "truck": 0, "motorcycle": 0, "bicycle": 0, "train": 0,
+    "traffic light": 0, "stop sign": 0, "dog": 1, "person": 1,
+}
+DEFAULT_PRIORITY = 2
+
+SPEAK = metrics.timer("stage_seconds", mode="tts", stage="speak")
+DELAY = metrics.histogram("announce_delay_seconds", "Time from queueing an announcement to speaking it")
+SPOKEN = metrics.counter("announcements", "Announcements by outcome", result="spoken")
+DROPPED = metrics.counter("announcements", "Announcements by outcome", result="dropped")
+
+_IRREGULAR = {
+    "person": "people", "mouse": "mice", "knife": "knives", "sheep": "sheep",
+    "skis": "skis", "scissors": "scissors",
+}
+
+
+def plural(label, count):
+    """'3 people', 'chair', '2 buses'"""
+    if count == 1:
+        return label
+    if label in _IRREGULAR:
+        word = _IRREGULAR[label]
+    elif label.endswith(("s", "x", "ch", "sh")):
+        word = label + "es"
+    elif label.endswith("y") and label[-2:-1] not in "aeiou":
+        word = label[:-1] + "ies"
+    else:
+        word = label + "s"
+    return f"{count} {word}"
+
+
+def summarize(labels, priorities=PRIORITIES):
+    """Collapse a frame's labels into one phrase, most important first"""
+    counts = Counter(labels)
+    order = sorted(counts, key=lambda label: (priorities.get(label, DEFAULT_PRIORITY), -counts[label]))
+    return ", ".join(plural(label, counts[label]) for label in order)
+
+
+def pyttsx3_speaker():
+    """Speak with pyttsx3; the engine is created on the announcer thread"""
+    engine = None
+
+    def speak(text):
+        nonlocal engine
+        if engine is None:
+            import pyttsx3  # type: ignore
+            engine = pyttsx3.init()
+        engine.say(text)
+        engine.runAndWait()
+
+    return speak
+
+
+class Announcer:
+    """Speak announcements on a background thread without blocking vision
+
+    Pending announcements sit in a priority queue. A newer announcement with
+    the same ``key`` replaces an older one that has not been spoken yet, and
+    anything older than ``max_age`` seconds by the time the speaker is free is
+    dropped. Labels spoken within ``cooldown`` seconds are left out.
+    """
+
+    def __init__(self, speak, cooldown=5.0, max_age=2.0, priorities=PRIORITIES, clock=time.monotonic):
+        self.speak = speak
+        self.cooldown = cooldown
+        self.max_age = max_age
+        self.priorities = priorities
+        self.queued = 0
+        self.spoken = 0
+        self.merged = 0
+        self.dropped = 0
+        self.suppressed = 0
+        self._clock = clock
+        self._heap = []
+        self._pending = {}
+        self._last_spoken = {}
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._closed = False
+        self._busy = False
+        self._thread = None
+
+    @property
+    def stats(self):
+        return {
+            "queued": self.queued,
+            "spoken": self.spoken,
+            "merged": self.merged,
+            "dropped": self.dropped,
+            "suppressed": self.suppressed,
+        }
+
+    def start(self):
+        self._thread = threading.Thread(target=self._worker, name="aura-announcer", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=2.0):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def announce_labels(self, labels, key="scene"):
+        """Queue a summary of one frame's labels; returns the text or None"""
+        with self._cond:
+            fresh = self._fresh(labels)
+            if not fresh:
+                return None
+            self.merged += len(fresh) - len(set(fresh))
+            priority = min(self.priorities.get(label, DEFAULT_PRIORITY) for label in fresh)
+            text = summarize(fresh, self.priorities)
+            self.say(text, priority=priority, key=key, labels=fresh)
+            return text
+
+    def announce_frame(self, frame, key="scene"):
+        """Queue a summary of a :class:`DetectionFrame`; returns the text or None"""
+        return self.announce_labels(frame.names(), key) if len(frame) else None
+
+    def say(self, text, priority=DEFAULT_PRIORITY, key=None, labels=None):
+        """Queue free-form text; never blocks"""
+        with self._cond:
+            if key is not None and key in self._pending:
+                self._pending.pop(key)[-1] = False
+                self.dropped += 1
+                DROPPED.inc()
+            entry = [priority, next(self._seq), self._clock(), text, labels, key, True]
+            heapq.heappush(self._heap, entry)
+            if key is not None:
+                self._pending[key] = entry
+            self.queued += 1
+            self._cond.notify()
+
+    def _fresh(self, labels):
+        """Drop labels still inside their cooldown, counting them as suppressed"""
+        now = self._clock()
+        fresh = [label for label in labels
+                 if now - self._last_spoken.get(label, float("-inf")) >= self.cooldown]
+        self.suppressed += len(labels) - len(fresh)
+        return fresh
+
+    def wait_idle(self, timeout=5.0):
+        """Block until everything queued has been spoken or dropped (for tests)"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._heap or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _worker(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._heap or self._closed)
+                if self._closed:
+                    return
+                entry = heapq.heappop(self._heap)
+                priority, _, queued_at, text, labels, key, live = entry
+                if key is not None and self._pending.get(key) is entry:
+                    del self._pending[key]
+                if not live:
+                    self._cond.notify_all()
+                    continue
+                now = self._clock()
+                if now - queued_at > self.max_age:
+                    self.dropped += 1
+                    DROPPED.inc()
+                    self._cond.notify_all()
+                    continue
+                if labels:
+                    # Something else may have spoken these labels while queued
+                    fresh = self._fresh(labels)
+                    if not fresh:
+                        self._cond.notify_all()
+                        continue
+                    text = summarize(fresh, self.priorities)
+                    for label in fresh:
+                        self._last_spoken[label] = now
+                self._busy = True
+            DELAY.observe(now - queued_at)
+            try:
+                with SPEAK.time():
+                    self.speak(text)
+            except Exception as e:
+                print(f"❌ Speech error: {e}")
+            SPOKEN.inc()
+            with self._cond:
+                self.spoken += 1
+                self._busy = False
+                self._cond.notify_all()
@@ -0,0 +1,255 @@
+"""One microphone capture shared by every audio consumer"""
+
+import os
+import threading
+import time
+
+import numpy as np
+
+from .audio_io import iter_blocks, load_wav
+from .metrics import metrics
+from .ring_buffer import AudioRingBuffer
+
+try:
+    import sounddevice as sd
+except ImportError:
+    sd = None
+
+SAMPLE_RATE = 16000
+OVERRUNS = metrics.counter("audio_overruns", "Times a reader fell behind the microphone and lost samples")
+
+
+class AudioBus:
+    """A single capture stream written into a shared ring buffer
+
+    The capture source (a sounddevice stream, or a file for tests) calls
+    :meth:`write`. Each consumer gets a :class:`BusReader` with its own
+    cursor and reads at its own pace; reads return read-only NumPy views
+    into the ring, so fanning out to several consumers costs no copies.
+    A reader that falls more than ``seconds`` behind is told how many
+    samples it lost and skips ahead.
+    """
+
+    def __init__(self, source=None, samplerate=SAMPLE_RATE, seconds=10.0, max_read=0.5,
+                 clock=time.monotonic):
+        self.source = source
+        self.samplerate = samplerate
+        capacity = int(seconds * samplerate)
+        self.max_read = min(int(max_read * samplerate), capacity // 2)
+        self.buffer = AudioRingBuffer(capacity, clock=clock, mirror=self.max_read)
+        self.closed = False
+        self.readers = []
+        self._cond = threading.Condition()
+        self._listeners = []
+
+    def write(self, block):
+        self.buffer.write(block)
+        self._notify()
+
+    def callback(self, indata, frames=None, time_info=None, status=None):
+        """sounddevice callback: one ring write, shared by all readers"""
+        self.write(indata)
+
+    def close(self):
+        """Mark the end of the stream; readers drain what is left"""
+        self.closed = True
+        self._notify()
+
+    def _notify(self):
+        with self._cond:
+            self._cond.notify_all()
+        for listener in self._listeners:
+            listener()
+
+    def add_listener(self, fn):
+        """Call ``fn()`` from the capture thread after every write and at close"""
+        self._listeners.append(fn)
+
+    def subscribe(self, from_start=False):
+        """New reader positioned at the newest sample (or the oldest held)"""
+        reader = BusReader(self, self.buffer.oldest if from_start else self.buffer.written)
+        self.readers.append(reader)
+        return reader
+
+    def unsubscribe(self, reader):
+        if reader in self.readers:
+            self.readers.remove(reader)
+
+    def start(self):
+        self.closed = False
+        if self.source is not None:
+            self.source.start(self)
+        return self
+
+    def stop(self):
+        if self.source is not None:
+            self.source.stop()
+        self.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class BusReader:
+    """One consumer's cursor on an :class:`AudioBus`"""
+
+    def __init__(self, bus, position):
+        self.bus = bus
+        self.position = position
+        self.overruns = 0
+        self.lost_samples = 0
+
+    @property
+    def available(self):
+        return self.bus.buffer.written - self.position
+
+    @property
+    def finished(self):
+        return self.bus.closed and self.available <= 0
+
+    def _check_overrun(self):
+        oldest = self.bus.buffer.oldest
+        if self.position < oldest:
+            OVERRUNS.inc()
+            self.overruns += 1
+            self.lost_samples += oldest - self.position
+            self.position = oldest
+
+    def read(self, max_samples=None):
+        """Return the next unread samples as a view and advance the cursor
+
+        At most ``max_samples`` (and never more than the bus ``max_read``)
+        are returned; an empty view means nothing new has arrived. Use the
+        view before the writer laps it.
+        """
+        self._check_overrun()
+        limit = self.bus.max_read if max_samples is None else min(max_samples, self.bus.max_read)
+        view = self.bus.buffer.view(self.position, self.position + min(self.available, limit))
+        self.position += len(view)
+        return view
+
+    def wait(self, timeout=None):
+        """Block until there is something to read or the bus is closed"""
+        with self.bus._cond:
+            return self.bus._cond.wait_for(lambda: self.available > 0 or self.bus.closed, timeout)
+
+    def read_exactly(self, n, timeout=None):
+        """Collect ``n`` samples into a new array, waiting for them to arrive"""
+        out = np.zeros(n, dtype=np.float32)
+        filled = 0
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while filled < n:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if not self.wait(remaining) or self.finished:
+                break
+            view = self.read(n - filled)
+            out[filled:filled + len(view)] = view
+            filled += len(view)
+        return out[:filled]
+
+    def __iter__(self):
+        """Yield views until the bus is closed and drained"""
+        while True:
+            self.wait()
+            if self.finished:
+                return
+            view = self.read()
+            if len(view):
+                yield view
+
+
+class MicCapture:
+    """The one sounddevice input stream behind a bus"""
+
+    def __init__(self, blocksize=512, device=None):
+        self.blocksize = blocksize
+        self.device = device
+        self._stream = None
+
+    def start(self, bus):
+        self._stream = sd.InputStream(samplerate=bus.samplerate, channels=1, dtype="float32",
+                                      blocksize=self.blocksize, device=self.device,
+                                      callback=bus.callback)
+        self._stream.start()
+
+    def stop(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+
+class FileCapture:
+    """Feed a WAV file, array or stream of blocks into a bus, then close it
+
+    ``audio`` may also be any iterable of blocks, e.g. a generator that
+    synthesises hours of sound without holding it in memory. With ``loop``
+    a file or array starts over at its end; ``seconds`` stops the feed after
+    that much audio either way.
+
+    With ``realtime`` blocks are paced like a live microphone, ``speed``
+    times faster than real time; otherwise they are written as fast as
+    readers keep up (never lapping the slowest one by more than the ring,
+    unless ``lossless`` is False). :attr:`written` counts samples fed.
+    """
+
+    def __init__(self, audio, blocksize=512, realtime=False, lossless=True, speed=1.0, loop=False, seconds=None):
+        self.audio = audio
+        self.blocksize = blocksize
+        self.realtime = realtime
+        self.lossless = lossless
+        self.speed = speed
+        self.loop = loop
+        self.seconds = seconds
+        self.samplerate = SAMPLE_RATE
+        self.written = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self, bus):
+        audio = self.audio
+        if isinstance(audio, (str, os.PathLike)):
+            audio = load_wav(audio, bus.samplerate)
+        self.samplerate = bus.samplerate
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(bus, audio), daemon=True)
+        self._thread.start()
+
+    def _blocks(self, audio):
+        if not isinstance(audio, np.ndarray):
+            yield from audio
+            return
+        while len(audio):
+            yield from iter_blocks(audio, self.blocksize)
+            if not self.loop:
+                return
+
+    def _run(self, bus, audio):
+        room = bus.buffer.capacity - self.blocksize - bus.max_read  # keep handed-out views intact
+        limit = None if self.seconds is None else int(self.seconds * bus.samplerate)
+        started = time.monotonic()
+        for block in self._blocks(audio):
+            if self._stop.is_set():
+                break
+            if limit is not None:
+                block = block[:limit - self.written]
+                if not len(block):
+                    break
+            while self.lossless and bus.readers and not self._stop.is_set():
+                lag = max(r.available for r in bus.readers)
+                if lag <= room:
+                    break
+                time.sleep(0.001)
+            bus.write(block)
+            self.written += len(block)
+            if self.realtime:
+                due = started + self.written / bus.samplerate / self.speed
+                self._stop.wait(max(0.0, due - time.monotonic()))
+        bus.close()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
@@ -0,0 +1,47 @@
+"""Audio file helpers for offline testing and replay"""
+
+import wave
+
+import numpy as np
+
+
+def load_wav(path, samplerate=16000):
+    """Load a PCM WAV file as mono float32 in [-1, 1] at ``samplerate``"""
+    with wave.open(str(path), "rb") as wav:
+        rate = wav.getframerate()
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        raw = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        audio = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128) / 128
+    elif width == 2:
+        audio = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768
+    elif width == 4:
+        audio = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width} bytes")
+
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+    if rate != samplerate and len(audio):
+        duration = len(audio) / rate
+        target = np.arange(int(duration * samplerate)) / samplerate
+        audio = np.interp(target, np.arange(len(audio)) / rate, audio).astype(np.float32)
+    return audio
+
+
+def save_wav(path, audio, samplerate=16000):
+    """Write mono float32 audio as a 16-bit PCM WAV file"""
+    pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(samplerate)
+        wav.writeframes(pcm.tobytes())
+
+
+def iter_blocks(audio, blocksize):
+    """Yield consecutive ``blocksize`` views of ``audio`` (last may be short)"""
+    for start in range(0, len(audio), blocksize):
+        yield audio[start:start + blocksize]
@@ -0,0 +1,132 @@
+"""Pluggable detector backends: PyTorch weights or a cached ONNX export"""
+
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+CACHE_DIR = Path(os.environ.get("AURA_CACHE_DIR", Path.home() / ".cache" / "aura"))
+DEFAULT_BACKEND = "torch"
+
+
+class Backend(ABC):
+    """How a YOLO weights file becomes a callable model
+
+    Every backend returns an object used exactly like the ultralytics
+    ``YOLO`` model: ``model(frames, **kwargs)`` gives a list of results
+    with ``boxes``, ``names`` and ``plot()``, so the vision modes do not
+    care which one is running.
+    """
+    name = None
+    requires = ()
+
+    def available(self):
+        """True if the packages this backend needs are installed"""
+        return all(importlib.util.find_spec(module) is not None for module in self.requires)
+
+    @abstractmethod
+    def load(self, weights):
+        """The callable model for ``weights``"""
+
+
+class TorchBackend(Backend):
+    """The ultralytics PyTorch path (the reference implementation)"""
+    name = "torch"
+    requires = ("ultralytics", "torch")
+
+    def load(self, weights):
+        from ultralytics import YOLO  # type: ignore
+        return YOLO(weights)
+
+
+class OnnxBackend(Backend):
+    """ONNX Runtime on CPU, from an export built once and reused
+
+    The first load exports ``weights`` with dynamic batch and image size
+    (so every preset and batched call can share one file) into
+    ``cache_dir``. Later loads find it there; the sidecar ``.json``
+    records the size and mtime of the weights it was built from, and a
+    changed weights file is exported again. The weights are only checked
+    once they exist, since ultralytics downloads missing ones during the
+    export itself.
+    """
+    name = "onnx"
+    requires = ("ultralytics", "onnxruntime")
+
+    def __init__(self, cache_dir=None, opset=None):
+        self.cache_dir = Path(cache_dir or CACHE_DIR)
+        self.opset = opset
+        self.exports = 0
+
+    def cache_key(self, weights):
+        """Short digest identifying this weights name and export settings"""
+        parts = [Path(weights).name, str(self.opset)]
+        return hashlib.sha1("|".join(parts).encode()).hexdigest()[:12]
+
+    def artifact(self, weights):
+        """Where the export of ``weights`` is (or will be) cached"""
+        return self.cache_dir / f"{Path(weights).stem}-{self.cache_key(weights)}.onnx"
+
+    def prepare(self, weights):
+        """Return the cached export, building it first if needed"""
+        target = self.artifact(weights)
+        if target.exists() and self._current(weights, target.with_suffix(".json")):
+            return target
+        target.parent.mkdir(parents=True, exist_ok=True)
+        exported = Path(self._export(weights))
+        partial = target.with_suffix(".partial")
+        shutil.move(str(exported), partial)
+        partial.replace(target)  # atomic: a crash mid-export leaves no half file
+        info = {"weights": str(weights), "opset": self.opset, **(_stamp(weights) or {})}
+        target.with_suffix(".json").write_text(json.dumps(info))
+        self.exports += 1
+        return target
+
+    def _current(self, weights, sidecar):
+        """True unless the weights on disk differ from the ones the export was built from"""
+        stamp = _stamp(weights)
+        if stamp is None:
+            return True  # nothing local to compare; the export is all we have
+        try:
+            info = json.loads(sidecar.read_text())
+        except (OSError, ValueError):
+            return False
+        return all(info.get(key) == value for key, value in stamp.items())
+
+    def _export(self, weights):
+        from ultralytics import YOLO  # type: ignore
+        return YOLO(weights).export(format="onnx", dynamic=True, simplify=True, opset=self.opset)
+
+    def load(self, weights):
+        from ultralytics import YOLO  # type: ignore
+        return YOLO(str(self.prepare(weights)), task="detect")
+
+
+def _stamp(weights):
+    path = Path(weights)
+    if not path.exists():
+        return None
+    stat = path.stat()
+    return {"size": stat.st_size, "mtime": int(stat.st_mtime)}
+
+
+BACKENDS = {backend.name: backend for backend in (TorchBackend(), OnnxBackend())}
+
+
+def get_backend(name=None):
+    """The named backend, or AURA_BACKEND (default ``torch``)
+
+    Falls back to PyTorch with a warning when the requested backend's
+    packages are missing.
+    """
+    name = name or os.environ.get("AURA_BACKEND", DEFAULT_BACKEND)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown backend: {name} (choose from {', '.join(BACKENDS)})")
+    backend = BACKENDS[name]
+    if name != DEFAULT_BACKEND and not backend.available():
+        print(f"⚠️  {name} backend requires: pip install {' '.join(backend.requires)}; using {DEFAULT_BACKEND}")
+        backend = BACKENDS[DEFAULT_BACKEND]
+    return backend
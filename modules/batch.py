@@ -0,0 +1,198 @@
+"""Offline batch transcription and detection over recorded files"""
+
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from .inference_config import ConfiguredDetector, InferenceConfig
+
+AUDIO_EXTENSIONS = {".wav"}
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv"}
+SAMPLE_RATE = 16000
+
+
+@dataclass
+class BatchOptions:
+    """Settings shared by every worker process"""
+    whisper: str = "whisper-base"
+    yolo: str = "yolov8n"
+    batch_size: int = 8
+    stride: int = 1
+    use_vad: bool = True
+    threads_per_worker: int = 0
+    config: InferenceConfig = field(default_factory=InferenceConfig)
+
+
+@dataclass
+class FileReport:
+    """Outcome of processing one file"""
+    path: str
+    kind: str
+    records: list
+    media_seconds: float = 0.0
+    frames: int = 0
+    seconds: float = 0.0
+    error: str = None
+
+
+def find_inputs(paths):
+    """Expand files and directories into sorted WAV and video file lists"""
+    files = []
+    for path in map(Path, paths):
+        files.extend(sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path])
+    audio = [str(p) for p in files if p.suffix.lower() in AUDIO_EXTENSIONS]
+    video = [str(p) for p in files if p.suffix.lower() in VIDEO_EXTENSIONS]
+    return audio, video
+
+
+def transcribe_audio(path, model, vad=None):
+    """Transcribe the speech segments of one WAV file
+
+    Segments are decoded one at a time: Whisper's ``transcribe`` takes a
+    single clip, so ``batch_size`` only applies to video frames. The VAD
+    keeps silence out of those calls instead.
+    """
+    from .audio_io import load_wav
+
+    audio = load_wav(path, SAMPLE_RATE)
+    segments = vad.segments(audio) if vad is not None else [(0, len(audio))]
+    records = []
+    for start, stop in segments:
+        result = model.transcribe(audio[start:stop], fp16=False)
+        offset = start / SAMPLE_RATE
+        for segment in result.get("segments") or [{"start": 0.0, "end": (stop - start) / SAMPLE_RATE,
+                                                   "text": result["text"]}]:
+            records.append({
+                "file": str(path),
+                "type": "transcript",
+                "start": round(offset + segment["start"], 3),
+                "end": round(offset + segment["end"], 3),
+                "text": segment["text"].strip(),
+            })
+    return records, len(audio) / SAMPLE_RATE
+
+
+def detect_video(path, detector, batch_size=8, stride=1):
+    """Detect objects in every ``stride``-th frame, ``batch_size`` frames per model call"""
+    import cv2  # type: ignore
+
+    cap = cv2.VideoCapture(str(path))
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video: {path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    records, batch, indices, index = [], [], [], 0
+
+    def flush():
+        for frame_index, result in zip(indices, detector.predict_batch(batch)):
+            names = result.names
+            boxes = result.boxes
+            records.append({
+                "file": str(path),
+                "type": "detections",
+                "frame": frame_index,
+                "time": round(frame_index / fps, 3),
+                "labels": [names[int(c)] for c in boxes.cls.tolist()],
+                "conf": [round(float(c), 3) for c in boxes.conf.tolist()],
+                "boxes": [[round(float(v), 1) for v in box] for box in boxes.xyxy.tolist()],
+            })
+        batch.clear()
+        indices.clear()
+
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            if index % stride == 0:
+                batch.append(frame)
+                indices.append(index)
+                if len(batch) >= batch_size:
+                    flush()
+            index += 1
+        if batch:
+            flush()
+    finally:
+        cap.release()
+    return records, index / fps, len(records)
+
+
+def process_file(path, kind, options):
+    """Worker entry point: process one file with models from the registry"""
+    from .model_registry import get_model
+
+    started = time.perf_counter()
+    report = FileReport(str(path), kind, [])
+    try:
+        if kind == "audio":
+            vad = None
+            if options.use_vad:
+                from .vad import VoiceActivityDetector
+                vad = VoiceActivityDetector(SAMPLE_RATE)
+            report.records, report.media_seconds = transcribe_audio(path, get_model(options.whisper), vad)
+        else:
+            detector = ConfiguredDetector(get_model(options.yolo), options.config)
+            report.records, report.media_seconds, report.frames = detect_video(
+                path, detector, options.batch_size, options.stride)
+    except Exception as e:
+        report.error = f"{type(e).__name__}: {e}"
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _init_worker(threads):
+    from .model_registry import pin_threads
+    pin_threads(threads)
+
+
+def run_batch(paths, output, workers=1, options=None, on_report=None):
+    """Process every WAV/video under ``paths`` and write JSONL to ``output``
+
+    Files are fanned out over ``workers`` processes (``workers=1`` runs in
+    this process). A file that fails, or whose worker dies, gets an
+    ``error`` line and the rest carry on. Returns a summary with
+    audio-seconds/sec and frames/sec.
+    """
+    options = options or BatchOptions()
+    audio, video = find_inputs(paths)
+    jobs = [(path, "audio") for path in audio] + [(path, "video") for path in video]
+    totals = {"files": 0, "errors": 0, "audio_seconds": 0.0, "frames": 0, "records": 0}
+    started = time.perf_counter()
+
+    with open(output, "w", encoding="utf-8") as out:
+        def collect(report):
+            totals["files"] += 1
+            if report.error:
+                totals["errors"] += 1
+                out.write(json.dumps({"file": report.path, "type": "error", "error": report.error}) + "\n")
+            for record in report.records:
+                out.write(json.dumps(record) + "\n")
+            totals["records"] += len(report.records)
+            if report.kind == "audio":
+                totals["audio_seconds"] += report.media_seconds
+            totals["frames"] += report.frames
+            if on_report:
+                on_report(report)
+
+        if workers <= 1:
+            _init_worker(options.threads_per_worker)
+            for path, kind in jobs:
+                collect(process_file(path, kind, options))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(options.threads_per_worker,)) as pool:
+                futures = {pool.submit(process_file, path, kind, options): (path, kind) for path, kind in jobs}
+                for future in as_completed(futures):
+                    try:
+                        report = future.result()
+                    except Exception as e:  # worker died (BrokenProcessPool) or the job could not be sent
+                        report = FileReport(str(futures[future][0]), futures[future][1], [],
+                                            error=f"{type(e).__name__}: {e}")
+                    collect(report)
+
+    elapsed = time.perf_counter() - started
+    totals["seconds"] = elapsed
+    totals["audio_seconds_per_sec"] = totals["audio_seconds"] / elapsed if elapsed else 0.0
+    totals["frames_per_sec"] = totals["frames"] / elapsed if elapsed else 0.0
+    return totals
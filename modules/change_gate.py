@@ -0,0 +1,117 @@
+"""Frame-difference gate that skips YOLO inference on unchanged frames"""
+
+import time
+
+import numpy as np
+
+from .metrics import metrics
+
+try:
+    import cv2  # type: ignore
+except ImportError:
+    cv2 = None
+
+_LUMA = np.array([0.114, 0.587, 0.299], dtype=np.float32)  # BGR order
+SKIPPED = metrics.counter("gate_frames", "Frames seen by the change gate", result="skipped")
+INFERRED = metrics.counter("gate_frames", "Frames seen by the change gate", result="inferred")
+
+
+class ChangeGate:
+    """Run the model only when the scene changed or the result got too old
+
+    Each frame is reduced to a small grayscale thumbnail and compared with
+    the thumbnail of the last frame that was actually inferred. If the mean
+    absolute difference stays under ``threshold`` (0-1 scale) and the last
+    result is younger than ``max_stale`` seconds, the previous result is
+    returned instead of calling the model.
+    """
+
+    def __init__(self, threshold=0.03, max_stale=2.0, size=(64, 48), clock=time.monotonic):
+        self.threshold = threshold
+        self.max_stale = max_stale
+        self.size = size
+        self.frames = 0
+        self.inferred = 0
+        self.skipped = 0
+        self.last_diff = 0.0
+        self.last_skipped = False
+        self._clock = clock
+        self._reference = None
+        self._result = None
+        self._inferred_at = None
+        self._infer_seconds = 0.0
+        self._started = None
+
+    def thumbnail(self, frame):
+        """Downscaled grayscale copy of ``frame`` in [0, 1]"""
+        width, height = self.size
+        if cv2 is not None:
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+            small = cv2.resize(gray, (width, height), interpolation=cv2.INTER_AREA)
+            return small.astype(np.float32) / 255
+        rows = np.linspace(0, frame.shape[0] - 1, height).astype(int)
+        cols = np.linspace(0, frame.shape[1] - 1, width).astype(int)
+        small = frame[np.ix_(rows, cols)].astype(np.float32)
+        if small.ndim == 3:
+            small = small @ _LUMA
+        return small / 255
+
+    def changed(self, frame):
+        """Decide whether ``frame`` needs a fresh inference"""
+        now = self._clock()
+        if self._started is None:
+            self._started = now
+        thumb = self.thumbnail(frame)
+        if self._reference is None or self._reference.shape != thumb.shape:
+            self.last_diff = 1.0
+        else:
+            self.last_diff = float(np.mean(np.abs(thumb - self._reference)))
+        stale = self._inferred_at is None or now - self._inferred_at >= self.max_stale
+        if self.last_diff > self.threshold or stale:
+            self._reference = thumb
+            return True
+        return False
+
+    def run(self, frame, infer):
+        """Return ``infer(frame)``, or the previous result if nothing changed"""
+        self.frames += 1
+        if self._result is not None and not self.changed(frame):
+            self.skipped += 1
+            SKIPPED.inc()
+            self.last_skipped = True
+            return self._result
+        if self._result is None:
+            self.changed(frame)
+        started = time.perf_counter()
+        self._result = infer(frame)
+        self._infer_seconds += time.perf_counter() - started
+        self._inferred_at = self._clock()
+        self.inferred += 1
+        INFERRED.inc()
+        self.last_skipped = False
+        return self._result
+
+    def wrap(self, infer):
+        """``infer`` behind this gate, as a one-argument callable"""
+        return lambda frame: self.run(frame, infer)
+
+    @property
+    def stats(self):
+        """Skip ratio and estimated inference CPU time saved per minute"""
+        mean_infer = self._infer_seconds / self.inferred if self.inferred else 0.0
+        elapsed = self._clock() - self._started if self._started is not None else 0.0
+        saved = self.skipped * mean_infer
+        return {
+            "frames": self.frames,
+            "inferred": self.inferred,
+            "skipped": self.skipped,
+            "skip_ratio": self.skipped / self.frames if self.frames else 0.0,
+            "mean_inference_ms": mean_infer * 1000,
+            "cpu_saved_s_per_min": saved / (elapsed / 60) if elapsed > 0 else 0.0,
+        }
+
+
+def format_gate_stats(stats):
+    """One-line summary of a gate's stats for the end of a run"""
+    return (f"⏭️  Skipped {stats['skipped']}/{stats['frames']} frames "
+            f"({stats['skip_ratio']:.0%}), ~{stats['cpu_saved_s_per_min']:.1f}s CPU saved per minute")
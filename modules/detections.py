@@ -0,0 +1,148 @@
+"""Compact per-frame detection results: one structured array plus an interned label table"""
+
+import numpy as np
+
+# One row per detection; ``track`` is -1 for untracked detections
+DETECTION = np.dtype([("box", "<f4", (4,)), ("cls", "<u2"), ("conf", "<f4"), ("track", "<i4")])
+
+_tables = {}
+
+
+class LabelTable:
+    """Class id to label name, built once per model
+
+    ``names`` is the model's ``{id: name}`` mapping. Names are held in a
+    NumPy object array so a whole frame's class ids turn into names with
+    one ``take``; :attr:`ids` maps names back to ids.
+    """
+
+    __slots__ = ("names", "ids")
+
+    def __init__(self, names):
+        size = max(names, default=-1) + 1 if isinstance(names, dict) else len(names)
+        items = names.items() if isinstance(names, dict) else enumerate(names)
+        self.names = np.full(size, "", dtype=object)
+        for i, name in items:
+            self.names[i] = name
+        self.ids = {name: i for i, name in enumerate(self.names) if name}
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, classes):
+        """Label names for an array of class ids"""
+        return self.names.take(np.asarray(classes, dtype=np.intp)).tolist()
+
+    def counts(self, classes):
+        """``{name: count}`` for an array of class ids"""
+        counts = np.bincount(np.asarray(classes, dtype=np.intp), minlength=len(self.names))
+        present = np.flatnonzero(counts)
+        return dict(zip(self.names[present].tolist(), counts[present].tolist()))
+
+
+def label_table(names):
+    """The :class:`LabelTable` for a model's ``names``, created on first use"""
+    entry = _tables.get(id(names))
+    if entry is None or entry[0] is not names:
+        if len(_tables) >= 32:  # models normally share one names dict; don't pin stray ones
+            _tables.clear()
+        entry = _tables[id(names)] = (names, LabelTable(names))
+    return entry[1]
+
+
+class DetectionFrame:
+    """One frame's detections as a structured array (see ``DETECTION``)
+
+    Build it with :meth:`from_results` straight from an ultralytics result
+    (one host copy for the whole frame), :meth:`from_arrays` or
+    :meth:`from_tracks`. Consumers read the column views :attr:`boxes`,
+    :attr:`classes`, :attr:`confidences` and :attr:`track_ids` and turn ids
+    into names through :attr:`labels` for the whole frame at once.
+    """
+
+    __slots__ = ("data", "labels", "seq")
+
+    def __init__(self, data, labels, seq=0):
+        self.data = data
+        self.labels = labels
+        self.seq = seq
+
+    @classmethod
+    def empty(cls, labels, seq=0):
+        return cls(np.zeros(0, DETECTION), labels, seq)
+
+    @classmethod
+    def from_arrays(cls, boxes, classes, confidences, labels, track_ids=None, seq=0):
+        data = np.empty(len(classes), DETECTION)
+        data["box"] = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        data["cls"] = classes
+        data["conf"] = confidences
+        data["track"] = -1 if track_ids is None else track_ids
+        return cls(data, labels, seq)
+
+    @classmethod
+    def from_results(cls, result, seq=0):
+        """From an ultralytics ``Results``: ``boxes.data`` rows are xyxy, [id], conf, cls"""
+        labels = label_table(result.names)
+        boxes = result.boxes
+        if boxes is None or len(boxes) == 0:
+            return cls.empty(labels, seq)
+        rows = boxes.data.cpu().numpy()
+        track_ids = rows[:, 4] if rows.shape[1] == 7 else None
+        return cls.from_arrays(rows[:, :4], rows[:, -1], rows[:, -2], labels, track_ids, seq)
+
+    @classmethod
+    def from_tracks(cls, tracks, labels, seq=0):
+        """From :class:`~modules.tracker.Track` objects, keeping their ids"""
+        data = np.empty(len(tracks), DETECTION)
+        for i, track in enumerate(tracks):
+            data[i] = (track.box, track.cls, track.confidence, track.id)
+        return cls(data, labels, seq)
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def boxes(self):
+        return self.data["box"]
+
+    @property
+    def classes(self):
+        return self.data["cls"]
+
+    @property
+    def confidences(self):
+        return self.data["conf"]
+
+    @property
+    def track_ids(self):
+        return self.data["track"]
+
+    def names(self):
+        """Label name of each detection"""
+        return self.labels.lookup(self.data["cls"])
+
+    def counts(self):
+        """``{name: count}`` over the frame"""
+        return self.labels.counts(self.data["cls"])
+
+    def select(self, mask):
+        """A new frame with the rows where ``mask`` is true"""
+        return DetectionFrame(self.data[mask], self.labels, self.seq)
+
+
+def draw_detections(image, frame, color=(0, 200, 255)):
+    """Overlay boxes with their label (and track id) on a copy of ``image``"""
+    import cv2  # type: ignore
+    canvas = image.copy()
+    if not len(frame):
+        return canvas
+    boxes = frame.boxes.astype(np.int32)
+    text_y = np.maximum(12, boxes[:, 1] - 4).tolist()
+    names = frame.names()
+    tracks = frame.track_ids.tolist()
+    for (x1, y1, x2, y2), name, track, y in zip(boxes.tolist(), names, tracks, text_y):
+        cv2.rectangle(canvas, (x1, y1), (x2, y2), color, 2)
+        caption = name if track < 0 else f"{name} #{track}"
+        cv2.putText(canvas, caption, (x1, y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1)
+    return canvas
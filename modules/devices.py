@@ -0,0 +1,285 @@
+"""Camera, microphone, window and voice used by the modes: the real hardware or replayed stand-ins"""
+
+import os
+import threading
+import time
+from collections import deque
+
+# cv2.CAP_PROP_* ids, so the fakes answer ``get`` without importing OpenCV
+CAP_PROP_POS_FRAMES = 1
+CAP_PROP_FPS = 5
+CAP_PROP_FRAME_COUNT = 7
+
+
+class WindowDisplay:
+    """An OpenCV window; :meth:`poll` returns the key pressed (-1 for none)"""
+
+    def __init__(self, title):
+        import cv2  # type: ignore
+        self.cv2 = cv2
+        self.title = title
+
+    def show(self, image):
+        self.cv2.imshow(self.title, image)
+
+    def poll(self, delay=1):
+        return self.cv2.waitKey(delay)
+
+    def close(self):
+        self.cv2.destroyAllWindows()
+
+
+class HeadlessDisplay:
+    """Counts frames instead of drawing them
+
+    With ``keep_last`` the newest frame is held in :attr:`last`. After
+    ``quit_after`` frames :meth:`poll` answers 'q', as if the user quit.
+    """
+
+    def __init__(self, title="", keep_last=False, quit_after=None):
+        self.title = title
+        self.keep_last = keep_last
+        self.quit_after = quit_after
+        self.shown = 0
+        self.last = None
+
+    def show(self, image):
+        self.shown += 1
+        if self.keep_last:
+            self.last = image
+
+    def poll(self, delay=1):
+        if self.quit_after is not None and self.shown >= self.quit_after:
+            return ord("q")
+        return -1
+
+    def close(self):
+        pass
+
+
+class RecordingSpeaker:
+    """A TTS stand-in: remembers what was said and takes ``seconds_per_word`` to say it
+
+    Only the ``keep`` most recent announcements are held, so hours of
+    replay do not grow memory; :attr:`count` counts all of them.
+    """
+
+    def __init__(self, seconds_per_word=0.0, keep=100, clock=time.monotonic):
+        self.seconds_per_word = seconds_per_word
+        self.spoken = deque(maxlen=keep)
+        self.count = 0
+        self._clock = clock
+
+    def __call__(self, text):
+        self.spoken.append((self._clock(), text))
+        self.count += 1
+        if self.seconds_per_word:
+            time.sleep(self.seconds_per_word * len(text.split()))
+
+    @property
+    def texts(self):
+        return [text for _, text in self.spoken]
+
+
+class FakeCamera:
+    """``cv2.VideoCapture`` stand-in that replays frames like a camera
+
+    ``source`` is a list of frames, a video file (decoded with OpenCV as it
+    plays) or a callable ``fn(index)`` returning frame ``index``, or None
+    to end. Frames come out at ``fps * speed`` per second; with ``speed``
+    None they come out as fast as they are read. A list or file starts over
+    at its end when ``loop`` is set; ``seconds`` ends the replay after that
+    much video either way.
+    """
+
+    live = False
+
+    def __init__(self, source, fps=30.0, speed=1.0, loop=False, seconds=None, clock=time.monotonic,
+                 sleep=time.sleep):
+        self.source = source
+        self.speed = speed
+        self.loop = loop
+        self.frames_read = 0
+        self._clock = clock
+        self._sleep = sleep
+        self._started = None
+        self._index = 0
+        self._video = None
+        if isinstance(source, (str, os.PathLike)):
+            import cv2  # type: ignore
+            self._video = cv2.VideoCapture(str(source))
+            fps = self._video.get(cv2.CAP_PROP_FPS) or fps
+        self.fps = fps
+        self.limit = None if seconds is None else int(round(seconds * fps))
+
+    def isOpened(self):
+        return self._video.isOpened() if self._video is not None else self.source is not None
+
+    def get(self, prop):
+        if prop == CAP_PROP_FPS:
+            return self.fps
+        if prop == CAP_PROP_FRAME_COUNT:
+            if self._video is not None:
+                return self._video.get(CAP_PROP_FRAME_COUNT)
+            return len(self.source) if isinstance(self.source, (list, tuple)) else -1
+        return 0.0
+
+    def _next_frame(self):
+        if self._video is not None:
+            ok, frame = self._video.read()
+            if not ok and self.loop and self._index:
+                self._video.set(CAP_PROP_POS_FRAMES, 0)
+                ok, frame = self._video.read()
+            self._index += 1
+            return frame if ok else None
+        if callable(self.source):
+            frame = self.source(self._index)
+        else:
+            if self._index >= len(self.source):
+                if not (self.loop and self._index):
+                    return None
+                self._index = 0
+            frame = self.source[self._index].copy()  # a camera hands out a new buffer every frame
+        self._index += 1
+        return frame
+
+    def read(self):
+        if self.source is None or (self.limit is not None and self.frames_read >= self.limit):
+            return False, None
+        frame = self._next_frame()
+        if frame is None:
+            return False, None
+        if self.speed:
+            now = self._clock()
+            if self._started is None:
+                self._started = now
+            wait = self._started + self.frames_read / (self.fps * self.speed) - now
+            if wait > 0:
+                self._sleep(wait)
+        self.frames_read += 1
+        return True, frame
+
+    def release(self):
+        if self._video is not None:
+            self._video.release()
+        self.source = None
+
+
+class Devices:
+    """The real hardware: OpenCV camera and window, sounddevice microphone, pyttsx3 voice
+
+    Modes open everything they touch through one of these, so
+    :class:`ReplayDevices` can swap in recordings and headless sinks
+    without changing the modes.
+    """
+
+    simulated = False
+
+    def camera(self, source=0):
+        import cv2  # type: ignore
+        return cv2.VideoCapture(source)
+
+    def microphone(self, blocksize=512):
+        from .audio_bus import MicCapture
+        return MicCapture(blocksize=blocksize)
+
+    def display(self, title):
+        return WindowDisplay(title)
+
+    def speaker(self):
+        from .announcer import pyttsx3_speaker
+        return pyttsx3_speaker()
+
+    @staticmethod
+    def from_env():
+        """Hardware, or :class:`ReplayDevices` when AURA_REPLAY_VIDEO or AURA_REPLAY_AUDIO is set
+
+        Either may be a file or ``synthetic``. AURA_REPLAY_SPEED sets the
+        replay speed (0 for as fast as possible) and AURA_REPLAY_SECONDS
+        how much input to play, looping shorter recordings.
+        """
+        video = os.environ.get("AURA_REPLAY_VIDEO")
+        audio = os.environ.get("AURA_REPLAY_AUDIO")
+        if not (video or audio):
+            return Devices()
+        speed = float(os.environ.get("AURA_REPLAY_SPEED", "1")) or None
+        seconds = os.environ.get("AURA_REPLAY_SECONDS")
+        return ReplayDevices(video=None if video in (None, "synthetic") else video,
+                             audio=None if audio in (None, "synthetic") else audio,
+                             speed=speed, seconds=float(seconds) if seconds else None)
+
+
+class ReplayDevices(Devices):
+    """Recordings or synthetic input in, headless sinks out
+
+    ``video`` is anything :class:`FakeCamera` replays and ``audio`` anything
+    :class:`~modules.audio_bus.FileCapture` feeds; None means a synthetic
+    scene (a moving bright object; alarms, knocks and speech over room
+    noise). Input plays at ``speed`` times real time (None: as fast as the
+    modes take it). With ``seconds`` shorter recordings loop until that
+    much input has played; without it they play once and synthetic video
+    never ends. Frames go to a :class:`HeadlessDisplay` and speech to a
+    :class:`RecordingSpeaker`; every device handed out is kept so a test
+    or soak run can inspect it afterwards.
+    """
+
+    simulated = True
+
+    def __init__(self, video=None, audio=None, speed=1.0, seconds=None, fps=30.0, seconds_per_word=0.0):
+        self.video = video
+        self.audio = audio
+        self.speed = speed
+        self.seconds = seconds
+        self.fps = fps
+        self.seconds_per_word = seconds_per_word
+        self.cameras = []
+        self.microphones = []
+        self.displays = []
+        self.speakers = []
+        self._lock = threading.Lock()
+
+    def _keep(self, devices, device):
+        with self._lock:
+            devices.append(device)
+        return device
+
+    def camera(self, source=0):
+        if self.video is None:
+            from .replay import moving_object
+            video = moving_object
+        else:
+            video = self.video
+        return self._keep(self.cameras, FakeCamera(video, self.fps, self.speed, loop=self.seconds is not None,
+                                                   seconds=self.seconds))
+
+    def microphone(self, blocksize=512):
+        from .audio_bus import FileCapture
+        if self.audio is None:
+            from .replay import room_scene
+            audio = room_scene()
+        else:
+            audio = self.audio
+        capture = FileCapture(audio, blocksize, realtime=self.speed is not None, speed=self.speed or 1.0,
+                              loop=self.seconds is not None, seconds=self.seconds)
+        return self._keep(self.microphones, capture)
+
+    def display(self, title):
+        return self._keep(self.displays, HeadlessDisplay(title))
+
+    def speaker(self):
+        per_word = self.seconds_per_word / self.speed if self.speed else 0.0
+        return self._keep(self.speakers, RecordingSpeaker(per_word))
+
+    @property
+    def input_seconds(self):
+        """Seconds of video and audio handed to the modes so far"""
+        return (sum(camera.frames_read / camera.fps for camera in self.cameras)
+                + sum(mic.written / mic.samplerate for mic in self.microphones))
+
+    @property
+    def frames_shown(self):
+        return sum(display.shown for display in self.displays)
+
+    @property
+    def spoken(self):
+        return [text for speaker in self.speakers for text in speaker.texts]
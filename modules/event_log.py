@@ -0,0 +1,475 @@
+"""Append-only event log: detections, alerts and transcripts on disk, queryable by time"""
+
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+from .metrics import metrics
+
+EVENT_DIR = Path(os.environ.get("AURA_EVENT_DIR", Path.home() / ".local" / "share" / "aura" / "events"))
+
+DETECTION, ALERT, TRANSCRIPT = 0, 1, 2
+KINDS = {"detection": DETECTION, "alert": ALERT, "transcript": TRANSCRIPT}
+
+# One file per column so a time lookup only touches ``t`` and a label
+# filter only ``label``. 47 bytes per event.
+COLUMNS = {
+    "t": ("<f8", ()),           # wall-clock seconds
+    "kind": ("u1", ()),
+    "label": ("<u2", ()),       # index into the label table
+    "frame": ("<u4", ()),       # frame number (detections)
+    "score": ("<f4", ()),       # confidence
+    "box": ("<f4", (4,)),       # x1, y1, x2, y2 (detections)
+    "value": ("<f4", ()),       # level in dBFS (alerts), seconds of audio (transcripts)
+    "text": ("<u4", (2,)),      # offset and length in the segment's text.bin (transcripts)
+}
+RECORD = np.dtype([(name, dtype, shape) for name, (dtype, shape) in COLUMNS.items()])
+
+FLUSH = metrics.timer("stage_seconds", mode="events", stage="flush")
+LOGGED = {kind: metrics.counter("events_logged", "Events written to the event log", kind=kind) for kind in KINDS}
+
+
+class Segment:
+    """One directory of preallocated, memory-mapped column files plus a text blob
+
+    Rows ``[0, count)`` are valid; the rest of each column is reserved
+    space. ``t0``/``t1`` bound the timestamps held and ``ordered`` says
+    whether ``t`` is non-decreasing, which lets queries binary-search it.
+    """
+
+    def __init__(self, path, capacity, count=0, t0=None, t1=None, ordered=True, text_bytes=0):
+        self.path = Path(path)
+        self.capacity = capacity
+        self.count = count
+        self.t0, self.t1 = t0, t1
+        self.ordered = ordered
+        self.text_bytes = text_bytes
+        self._columns = None
+        self._writable = False
+        self._text = None
+
+    @property
+    def id(self):
+        return int(self.path.name.split("-")[1])
+
+    @property
+    def nbytes(self):
+        """Bytes of events and text held (not the reserved space)"""
+        return self.count * RECORD.itemsize + self.text_bytes
+
+    def columns(self, writable=False):
+        """Memory-mapped columns, created at full capacity on first write
+
+        Columns first mapped read-only by a query are remapped ``r+`` when
+        a write needs them.
+        """
+        if self._columns is None or (writable and not self._writable):
+            self.sync()
+            self._writable = writable
+            if writable and not self.path.exists():
+                self.path.mkdir(parents=True)
+                self._columns = {name: np.lib.format.open_memmap(self.path / f"{name}.npy", mode="w+",
+                                                                 dtype=dtype, shape=(self.capacity,) + shape)
+                                 for name, (dtype, shape) in COLUMNS.items()}
+            else:
+                self._columns = {name: np.load(self.path / f"{name}.npy", mmap_mode="r+" if writable else "r")
+                                 for name in COLUMNS}
+        return self._columns
+
+    def append(self, rows, text):
+        """Write ``rows`` (RECORD array, text offsets relative to ``text``) after the last row"""
+        columns = self.columns(writable=True)
+        start, stop = self.count, self.count + len(rows)
+        if text:
+            if self._text is None:
+                self._text = open(self.path / "text.bin", "ab")
+            self._text.write(text)
+            rows["text"][:, 0] += self.text_bytes
+        for name, column in columns.items():
+            column[start:stop] = rows[name]
+        t = rows["t"]
+        if self.t1 is not None and t[0] < self.t1:
+            self.ordered = False
+        self.t0 = float(t.min()) if self.t0 is None else min(self.t0, float(t.min()))
+        self.t1 = float(t.max()) if self.t1 is None else max(self.t1, float(t.max()))
+        self.count = stop
+        self.text_bytes += len(text)
+
+    def sync(self):
+        """Push written pages and text to disk"""
+        for column in (self._columns or {}).values():
+            if isinstance(column, np.memmap) and column.mode != "r":
+                column.flush()
+        if self._text is not None:
+            self._text.flush()
+
+    def close(self):
+        self.sync()
+        if self._text is not None:
+            self._text.close()
+        self._columns = self._text = None
+        self._writable = False
+
+    def select(self, start, end):
+        """Row range ``[i, j)`` with ``start <= t < end``, or a boolean mask if unordered"""
+        t = self.columns()["t"][:self.count]
+        if not self.ordered:
+            return (t >= start) & (t < end)
+        return slice(int(np.searchsorted(t, start, "left")), int(np.searchsorted(t, end, "left")))
+
+    def texts(self, spans):
+        """Decode transcript text for ``(offset, length)`` pairs"""
+        if self._text is not None:
+            self._text.flush()
+        blob = np.memmap(self.path / "text.bin", dtype=np.uint8, mode="r") if self.text_bytes else b""
+        return [bytes(blob[o:o + n]).decode("utf-8") for o, n in spans.tolist()]
+
+    def meta(self):
+        return {"name": self.path.name, "capacity": self.capacity, "count": self.count, "t0": self.t0,
+                "t1": self.t1, "ordered": self.ordered, "text_bytes": self.text_bytes}
+
+
+class EventLog:
+    """Append-only, size-capped store of detections, alerts and transcripts
+
+    Modes call :meth:`detections`, :meth:`alert` and :meth:`transcript`;
+    those only queue a small NumPy record array, and a background thread
+    started by :meth:`start` writes the queue every ``flush_interval``
+    seconds. Events live in segments of about ``segment_bytes``; when one
+    fills up a new one is started, and the oldest are deleted once the log
+    holds more than ``max_bytes``. ``index.json`` keeps the label table and
+    each segment's row count and time range, so :meth:`query` opens only
+    the segments that overlap the requested window.
+
+    Queries see what has been flushed, not what is still queued.
+    """
+
+    def __init__(self, root=None, segment_bytes=8 << 20, max_bytes=256 << 20, flush_interval=1.0,
+                 clock=time.time):
+        self.root = Path(root or EVENT_DIR)
+        self.capacity = max(1, segment_bytes // RECORD.itemsize)
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.flush_interval = flush_interval
+        self.labels = []
+        self.segments = []
+        self.dropped_segments = 0
+        self._label_ids = {}
+        self._table_ids = {}
+        self._pending = []
+        self._pending_text = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.RLock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._clock = clock
+        self._load_index()
+
+    def label_id(self, label):
+        """Intern ``label`` in the label table"""
+        try:
+            return self._label_ids[label]
+        except KeyError:
+            with self._lock:
+                if label not in self._label_ids:
+                    self._label_ids[label] = len(self.labels)
+                    self.labels.append(label)
+            return self._label_ids[label]
+
+    def _queue(self, rows, text=b""):
+        with self._lock:
+            self._pending.append(rows)
+            self._pending_text.append(text)
+
+    def detections(self, labels, scores, boxes, frame=0, t=None):
+        """Log one frame's detections: label names, confidences and xyxy boxes"""
+        rows = np.zeros(len(labels), RECORD)
+        if len(rows) == 0:
+            return
+        rows["t"] = self._clock() if t is None else t
+        rows["kind"] = DETECTION
+        rows["label"] = [self.label_id(label) for label in labels]
+        rows["frame"] = frame
+        rows["score"] = scores
+        rows["box"] = boxes
+        self._queue(rows)
+
+    def log_frame(self, frame, t=None):
+        """Log a :class:`DetectionFrame`; class ids map to log label ids in one lookup"""
+        if not len(frame):
+            return
+        table = frame.labels
+        ids = self._table_ids.get(id(table))
+        if ids is None or ids[0] is not table:
+            ids = self._table_ids[id(table)] = (table, np.array([self.label_id(name) for name in table.names],
+                                                                np.uint16))
+        rows = np.zeros(len(frame), RECORD)
+        rows["t"] = self._clock() if t is None else t
+        rows["kind"] = DETECTION
+        rows["label"] = ids[1][frame.classes.astype(np.intp)]
+        rows["frame"] = frame.seq
+        rows["score"] = frame.confidences
+        rows["box"] = frame.boxes
+        self._queue(rows)
+
+    def alert(self, label, confidence=0.0, level_db=0.0, t=None):
+        """Log a sound alert with its label and loudness"""
+        rows = np.zeros(1, RECORD)
+        rows["t"] = self._clock() if t is None else t
+        rows["kind"] = ALERT
+        rows["label"] = self.label_id(label)
+        rows["score"] = confidence
+        rows["value"] = level_db
+        self._queue(rows)
+
+    def transcript(self, text, duration=0.0, t=None):
+        """Log a transcript segment covering ``duration`` seconds of audio"""
+        data = text.encode("utf-8")
+        rows = np.zeros(1, RECORD)
+        rows["t"] = self._clock() if t is None else t
+        rows["kind"] = TRANSCRIPT
+        rows["value"] = duration
+        rows["text"] = (0, len(data))
+        self._queue(rows, data)
+
+    def flush(self):
+        """Write everything queued so far; returns the number of events written"""
+        with self._lock:
+            pending, texts = self._pending, self._pending_text
+            self._pending, self._pending_text = [], []
+        if not pending:
+            return 0
+        with self._io_lock, FLUSH.time():
+            offset = 0
+            for rows, text in zip(pending, texts):
+                if text:
+                    rows["text"][:, 0] = offset
+                    offset += len(text)
+            rows = np.concatenate(pending)
+            blob = b"".join(texts)
+            order = np.argsort(rows["t"], kind="stable")
+            rows = rows[order]
+            try:
+                self._write(rows, blob)
+            except Exception:
+                with self._lock:  # keep the events for the next flush
+                    self._pending[:0] = pending
+                    self._pending_text[:0] = texts
+                raise
+            self.segments[-1].sync()
+            self._enforce_cap()
+            self._save_index()
+        for kind, name in enumerate(KINDS):
+            LOGGED[name].inc(int(np.count_nonzero(rows["kind"] == kind)))
+        return len(rows)
+
+    def _write(self, rows, blob):
+        """Append rows across as many segments as they need"""
+        while len(rows):
+            segment = self.segments[-1] if self.segments else None
+            if segment is None or segment.count == segment.capacity or segment.text_bytes >= self.segment_bytes:
+                segment = self._rotate()
+            n = min(len(rows), segment.capacity - segment.count)
+            chunk = rows[:n].copy()
+            spans = chunk["text"]
+            text_rows = spans[:, 1] > 0
+            if text_rows.any():
+                lo = int(spans[text_rows, 0].min())
+                hi = int((spans[text_rows, 0] + spans[text_rows, 1]).max())
+                text = blob[lo:hi]
+                spans[text_rows, 0] -= lo
+            else:
+                text = b""
+            segment.append(chunk, text)
+            rows = rows[n:]
+
+    def _rotate(self):
+        if self.segments:
+            self.segments[-1].close()
+        next_id = self.segments[-1].id + 1 if self.segments else 1
+        segment = Segment(self.root / f"seg-{next_id:06d}", self.capacity)
+        self.segments.append(segment)
+        return segment
+
+    def _enforce_cap(self):
+        """Delete the oldest segments while the log holds more than ``max_bytes``"""
+        while len(self.segments) > 1 and sum(s.nbytes for s in self.segments) > self.max_bytes:
+            oldest = self.segments.pop(0)
+            oldest.close()
+            shutil.rmtree(oldest.path, ignore_errors=True)
+            self.dropped_segments += 1
+
+    def _load_index(self):
+        path = self.root / "index.json"
+        if not path.exists():
+            return
+        index = json.loads(path.read_text())
+        self.labels = list(index["labels"])
+        self._label_ids = {label: i for i, label in enumerate(self.labels)}
+        for meta in index["segments"]:
+            name = meta.pop("name")
+            self.segments.append(Segment(self.root / name, **meta))
+
+    def _save_index(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        index = {"labels": self.labels, "segments": [s.meta() for s in self.segments]}
+        tmp = self.root / "index.json.tmp"
+        tmp.write_text(json.dumps(index))
+        os.replace(tmp, self.root / "index.json")
+
+    def _run(self):
+        while not self._wake.wait(self.flush_interval):
+            self.flush()
+
+    def start(self):
+        """Flush on a background thread until :meth:`stop`"""
+        if self._thread is None:
+            self._wake.clear()
+            self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the flush thread, write what is left and close the files"""
+        if self._thread is not None:
+            self._wake.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        with self._io_lock:
+            for segment in self.segments:
+                segment.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    @property
+    def count(self):
+        return sum(s.count for s in self.segments)
+
+    @property
+    def nbytes(self):
+        return sum(s.nbytes for s in self.segments)
+
+    def _segment_rows(self, segment, start, end, kind, wanted):
+        rows = segment.select(start, end)
+        columns = segment.columns()
+        mask = None
+        if kind is not None:
+            mask = columns["kind"][:segment.count][rows] == kind
+        if wanted is not None:
+            hit = np.isin(columns["label"][:segment.count][rows], wanted)
+            mask = hit if mask is None else mask & hit
+        if mask is not None:  # other columns are read only at the matching rows
+            rows = np.flatnonzero(mask) + rows.start if isinstance(rows, slice) else np.flatnonzero(rows)[mask]
+        out = np.empty(len(columns["t"][:segment.count][rows]), RECORD)
+        for name, column in columns.items():
+            out[name] = column[:segment.count][rows]
+        return out
+
+    def _scan(self, start, end, kind=None, labels=None):
+        """``(segment, rows)`` for each segment overlapping ``[start, end)``"""
+        start = -np.inf if start is None else start
+        end = np.inf if end is None else end
+        kind = KINDS[kind] if isinstance(kind, str) else kind
+        if isinstance(labels, str):
+            labels = [labels]
+        wanted = None if labels is None else [self._label_ids[label] for label in labels if label in self._label_ids]
+        with self._io_lock:
+            return [(segment, self._segment_rows(segment, start, end, kind, wanted))
+                    for segment in self.segments
+                    if segment.count and segment.t1 >= start and segment.t0 < end]
+
+    def query(self, start=None, end=None, kind=None, labels=None):
+        """Events with ``start <= t < end`` as one RECORD array, oldest first
+
+        ``kind`` is "detection", "alert" or "transcript"; ``labels`` a
+        label name or list of names. Label ids in the result index
+        :attr:`labels`; use :meth:`transcripts` for transcript text.
+        """
+        parts = [rows for _, rows in self._scan(start, end, kind, labels)]
+        if not parts:
+            return np.zeros(0, RECORD)
+        result = np.concatenate(parts)
+        if not all(s.ordered for s in self.segments):
+            result = result[np.argsort(result["t"], kind="stable")]
+        return result
+
+    def transcripts(self, start=None, end=None):
+        """``(t, text)`` for each transcript segment in the window, oldest first"""
+        result = []
+        for segment, rows in self._scan(start, end, TRANSCRIPT):
+            result.extend(zip(rows["t"].tolist(), segment.texts(rows["text"])))
+        return sorted(result, key=lambda item: item[0])
+
+    def counts(self, start=None, end=None, kind="detection"):
+        """How many events of ``kind`` each label has in the window"""
+        ids = self.query(start, end, kind)["label"]
+        return Counter({self.labels[i]: int(n) for i, n in zip(*np.unique(ids, return_counts=True))})
+
+
+class _NullLog:
+    """Stands in for :class:`EventLog` when logging is turned off"""
+
+    def detections(self, *args, **kwargs):
+        pass
+
+    alert = transcript = log_frame = detections
+
+    def start(self):
+        return self
+
+    def stop(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+
+def open_log(root=None, **kwargs):
+    """A started :class:`EventLog` in ``root`` (default AURA_EVENT_DIR), or a no-op stand-in if AURA_EVENT_LOG=0"""
+    if os.environ.get("AURA_EVENT_LOG") == "0":
+        return _NullLog()
+    return EventLog(root or os.environ.get("AURA_EVENT_DIR"), **kwargs).start()
+
+
+def main(argv=None):
+    """Review the log: ``python -m modules.event_log [--minutes 10] [--label person] [--kind alert]``"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarise recent AURA events")
+    parser.add_argument("--root", default=None, help=f"log directory (default {EVENT_DIR})")
+    parser.add_argument("--minutes", type=float, default=60.0, help="how far back to look")
+    parser.add_argument("--label", action="append", help="only these labels (repeatable)")
+    parser.add_argument("--kind", choices=list(KINDS), help="only this kind of event")
+    args = parser.parse_args(argv)
+
+    log = EventLog(args.root)
+    start = time.time() - args.minutes * 60
+    print(f"📒 {log.count} events in {len(log.segments)} segments ({log.nbytes / 1e6:.1f} MB)")
+    for kind in ([args.kind] if args.kind else ["detection", "alert"]):
+        rows = log.query(start, kind=kind, labels=args.label)
+        counts = Counter(log.labels[i] for i in rows["label"].tolist())
+        print(f"{kind}s in the last {args.minutes:g} min: {len(rows)}")
+        for label, n in counts.most_common():
+            print(f"  {label:>20} {n}")
+    if args.kind in (None, "transcript") and not args.label:
+        for t, text in log.transcripts(start):
+            print(f"  {time.strftime('%H:%M:%S', time.localtime(t))}  {text}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,332 @@
+"""One camera capture shared by every vision consumer, across processes"""
+
+import threading
+import time
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+
+import numpy as np
+
+try:
+    import cv2  # type: ignore
+except ImportError:
+    cv2 = None
+
+_HEADER = 2  # latest sequence number, closed flag
+_ALIGN = 64
+
+
+@dataclass
+class Frame:
+    """A sequence-numbered frame; ``image`` is a view into shared memory"""
+    seq: int
+    timestamp: float
+    image: np.ndarray
+
+
+def _open_shm(name):
+    """Attach without registering with the resource tracker (the owner unlinks)"""
+    try:
+        return shared_memory.SharedMemory(name=name, create=False, track=False)
+    except TypeError:  # Python < 3.13 always registers, and would unlink at exit
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        resource_tracker.register = lambda *args, **kwargs: None
+        try:
+            return shared_memory.SharedMemory(name=name, create=False)
+        finally:
+            resource_tracker.register = register
+
+
+class FrameBus:
+    """A ring of frame slots in ``multiprocessing.shared_memory``
+
+    The capture owner writes each frame into the next slot (cv2 can decode
+    straight into it) and stamps it with a sequence number; consumers in
+    this or another process attach by name and read NumPy views of the
+    slots, so no frame is pickled or copied on its way to them.
+
+    A slot's sequence number is set to -1 while it is being written. A
+    reader that wants to be sure a view was not overwritten while it was
+    using it checks :meth:`valid` afterwards; with ``slots`` frames of
+    slack this only happens to readers that are that far behind.
+    """
+
+    def __init__(self, shape, dtype=np.uint8, slots=8, source=None, name=None, create=True,
+                 clock=time.monotonic):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        self.source = source
+        self._clock = clock
+        self._owner = create
+        frame_bytes = int(np.prod(self.shape)) * self.dtype.itemsize
+        self._stride = -(-frame_bytes // _ALIGN) * _ALIGN
+        header_bytes = -(-8 * (_HEADER + 2 * slots) // _ALIGN) * _ALIGN
+        size = header_bytes + self._stride * slots
+        if create:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            self.shm = _open_shm(name)
+        buf = self.shm.buf
+        self._state = np.ndarray(_HEADER, np.int64, buf, 0)
+        self._seqs = np.ndarray(slots, np.int64, buf, 8 * _HEADER)
+        self._times = np.ndarray(slots, np.float64, buf, 8 * (_HEADER + slots))
+        self._frames = [np.ndarray(self.shape, self.dtype, buf, header_bytes + i * self._stride)
+                        for i in range(slots)]
+        self._listeners = []
+        self._claimed = None
+        if create:
+            self._state[:] = (-1, 0)
+            self._seqs[:] = -1
+
+    @property
+    def spec(self):
+        """Picklable arguments for :meth:`attach` in another process"""
+        return {"name": self.shm.name, "shape": self.shape, "dtype": self.dtype.str, "slots": self.slots}
+
+    @classmethod
+    def attach(cls, name, shape, dtype, slots):
+        return cls(shape, dtype, slots, name=name, create=False)
+
+    @property
+    def latest_seq(self):
+        return int(self._state[0])
+
+    @property
+    def closed(self):
+        return bool(self._state[1])
+
+    def claim(self):
+        """Writable slot for the next frame; call :meth:`commit` when filled"""
+        seq = self.latest_seq + 1
+        slot = seq % self.slots
+        self._seqs[slot] = -1
+        self._claimed = seq
+        return self._frames[slot]
+
+    def commit(self, timestamp=None):
+        seq = self._claimed
+        slot = seq % self.slots
+        self._times[slot] = self._clock() if timestamp is None else timestamp
+        self._seqs[slot] = seq
+        self._state[0] = seq
+        self._claimed = None
+        for listener in self._listeners:
+            listener()
+        return seq
+
+    def owns(self, frame):
+        """True if ``frame`` is the slot handed out by the pending :meth:`claim`"""
+        return self._claimed is not None and frame is self._frames[self._claimed % self.slots]
+
+    def publish(self, frame, timestamp=None):
+        """Copy ``frame`` into the next slot; returns its sequence number"""
+        np.copyto(self.claim(), frame)
+        return self.commit(timestamp)
+
+    def get(self, seq):
+        """The frame with sequence number ``seq``, or None if not (or no longer) held"""
+        slot = seq % self.slots
+        if seq < 0 or self._seqs[slot] != seq:
+            return None
+        view = self._frames[slot].view()
+        view.flags.writeable = False
+        return Frame(seq, float(self._times[slot]), view)
+
+    def latest(self):
+        seq = self.latest_seq
+        return self.get(seq) if seq >= 0 else None
+
+    def valid(self, frame):
+        """True if ``frame``'s slot has not been reused since it was read"""
+        return self._seqs[frame.seq % self.slots] == frame.seq
+
+    def subscribe(self):
+        """New cursor starting after the newest frame"""
+        return FrameReader(self)
+
+    def add_listener(self, fn):
+        """Call ``fn()`` from the capture thread after every commit and at close"""
+        self._listeners.append(fn)
+
+    def close(self):
+        """Mark the end of the stream"""
+        self._state[1] = 1
+        for listener in self._listeners:
+            listener()
+
+    def start(self):
+        self._state[1] = 0
+        if self.source is not None:
+            self.source.start(self)
+        return self
+
+    def stop(self):
+        if self.source is not None:
+            self.source.stop()
+        self.close()
+
+    def release(self):
+        """Detach; the owner also frees the shared memory"""
+        self._frames = []
+        self._state = self._seqs = self._times = None
+        self.shm.close()
+        if self._owner:
+            self.shm.unlink()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+class FrameReader:
+    """One consumer's cursor on a :class:`FrameBus`
+
+    :meth:`latest` always jumps to the newest frame (skipped ones are
+    counted in ``dropped``); :meth:`next` walks every frame in order and
+    counts ``overruns`` when the writer has already reused a slot.
+    """
+
+    def __init__(self, bus, poll=0.001):
+        self.bus = bus
+        self.poll = poll
+        self.last_seq = bus.latest_seq
+        self.dropped = 0
+        self.overruns = 0
+
+    def _wait(self, ready, timeout):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not ready():
+            if self.bus.closed or (deadline is not None and time.monotonic() >= deadline):
+                return ready()
+            time.sleep(self.poll)
+        return True
+
+    def latest(self, timeout=None):
+        """Newest frame after the last one returned, or None on timeout/close"""
+        frame = None
+        while frame is None:
+            if not self._wait(lambda: self.bus.latest_seq > self.last_seq, timeout):
+                return None
+            frame = self.bus.latest()  # None only if lapped mid-read; try again
+        self.dropped += frame.seq - self.last_seq - 1
+        self.last_seq = frame.seq
+        return frame
+
+    def next(self, timeout=None):
+        """The frame after the last one returned, in order"""
+        if not self._wait(lambda: self.bus.latest_seq > self.last_seq, timeout):
+            return None
+        frame = self.bus.get(self.last_seq + 1)
+        if frame is None:
+            oldest = max(0, self.bus.latest_seq - self.bus.slots + 1)
+            self.overruns += 1
+            self.dropped += oldest - self.last_seq - 1
+            self.last_seq = oldest - 1
+            return self.next(timeout)
+        self.last_seq = frame.seq
+        return frame
+
+    def __iter__(self):
+        while True:
+            frame = self.next()
+            if frame is None:
+                return
+            yield frame
+
+
+class VideoSource:
+    """Decode a camera, video file or list of frames into a :class:`FrameBus`
+
+    Frames are decoded directly into the claimed shared-memory slot when
+    OpenCV can reuse it. ``realtime`` paces files (and frame lists at
+    ``fps``) like a live camera. ``source`` may also be an opened capture
+    such as :meth:`Devices.camera <modules.devices.Devices.camera>` returns,
+    which paces itself.
+    """
+
+    def __init__(self, source=0, realtime=True, fps=30.0, clock=time.monotonic):
+        self.source = source
+        self.realtime = realtime
+        self.fps = fps
+        self._clock = clock
+        self._cap = None
+        self._first = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def probe(self):
+        """Open the source and return the frame shape"""
+        if isinstance(self.source, (int, str)):
+            self._cap = cv2.VideoCapture(self.source)
+            ret, frame = self._cap.read() if self._cap.isOpened() else (False, None)
+            if not ret:
+                self._cap.release()
+                raise RuntimeError("Camera not available")
+            if isinstance(self.source, str):
+                self.fps = self._cap.get(cv2.CAP_PROP_FPS) or self.fps
+            else:
+                self.realtime = False  # a live camera paces itself
+            self._first = frame
+        elif hasattr(self.source, "read"):
+            self._cap = self.source
+            ret, frame = self._cap.read()
+            if not ret:
+                self._cap.release()
+                raise RuntimeError("Camera not available")
+            self.realtime = False
+            self._first = frame
+        else:
+            self._first = self.source[0]
+        return self._first.shape
+
+    def open_bus(self, slots=8):
+        """Probe the source and create a bus sized for its frames"""
+        return FrameBus(self.probe(), slots=slots, source=self)
+
+    def start(self, bus):
+        if self._first is None:
+            self.probe()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(bus,), daemon=True)
+        self._thread.start()
+
+    def frames(self, bus):
+        """Yield decoded frames, each in ``bus``'s claimed slot when possible"""
+        if self._first is None:
+            self.probe()
+        yield self._first
+        if self._cap is None:
+            yield from self.source[1:]
+            return
+        into_slot = isinstance(self.source, (int, str))
+        while True:
+            ret, frame = self._cap.read(bus.claim()) if into_slot else self._cap.read()
+            if not ret:
+                return
+            yield frame
+
+    def _run(self, bus):
+        interval = 1.0 / self.fps if self.realtime and self.fps else 0.0
+        try:
+            for frame in self.frames(bus):
+                if self._stop.is_set():
+                    break
+                if bus.owns(frame):
+                    bus.commit(self._clock())
+                else:
+                    bus.publish(frame, self._clock())
+                if interval:
+                    self._stop.wait(interval)
+        finally:
+            if self._cap is not None:
+                self._cap.release()
+            bus.close()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
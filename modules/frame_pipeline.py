@@ -0,0 +1,213 @@
+"""Threaded capture -> inference -> render pipeline for the vision modes"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+
+from .metrics import metrics
+
+
+@dataclass
+class FramePacket:
+    """A captured frame travelling through the pipeline"""
+    seq: int
+    captured_at: float
+    frame: Any
+    result: Any = None
+
+
+class LatestSlot:
+    """Size-1 latest-wins handoff between two threads
+
+    ``put`` never blocks: an item the consumer has not picked up yet is
+    replaced and counted as dropped, so a slow consumer always sees the
+    newest frame instead of working through a backlog of stale ones.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._item = None
+        self.closed = False
+        self.put_count = 0
+        self.dropped = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._item is not None:
+                self.dropped += 1
+            self._item = item
+            self.put_count += 1
+            self._cond.notify_all()
+
+    def get(self, timeout=None):
+        """Take the newest item, or None on timeout or once closed and empty"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._item is not None or self.closed, timeout)
+            item, self._item = self._item, None
+            return item
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class StageTimer:
+    """Rolling window of durations for one pipeline stage
+
+    Durations are also fed to ``metric`` (a :mod:`~modules.metrics` timer)
+    so they show up in the process-wide metrics export.
+    """
+
+    def __init__(self, window=300, metric=None):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.metric = metric
+
+    def add(self, seconds):
+        if self.metric is not None:
+            self.metric.observe(seconds)
+        self.samples.append(seconds)
+        self.count += 1
+        self.total += seconds
+
+    def summary(self):
+        if not self.samples:
+            return {"count": 0, "mean_ms": 0.0, "p50_ms": 0.0, "p95_ms": 0.0}
+        values = np.asarray(self.samples) * 1000
+        return {
+            "count": self.count,
+            "mean_ms": float(values.mean()),
+            "p50_ms": float(np.percentile(values, 50)),
+            "p95_ms": float(np.percentile(values, 95)),
+        }
+
+
+class DetectionPipeline:
+    """Run capture and inference on their own threads; render on the caller's
+
+    ``capture`` is anything with a ``cv2.VideoCapture``-style ``read()``.
+    ``infer`` maps a frame to a result. The caller drains :meth:`next_result`
+    (``cv2.imshow`` must stay on the main thread) and reports each drawn
+    frame back through :meth:`rendered`.
+    """
+
+    STAGES = ("capture", "inference", "render", "end_to_end")
+
+    def __init__(self, capture, infer, pace_fps=None, clock=time.perf_counter, window=300, mode="detection"):
+        self.capture = capture
+        self.infer = infer
+        self.pace = 1.0 / pace_fps if pace_fps else 0.0
+        self.frames = LatestSlot()
+        self.results = LatestSlot()
+        self.timings = {stage: StageTimer(window, metrics.timer("stage_seconds", mode=mode, stage=stage))
+                        for stage in self.STAGES}
+        self.error = None
+        self.eof = False
+        self._clock = clock
+        self._stop = threading.Event()
+        self._threads = []
+        self._started_at = None
+        self._stopped_at = None
+
+    def start(self):
+        self._started_at = self._clock()
+        for target, name in ((self._capture_loop, "aura-capture"), (self._inference_loop, "aura-inference")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self.frames.close()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        if self._stopped_at is None:
+            self._stopped_at = self._clock()
+
+    @property
+    def done(self):
+        """True once no more results will arrive"""
+        return self.results.closed
+
+    def next_result(self, timeout=0.1):
+        """Newest inferred packet, or None if nothing new arrived in time"""
+        return self.results.get(timeout)
+
+    @contextmanager
+    def timed(self, stage):
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.timings[stage].add(self._clock() - started)
+
+    def rendered(self, packet):
+        """Record that ``packet`` reached the screen"""
+        self.timings["end_to_end"].add(self._clock() - packet.captured_at)
+
+    def stats(self):
+        """Per-stage timings, stage FPS and drop counts"""
+        elapsed = (self._stopped_at or self._clock()) - (self._started_at or self._clock())
+        stats = {stage: timer.summary() for stage, timer in self.timings.items()}
+        for stage in ("capture", "inference", "end_to_end"):
+            stats[stage]["fps"] = self.timings[stage].count / elapsed if elapsed > 0 else 0.0
+        stats["frames_dropped"] = self.frames.dropped
+        stats["results_dropped"] = self.results.dropped
+        stats["elapsed_s"] = elapsed
+        return stats
+
+    def _capture_loop(self):
+        seq = 0
+        try:
+            while not self._stop.is_set():
+                started = self._clock()
+                ret, frame = self.capture.read()
+                now = self._clock()
+                if not ret:
+                    self.eof = True
+                    break
+                self.timings["capture"].add(now - started)
+                self.frames.put(FramePacket(seq, now, frame))
+                seq += 1
+                if self.pace:
+                    time.sleep(max(0.0, self.pace - (self._clock() - started)))
+        except Exception as e:
+            self.error = e
+        finally:
+            self.frames.close()
+
+    def _inference_loop(self):
+        try:
+            while not self._stop.is_set():
+                packet = self.frames.get(timeout=0.5)
+                if packet is None:
+                    if self.frames.closed:
+                        break
+                    continue
+                with self.timed("inference"):
+                    packet.result = self.infer(packet.frame)
+                self.results.put(packet)
+        except Exception as e:
+            self.error = e
+        finally:
+            self._stopped_at = self._clock()
+            self.results.close()
+
+
+def format_stats(stats):
+    """One line per stage for printing at the end of a run"""
+    lines = []
+    for stage in DetectionPipeline.STAGES:
+        s = stats[stage]
+        fps = f", {s['fps']:.1f} FPS" if "fps" in s else ""
+        lines.append(f"  {stage:<11} mean {s['mean_ms']:6.1f} ms  p95 {s['p95_ms']:6.1f} ms{fps}")
+    lines.append(f"  dropped     {stats['frames_dropped']} stale frames, {stats['results_dropped']} results")
+    return "\n".join(lines)
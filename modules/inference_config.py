@@ -0,0 +1,172 @@
+"""Shared inference settings for the vision modes (size, classes, thresholds, ROI)"""
+
+import os
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+try:
+    import cv2  # type: ignore
+except ImportError:
+    cv2 = None
+
+
+@dataclass(frozen=True)
+class InferenceConfig:
+    """What the detector looks at and what it reports
+
+    ``imgsz`` is the model input size (320 is the "half-size" setting for
+    CPU-only units). ``classes`` limits detections to the given label names.
+    ``roi`` keeps only the centre fraction of the frame. ``letterbox``
+    resizes into a reused buffer before the model sees the frame.
+    """
+    imgsz: int = 640
+    classes: tuple = None
+    conf: float = 0.25
+    iou: float = 0.7
+    roi: float = 1.0
+    letterbox: bool = False
+
+    @classmethod
+    def from_env(cls, environ=os.environ):
+        """Build a config from AURA_PRESET and AURA_IMGSZ/CLASSES/CONF/IOU/ROI"""
+        config = PRESETS[environ.get("AURA_PRESET", "accurate")]
+        overrides = {}
+        if "AURA_IMGSZ" in environ:
+            overrides["imgsz"] = int(environ["AURA_IMGSZ"])
+        if "AURA_CLASSES" in environ:
+            overrides["classes"] = tuple(c.strip() for c in environ["AURA_CLASSES"].split(",") if c.strip())
+        if "AURA_CONF" in environ:
+            overrides["conf"] = float(environ["AURA_CONF"])
+        if "AURA_IOU" in environ:
+            overrides["iou"] = float(environ["AURA_IOU"])
+        if "AURA_ROI" in environ:
+            overrides["roi"] = float(environ["AURA_ROI"])
+        return replace(config, **overrides)
+
+    def class_ids(self, names):
+        """Map allowed label names to ids using the model's ``names`` dict"""
+        if not self.classes:
+            return None
+        lookup = {name: idx for idx, name in names.items()}
+        unknown = [c for c in self.classes if c not in lookup]
+        if unknown:
+            raise ValueError(f"Unknown classes: {', '.join(unknown)}")
+        return [lookup[c] for c in self.classes]
+
+    def predict_kwargs(self, names):
+        """Keyword arguments for an ultralytics ``model(frame, ...)`` call"""
+        return {
+            "imgsz": self.imgsz,
+            "conf": self.conf,
+            "iou": self.iou,
+            "classes": self.class_ids(names),
+            "verbose": False,
+        }
+
+
+PRESETS = {
+    "accurate": InferenceConfig(),
+    "balanced": InferenceConfig(imgsz=480, conf=0.3),
+    "fast": InferenceConfig(imgsz=320, conf=0.35, roi=0.8, letterbox=True),
+}
+
+
+class Letterboxer:
+    """Resize frames into a reused square canvas, keeping aspect ratio
+
+    Scale and padding are computed once per input shape and the output
+    canvas is preallocated, so steady-state resizing allocates nothing.
+    """
+
+    def __init__(self, size, fill=114):
+        self.size = size
+        self.fill = fill
+        self._shape = None
+        self._canvas = None
+        self._view = None
+        self.scale = 1.0
+        self.pad = (0, 0)
+
+    def __call__(self, frame):
+        if frame.shape != self._shape:
+            h, w = frame.shape[:2]
+            self.scale = min(self.size / h, self.size / w)
+            nw, nh = round(w * self.scale), round(h * self.scale)
+            px, py = (self.size - nw) // 2, (self.size - nh) // 2
+            self.pad = (px, py)
+            self._canvas = np.full((self.size, self.size) + frame.shape[2:], self.fill, frame.dtype)
+            self._view = self._canvas[py:py + nh, px:px + nw]
+            self._shape = frame.shape
+        if cv2 is not None:
+            cv2.resize(frame, (self._view.shape[1], self._view.shape[0]), dst=self._view,
+                       interpolation=cv2.INTER_AREA if self.scale < 1 else cv2.INTER_LINEAR)
+        else:
+            rows = np.minimum(np.arange(self._view.shape[0]) / self.scale, frame.shape[0] - 1).astype(int)
+            cols = np.minimum(np.arange(self._view.shape[1]) / self.scale, frame.shape[1] - 1).astype(int)
+            self._view[...] = frame[np.ix_(rows, cols)]
+        return self._canvas
+
+
+def center_roi(frame, fraction):
+    """Centre crop keeping ``fraction`` of width and height; returns (view, x0, y0)"""
+    if fraction >= 1.0:
+        return frame, 0, 0
+    h, w = frame.shape[:2]
+    ch, cw = int(h * fraction), int(w * fraction)
+    y0, x0 = (h - ch) // 2, (w - cw) // 2
+    return frame[y0:y0 + ch, x0:x0 + cw], x0, y0
+
+
+def to_frame_coords(xyxy, scale=1.0, pad=(0, 0), offset=(0, 0)):
+    """Map boxes from model-input space back to the full frame, in place"""
+    xyxy[:, [0, 2]] = (xyxy[:, [0, 2]] - pad[0]) / scale + offset[0]
+    xyxy[:, [1, 3]] = (xyxy[:, [1, 3]] - pad[1]) / scale + offset[1]
+    return xyxy
+
+
+class ConfiguredDetector:
+    """Call a YOLO model with an :class:`InferenceConfig` applied
+
+    Results always come back in full-frame coordinates with the full frame
+    attached, so ``plot()``, the tracker and the announcer do not need to
+    know about cropping or letterboxing.
+    """
+
+    def __init__(self, model, config=None):
+        self.model = model
+        self.config = config or InferenceConfig()
+        self.letterboxer = Letterboxer(self.config.imgsz) if self.config.letterbox else None
+        self._kwargs = None
+
+    def __call__(self, frame):
+        return self.predict_batch([frame])
+
+    def predict_batch(self, frames):
+        """Run one model call over several frames; one result per frame"""
+        if self._kwargs is None:
+            self._kwargs = self.config.predict_kwargs(self.model.names)
+        images, transforms = [], []
+        for frame in frames:
+            image, x0, y0 = center_roi(frame, self.config.roi)
+            scale, pad = 1.0, (0, 0)
+            if self.letterboxer is not None:
+                image = self.letterboxer(image)
+                scale, pad = self.letterboxer.scale, self.letterboxer.pad
+                if len(frames) > 1:
+                    image = image.copy()
+            images.append(image)
+            transforms.append((scale, pad, (x0, y0)))
+        results = self.model(images[0] if len(images) == 1 else images, **self._kwargs)
+        for frame, image, result, (scale, pad, offset) in zip(frames, images, results, transforms):
+            if image is not frame:
+                _remap(result, frame, scale, pad, offset)
+        return results
+
+
+def _remap(result, frame, scale, pad, offset):
+    data = result.boxes.data.clone()
+    to_frame_coords(data[:, :4], scale, pad, offset)
+    result.orig_img = frame
+    result.orig_shape = frame.shape[:2]
+    result.update(boxes=data)
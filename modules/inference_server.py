@@ -0,0 +1,310 @@
+"""Multi-process YOLO inference server fed through the shared-memory frame bus"""
+
+import multiprocessing as mp
+import queue
+import sys
+import time
+from collections import Counter, deque
+from dataclasses import dataclass
+
+import numpy as np
+
+from .frame_bus import FrameBus, VideoSource
+from .inference_config import ConfiguredDetector, InferenceConfig
+from .metrics import metrics
+
+try:
+    import cv2  # type: ignore
+except ImportError:
+    cv2 = None
+
+INFERENCE = metrics.timer("stage_seconds", mode="server", stage="inference")
+DROPPED = metrics.counter("server_frames_dropped", "Frames not submitted because every worker was busy")
+
+
+@dataclass
+class Detections:
+    """Detections for one frame, as plain arrays that pickle cheaply"""
+    seq: int
+    boxes: np.ndarray
+    conf: np.ndarray
+    cls: np.ndarray
+    worker: int
+    batch: int
+    infer_ms: float
+    stale: bool = False
+
+
+def _to_arrays(result):
+    boxes = result.boxes
+    return (np.asarray(boxes.xyxy.tolist(), np.float32).reshape(-1, 4),
+            np.asarray(boxes.conf.tolist(), np.float32),
+            np.asarray(boxes.cls.tolist(), np.int32))
+
+
+def _worker_main(worker_id, spec, model, config, threads, max_batch, tasks, results):
+    """Worker process: one model, pinned threads, frames read from shared memory"""
+    from .model_registry import get_model, pin_threads
+
+    pin_threads(threads)
+    bus = None
+    try:
+        bus = FrameBus.attach(**spec)
+        detector = ConfiguredDetector(get_model(model) if isinstance(model, str) else model(), config)
+        results.put(("ready", worker_id, dict(detector.model.names)))
+        running = True
+        while running:
+            seq = tasks.get()
+            if seq is None:
+                break
+            batch = [seq]
+            # adaptive batching: take whatever else is already waiting
+            while len(batch) < max_batch:
+                try:
+                    seq = tasks.get_nowait()
+                except queue.Empty:
+                    break
+                if seq is None:
+                    running = False
+                    break
+                batch.append(seq)
+            frames = [bus.get(seq) for seq in batch]
+            live = [f for f in frames if f is not None]
+            started = time.perf_counter()
+            outputs = iter(detector.predict_batch([f.image for f in live]) if live else [])
+            infer_ms = (time.perf_counter() - started) * 1000
+            out = []
+            for seq, frame in zip(batch, frames):
+                if frame is None:
+                    empty = np.zeros((0, 4), np.float32)
+                    out.append(Detections(seq, empty, np.zeros(0, np.float32), np.zeros(0, np.int32),
+                                          worker_id, len(batch), 0.0, stale=True))
+                    continue
+                boxes, conf, cls = _to_arrays(next(outputs))
+                out.append(Detections(seq, boxes, conf, cls, worker_id, len(live), infer_ms,
+                                      stale=not bus.valid(frame)))
+            results.put(("done", worker_id, out))
+    except Exception as e:
+        results.put(("error", worker_id, f"{type(e).__name__}: {e}"))
+    finally:
+        if bus is not None:
+            bus.release()
+
+
+class InferenceServer:
+    """Run detection on ``workers`` processes and return results in frame order
+
+    Frames are written to a :class:`~modules.frame_bus.FrameBus`; only their
+    sequence numbers travel to the workers. Each worker loads its own model
+    (a registry name, or a picklable zero-argument factory) with
+    ``threads_per_worker`` torch threads. Idle workers take one frame at a
+    time; when frames queue up, a worker takes up to ``max_batch`` at once
+    so the backlog clears in fewer model calls.
+
+    At most ``max_in_flight`` frames are outstanding (by default enough to
+    keep every worker busy without the capture lapping the bus).
+    """
+
+    def __init__(self, bus, workers=2, model="yolov8n", config=None, threads_per_worker=1,
+                 max_batch=4, max_in_flight=None, start_method="spawn"):
+        self.bus = bus
+        self.workers = workers
+        self.model = model
+        self.config = config or InferenceConfig()
+        self.threads_per_worker = threads_per_worker
+        self.max_batch = max_batch
+        self.max_in_flight = max_in_flight or max(1, min(bus.slots - 2, workers * max_batch))
+        self.names = {}
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self.stale = 0
+        self.batch_sizes = Counter()
+        self.per_worker = Counter()
+        self._ctx = mp.get_context(start_method)
+        self._tasks = self._ctx.Queue()
+        self._results = self._ctx.Queue()
+        self._procs = []
+        self._order = deque()
+        self._done = {}
+        self._received = 0
+
+    def start(self, timeout=300.0):
+        """Start the workers and wait until each has loaded its model"""
+        for worker_id in range(self.workers):
+            proc = self._ctx.Process(
+                target=_worker_main, daemon=True, name=f"aura-infer-{worker_id}",
+                args=(worker_id, self.bus.spec, self.model, self.config, self.threads_per_worker,
+                      self.max_batch, self._tasks, self._results))
+            proc.start()
+            self._procs.append(proc)
+        ready = 0
+        deadline = time.monotonic() + timeout
+        while ready < self.workers:
+            kind, worker_id, payload = self._results.get(timeout=max(0.0, deadline - time.monotonic()))
+            if kind == "error":
+                self.stop()
+                raise RuntimeError(f"inference worker {worker_id} failed: {payload}")
+            self.names = payload
+            ready += 1
+        return self
+
+    @property
+    def in_flight(self):
+        """Frames handed to workers whose results have not come back"""
+        return self.submitted - self._received
+
+    def submit(self, seq, block=True, timeout=None):
+        """Queue frame ``seq`` (already on the bus); False if dropped because full"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.in_flight >= self.max_in_flight:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if not block or (remaining is not None and remaining <= 0):
+                self.dropped += 1
+                DROPPED.inc()
+                return False
+            self._collect(0.05 if remaining is None else min(0.05, remaining))
+        self._order.append(seq)
+        self._tasks.put(seq)
+        self.submitted += 1
+        return True
+
+    def _collect(self, timeout=0):
+        try:
+            if timeout > 0:
+                kind, worker_id, payload = self._results.get(timeout=timeout)
+            else:
+                kind, worker_id, payload = self._results.get_nowait()
+        except queue.Empty:
+            return False
+        if kind == "error":
+            raise RuntimeError(f"inference worker {worker_id} failed: {payload}")
+        for det in payload:
+            self._done[det.seq] = det
+            self._received += 1
+            self.batch_sizes[det.batch] += 1
+            self.per_worker[worker_id] += 1
+            self.stale += det.stale
+            INFERENCE.observe(det.infer_ms / 1000)
+        return True
+
+    def ready(self):
+        """Results available now, in submission order"""
+        while self._collect():
+            pass
+        out = []
+        while self._order and self._order[0] in self._done:
+            out.append(self._done.pop(self._order.popleft()))
+        self.completed += len(out)
+        return out
+
+    def drain(self, timeout=None):
+        """Wait for every outstanding frame; results in submission order"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.in_flight > 0:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                break
+            self._collect(0.05 if remaining is None else min(0.05, remaining))
+        return self.ready()
+
+    def stop(self, timeout=5.0):
+        for _ in self._procs:
+            self._tasks.put(None)
+        for proc in self._procs:
+            proc.join(timeout)
+            if proc.is_alive():
+                proc.terminate()
+        self._procs = []
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "submitted": self.submitted,
+            "completed": self.completed,
+            "dropped": self.dropped,
+            "stale": self.stale,
+            "batch_sizes": dict(sorted(self.batch_sizes.items())),
+            "per_worker": dict(sorted(self.per_worker.items())),
+        }
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+def draw_detections(frame, det, names):
+    """Draw one :class:`Detections` on a copy of ``frame``"""
+    out = frame.copy()
+    for (x1, y1, x2, y2), conf, cls in zip(det.boxes.astype(int), det.conf, det.cls):
+        cv2.rectangle(out, (x1, y1), (x2, y2), (0, 255, 0), 2)
+        cv2.putText(out, f"{names.get(int(cls), cls)} {conf:.2f}", (x1, max(12, y1 - 4)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 1)
+    return out
+
+
+def run(source=0, workers=4, threads_per_worker=1, max_batch=4, show=True, realtime=True, config=None):
+    """Object detection with inference spread over worker processes
+
+    Frames are decoded straight into shared memory. Live cameras drop
+    frames when every worker is busy; files are paced at their own frame
+    rate (or processed as fast as possible without ``realtime``) and
+    every frame is detected.
+    """
+    if cv2 is None:
+        print("⚠️  Inference server requires: pip install ultralytics opencv-python")
+        print("Demo mode: Would detect objects on several worker processes")
+        return
+
+    bus = server = None
+    try:
+        video = VideoSource(source, realtime=realtime)
+        bus = FrameBus(video.probe(), slots=max(8, workers * max_batch + 2))
+        print(f"⏳ Starting {workers} inference workers...")
+        server = InferenceServer(bus, workers=workers, threads_per_worker=threads_per_worker,
+                                 max_batch=max_batch, config=config or InferenceConfig.from_env()).start()
+        live = isinstance(source, int)
+        print("📹 Inference server running (Press 'q' to quit)")
+        started = time.perf_counter()
+        shown = 0
+        for frame in video.frames(bus):
+            seq = bus.commit() if bus.owns(frame) else bus.publish(frame)
+            server.submit(seq, block=not live)
+            for det in server.ready():
+                shown += 1
+                captured = bus.get(det.seq)
+                if show and captured is not None:
+                    cv2.imshow("Object Detection", draw_detections(captured.image, det, server.names))
+            if show and cv2.waitKey(1) == ord('q'):
+                break
+            if video.realtime and video.fps:
+                time.sleep(1.0 / video.fps)
+        shown += len(server.drain(timeout=30))
+        elapsed = time.perf_counter() - started
+        stats = server.stats()
+        print(f"⏱️  {shown / elapsed:.1f} FPS over {shown} frames with {workers} workers")
+        print(f"   batch sizes {stats['batch_sizes']}, dropped {stats['dropped']}, per worker {stats['per_worker']}")
+        return stats
+    except KeyboardInterrupt:
+        print("\n✓ Inference server stopped")
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        if server is not None:
+            server.stop()
+        if bus is not None:
+            bus.release()
+        if show:
+            cv2.destroyAllWindows()
+
+
+if __name__ == "__main__":
+    # python -m modules.inference_server clip.mp4 --workers=4 --headless --fast
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    workers = [int(arg.split("=", 1)[1]) for arg in sys.argv if arg.startswith("--workers=")]
+    run(source=args[0] if args else 0,
+        workers=workers[0] if workers else 4,
+        show="--headless" not in sys.argv,
+        realtime="--fast" not in sys.argv)
@@ -0,0 +1,42 @@
+"""Capability probing and import-on-first-use for heavy optional dependencies"""
+
+import importlib.util
+import sys
+
+
+def has_modules(*names):
+    """True if every named package is installed, without importing any of them
+
+    Only the import system's finders are consulted, so probing for whisper
+    or ultralytics does not pull in torch. A package that is installed but
+    broken is still reported as available; its mode fails when it runs.
+    """
+    for name in names:
+        try:
+            if importlib.util.find_spec(name) is None:
+                return False
+        except (ImportError, ValueError):  # missing parent package, or sys.modules[name] is None
+            return False
+    return True
+
+
+def lazy_import(name):
+    """Return module ``name``, executed on its first attribute access
+
+    Already-imported modules are returned as they are. Raises ImportError
+    straight away if the module cannot be found at all.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ImportError(f"No module named {name!r}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+    loader.exec_module(module)
+    return module
@@ -0,0 +1,146 @@
+"""Incremental sliding-window loudness detector for the sound alert"""
+
+import queue
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+EPS = 1e-12
+
+
+@dataclass
+class LoudEvent:
+    """A debounced loud-sound alert"""
+    onset: float
+    detected: float
+    rms_db: float
+    peak_db: float
+    latency: float
+    label: str = "loud sound"
+    confidence: float = 0.0
+
+
+def to_db(power):
+    return 10 * np.log10(power + EPS)
+
+
+class LoudnessMonitor:
+    """Sliding RMS/peak level in dBFS, updated one hop at a time
+
+    Audio is consumed in ``hop``-sample steps. Each hop adds its sum of
+    squares and peak to a small ring covering ``window`` seconds, so the
+    window RMS is a running total rather than a recomputation. An alert
+    fires once the level has stayed over the threshold for ``min_hops``
+    hops, then the monitor holds off for ``hold`` seconds and re-arms once
+    the level drops ``hysteresis_db`` below the threshold, or after
+    ``repeat`` seconds so a continuing alarm keeps being shown.
+
+    The default ``threshold_db`` of -22 dBFS matches the old rule of an L2
+    norm above 10 over one second of 16 kHz audio.
+    """
+
+    def __init__(self, samplerate=16000, hop_ms=10, window_ms=50, threshold_db=-22.0,
+                 peak_db=-3.0, min_hops=2, hold=0.5, hysteresis_db=6.0, repeat=2.0,
+                 clock=time.monotonic):
+        self.samplerate = samplerate
+        self.hop = int(samplerate * hop_ms / 1000)
+        self.window_hops = max(1, round(window_ms / hop_ms))
+        self.threshold_db = threshold_db
+        self.peak_threshold_db = peak_db
+        self.min_hops = min_hops
+        self.hold_hops = round(hold * 1000 / hop_ms)
+        self.hysteresis_db = hysteresis_db
+        self.repeat_hops = round(repeat * 1000 / hop_ms)
+        self.alerts = queue.SimpleQueue()
+        self.rms_db = to_db(0.0)
+        self.peak_db = to_db(0.0)
+        self._clock = clock
+        self._sumsq = np.zeros(self.window_hops)
+        self._peaks = np.zeros(self.window_hops)
+        self._total = 0.0
+        self._pending = np.zeros(self.hop, dtype=np.float32)
+        self._pending_len = 0
+        self._hops = 0
+        self._above = 0
+        self._onset = None
+        self._armed = True
+        self._last_alert = -self.hold_hops
+
+    def callback(self, indata, frames=None, time_info=None, status=None):
+        """sounddevice callback: process the block without allocating much"""
+        received = self._clock()
+        block = indata[:, 0] if indata.ndim > 1 else indata
+        for event in self.process(block, received):
+            self.alerts.put(event)
+
+    def process(self, block, received=None):
+        """Feed samples; returns the alerts they triggered"""
+        received = self._clock() if received is None else received
+        events = []
+        start = 0
+        if self._pending_len:
+            take = min(self.hop - self._pending_len, len(block))
+            self._pending[self._pending_len:self._pending_len + take] = block[:take]
+            self._pending_len += take
+            start = take
+            if self._pending_len < self.hop:
+                return events
+            self._step(self._pending, events, received)
+            self._pending_len = 0
+
+        n = (len(block) - start) // self.hop
+        if n:
+            hops = np.asarray(block[start:start + n * self.hop], dtype=np.float32).reshape(n, self.hop)
+            sumsq = np.einsum("ij,ij->i", hops, hops)
+            peaks = np.abs(hops).max(axis=1)
+            for s, p in zip(sumsq, peaks):
+                self._push(float(s), float(p), events, received)
+        rest = len(block) - start - n * self.hop
+        if rest:
+            self._pending[:rest] = block[len(block) - rest:]
+            self._pending_len = rest
+        return events
+
+    def _step(self, hop, events, received):
+        self._push(float(np.dot(hop, hop)), float(np.abs(hop).max()), events, received)
+
+    def _push(self, sumsq, peak, events, received):
+        slot = self._hops % self.window_hops
+        self._total += sumsq - self._sumsq[slot]
+        self._sumsq[slot] = sumsq
+        if slot == 0:
+            self._total = float(self._sumsq.sum())  # stop rounding drift
+        self._peaks[slot] = peak
+        self._hops += 1
+
+        filled = min(self._hops, self.window_hops) * self.hop
+        self.rms_db = float(to_db(max(self._total, 0.0) / filled))
+        self.peak_db = float(to_db(self._peaks.max() ** 2))
+        loud = self.rms_db > self.threshold_db or self.peak_db > self.peak_threshold_db
+
+        if not self._armed:
+            quiet = self.rms_db < self.threshold_db - self.hysteresis_db and self.peak_db <= self.peak_threshold_db
+            if quiet or self._hops - self._last_alert >= self.repeat_hops:
+                self._armed = True
+            if not loud or not self._armed:
+                return
+        if not loud:
+            self._above = 0
+            self._onset = None
+            return
+        if self._above == 0:
+            self._onset = (self._hops - 1) * self.hop / self.samplerate
+        self._above += 1
+        if self._above >= self.min_hops and self._hops - self._last_alert >= self.hold_hops:
+            detected = self._hops * self.hop / self.samplerate
+            events.append(LoudEvent(
+                onset=self._onset,
+                detected=detected,
+                rms_db=self.rms_db,
+                peak_db=self.peak_db,
+                latency=detected - self._onset + (self._clock() - received),
+            ))
+            self._last_alert = self._hops
+            self._armed = False
+            self._above = 0
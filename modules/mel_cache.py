@@ -0,0 +1,186 @@
+"""Incremental Whisper log-mel features over a ring-buffered audio stream"""
+
+import numpy as np
+
+from .metrics import metrics
+
+SAMPLE_RATE = 16000
+N_FFT = 400
+HOP = 160
+N_SAMPLES = 30 * SAMPLE_RATE  # Whisper pads every input with 30 s of zeros
+N_FRAMES = N_SAMPLES // HOP
+
+FEATURES = metrics.timer("stage_seconds", mode="captions", stage="features")
+
+_filters = {}
+
+
+def _hz_to_mel(f):
+    """Slaney mel scale, as librosa (and so Whisper's filter bank) uses"""
+    f = np.asarray(f, dtype=np.float64)
+    mel = f / (200.0 / 3)
+    log = f >= 1000.0
+    return np.where(log, 15.0 + np.log(np.maximum(f, 1e-10) / 1000.0) / (np.log(6.4) / 27), mel)
+
+
+def _mel_to_hz(m):
+    m = np.asarray(m, dtype=np.float64)
+    f = m * (200.0 / 3)
+    return np.where(m >= 15.0, 1000.0 * np.exp((np.log(6.4) / 27) * (m - 15.0)), f)
+
+
+def mel_filters(n_mels=80):
+    """Whisper's mel filter bank, shape ``(n_mels, N_FFT // 2 + 1)``
+
+    Taken from the whisper package when it is installed; otherwise built
+    the same way (librosa's Slaney-normalised bank for 16 kHz, n_fft 400).
+    """
+    if n_mels not in _filters:
+        try:
+            from whisper.audio import mel_filters as whisper_filters
+            bank = whisper_filters("cpu", n_mels).numpy()
+        except ImportError:
+            fft_freqs = np.linspace(0, SAMPLE_RATE / 2, N_FFT // 2 + 1)
+            mel_freqs = _mel_to_hz(np.linspace(_hz_to_mel(0.0), _hz_to_mel(SAMPLE_RATE / 2), n_mels + 2))
+            ramps = mel_freqs[:, None] - fft_freqs[None, :]
+            fdiff = np.diff(mel_freqs)
+            lower = -ramps[:-2] / fdiff[:-1, None]
+            upper = ramps[2:] / fdiff[1:, None]
+            bank = np.maximum(0, np.minimum(lower, upper))
+            bank *= (2.0 / (mel_freqs[2:] - mel_freqs[:-2]))[:, None]
+        _filters[n_mels] = bank.astype(np.float32)
+    return _filters[n_mels]
+
+
+_WINDOW = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(N_FFT) / N_FFT)).astype(np.float32)
+
+
+def _log_power(frames, filters):
+    """log10 mel power of ``(n, N_FFT)`` sample frames, before Whisper's normalisation"""
+    power = np.abs(np.fft.rfft(frames * _WINDOW, axis=1)) ** 2
+    return np.log10(np.maximum(power.astype(np.float32) @ filters.T, 1e-10))
+
+
+def _normalise(log_spec):
+    """Whisper's dynamic-range clamp and scaling; returns ``(n_mels, frames)``"""
+    if len(log_spec):
+        log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+    return np.ascontiguousarray(((log_spec + 4.0) / 4.0).T, dtype=np.float32)
+
+
+def log_mel(audio, n_mels=80, padding=N_SAMPLES):
+    """Whisper's ``log_mel_spectrogram`` for one clip, in NumPy
+
+    Like Whisper it appends ``padding`` zeros before the STFT and returns
+    one frame per HOP samples of the clip. This is what decoding each window
+    independently costs; :class:`MelCache` avoids it.
+    """
+    audio = np.concatenate((np.asarray(audio, dtype=np.float32), np.zeros(padding, np.float32)))
+    padded = np.pad(audio, N_FFT // 2, mode="reflect")
+    frames = np.lib.stride_tricks.sliding_window_view(padded, N_FFT)[::HOP][:-1]
+    log_spec = _log_power(frames, mel_filters(n_mels))
+    return _normalise(log_spec)[:, :(len(audio) - padding) // HOP]
+
+
+class MelCache:
+    """Log-mel frames for a stream, each computed once as its audio arrives
+
+    Frames sit on an absolute grid: frame ``g`` is centred on sample
+    ``g * HOP`` of ``buffer`` (an :class:`AudioRingBuffer`). A frame is
+    cached as soon as all N_FFT samples around it have arrived; the last
+    couple of frames of a window, which Whisper computes against zero
+    padding, are computed per call and not kept. So overlapping, growing
+    caption windows only pay for the new hop instead of re-running the
+    STFT over the window plus 30 s of padding every time.
+
+    The result matches :func:`log_mel` on the same samples, except that
+    the first two frames of a window see the real audio before it rather
+    than reflection padding, and window starts are rounded down to the
+    hop grid.
+    """
+
+    def __init__(self, buffer, n_mels=80, decode=None):
+        self.buffer = buffer
+        self.n_mels = n_mels
+        self.filters = mel_filters(n_mels)
+        self.capacity = buffer.capacity // HOP + 1
+        self._frames = np.zeros((self.capacity, n_mels), np.float32)
+        self._first = self._next = 0
+        self._decode = decode or whisper_decode
+        self.computed = 0
+        self.reused = 0
+        self.provisional = 0
+
+    def _compute(self, first, stop, end):
+        """Frames ``[first, stop)`` from samples before ``end`` (zeros after it)"""
+        lo, hi = first * HOP - N_FFT // 2, (stop - 1) * HOP + N_FFT // 2
+        audio = self.buffer.read(max(lo, self.buffer.oldest), min(hi, end))
+        if lo < 0:
+            head = audio[1:1 - lo][::-1]  # reflect, as torch.stft(center=True) does at the start
+            audio = np.concatenate((head, audio))
+        elif lo < self.buffer.oldest:
+            audio = np.concatenate((np.zeros(self.buffer.oldest - lo, np.float32), audio))
+        if len(audio) < hi - lo:
+            audio = np.concatenate((audio, np.zeros(hi - lo - len(audio), np.float32)))
+        frames = np.lib.stride_tricks.sliding_window_view(audio, N_FFT)[::HOP]
+        return _log_power(frames, self.filters)
+
+    def update(self):
+        """Cache every frame whose samples have all arrived"""
+        oldest = self.buffer.oldest
+        ready = max(0, (self.buffer.written - N_FFT // 2) // HOP + 1)
+        held = 0 if oldest == 0 else (oldest + N_FFT // 2 + HOP - 1) // HOP
+        first = max(self._next, held, ready - self.capacity)
+        if ready > first:
+            self._frames[np.arange(first, ready) % self.capacity] = self._compute(first, ready, self.buffer.written)
+            self.computed += ready - first
+            if first > self._next:
+                self._first = first  # fell behind the ring; older frames are gone
+            self._next = ready
+        self._first = max(self._first, self._next - self.capacity)
+
+    def window(self, start, end):
+        """Normalised log-mel ``(n_mels, frames)`` for samples ``[start, end)``"""
+        with FEATURES.time():
+            self.update()
+            g0 = start // HOP
+            g1 = g0 + (end - g0 * HOP) // HOP
+            # Cached frames are usable if their samples all lie before ``end``
+            hi = max(g0, min(g1, (end - N_FFT // 2) // HOP + 1, self._next))
+            lo = min(max(g0, self._first), hi)
+            parts = []
+            if lo > g0:
+                parts.append(self._compute(g0, lo, end))
+            if hi > lo:
+                parts.append(self._frames[np.arange(lo, hi) % self.capacity])
+                self.reused += hi - lo
+            if g1 > hi:
+                parts.append(self._compute(hi, g1, end))
+            self.provisional += (lo - g0) + (g1 - hi)
+            log_spec = np.concatenate(parts) if parts else np.zeros((0, self.n_mels), np.float32)
+            return _normalise(log_spec)
+
+    def transcribe(self, model, start, end, prompt=None):
+        """Decode samples ``[start, end)`` from cached features; returns the text"""
+        return self._decode(model, self.window(start, end), prompt)
+
+    @property
+    def stats(self):
+        """Frames computed once and cached, served from the cache, and computed per call"""
+        return {"computed": self.computed, "reused": self.reused, "provisional": self.provisional}
+
+
+def whisper_decode(model, mel, prompt=None):
+    """Decode one window of at most 30 s of log-mel with Whisper
+
+    A single ``whisper.decode`` pass (greedy, no timestamps), which is what
+    ``model.transcribe`` does for a caption window short of 30 s, without
+    recomputing the features.
+    """
+    import torch
+    import whisper
+
+    mel = whisper.pad_or_trim(torch.from_numpy(mel).to(model.device), N_FRAMES)
+    options = whisper.DecodingOptions(prompt=prompt or None, without_timestamps=True,
+                                      fp16=model.device.type == "cuda")
+    return whisper.decode(model, mel, options).text
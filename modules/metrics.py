@@ -0,0 +1,267 @@
+"""Per-stage timers, counters and histograms with Prometheus, JSON and on-screen output"""
+
+import json
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import wraps
+from pathlib import Path
+
+# Seconds; covers a 1 ms VAD frame up to a slow Whisper decode
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _label_text(labels):
+    return ",".join(f'{key}="{value}"' for key, value in labels)
+
+
+class Counter:
+    """A monotonically increasing count"""
+    kind = "counter"
+
+    def __init__(self, name, help="", labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.value = 0
+
+    def inc(self, amount=1):
+        self.value += amount
+
+    def reset(self):
+        self.value = 0
+
+    def snapshot(self):
+        return {"value": self.value}
+
+    def _prometheus(self, name):
+        labels = _label_text(self.labels)
+        return [f"{name}{{{labels}}} {self.value}" if labels else f"{name} {self.value}"]
+
+    def _summary(self):
+        return f"{self.value}"
+
+
+class Histogram:
+    """Bucketed counts plus a ring of recent values for p50/p95
+
+    Both live in ``array`` buffers allocated once, so :meth:`observe` does
+    a bisect and three stores and never allocates.
+    """
+    kind = "histogram"
+
+    def __init__(self, name, help="", labels=(), buckets=DEFAULT_BUCKETS, window=512):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = tuple(buckets)
+        self.counts = array("q", bytes(8 * (len(self.buckets) + 1)))
+        self.recent = array("d", bytes(8 * window))
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.recent[self.count % len(self.recent)] = value
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Quantile of the last ``window`` values (0 before any)"""
+        n = min(self.count, len(self.recent))
+        if not n:
+            return 0.0
+        values = sorted(self.recent[:n])
+        return values[min(n - 1, int(q * n))]
+
+    def reset(self):
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.sum = 0.0
+
+    def snapshot(self):
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts.tolist())),
+        }
+
+    def _prometheus(self, name):
+        lines, total = [], 0
+        for bound, count in zip([*map(str, self.buckets), "+Inf"], self.counts):
+            total += count
+            labels = _label_text((*self.labels, ("le", bound)))
+            lines.append(f"{name}_bucket{{{labels}}} {total}")
+        labels = _label_text(self.labels)
+        suffix = f"{{{labels}}}" if labels else ""
+        lines.append(f"{name}_sum{suffix} {self.sum}")
+        lines.append(f"{name}_count{suffix} {self.count}")
+        return lines
+
+    def _summary(self):
+        return f"p50 {self.quantile(0.5):.3g} p95 {self.quantile(0.95):.3g} n={self.count}"
+
+
+class _Timing:
+    __slots__ = ("timer", "started")
+
+    def __init__(self, timer):
+        self.timer = timer
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.timer.observe(time.perf_counter() - self.started)
+
+
+class Timer(Histogram):
+    """Histogram of durations in seconds
+
+    Use ``with timer.time():`` around a block, or ``@timer`` on a function.
+    """
+
+    def time(self):
+        return _Timing(self)
+
+    def __call__(self, fn):
+        @wraps(fn)
+        def timed(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.observe(time.perf_counter() - started)
+        return timed
+
+    def _summary(self):
+        return (f"p50 {self.quantile(0.5) * 1000:.1f} ms  p95 {self.quantile(0.95) * 1000:.1f} ms  "
+                f"n={self.count}")
+
+
+class _NullMetric:
+    """Stand-in handed out when metrics are disabled: every call is a no-op"""
+    kind = "null"
+    value = count = 0
+    _context = nullcontext()
+
+    def inc(self, amount=1):
+        pass
+
+    def observe(self, value):
+        pass
+
+    def time(self):
+        return self._context
+
+    def __call__(self, fn):
+        return fn  # decorated functions run undecorated
+
+    def quantile(self, q):
+        return 0.0
+
+
+NULL = _NullMetric()
+
+
+class MetricsRegistry:
+    """Named metrics shared by every module, exportable in several formats
+
+    Metrics are created once (usually at module level) and looked up by
+    name and labels. A disabled registry hands out :data:`NULL` so the
+    instrumented code pays one no-op call, and decorated functions are
+    returned unwrapped.
+    """
+
+    def __init__(self, enabled=True, prefix="aura_"):
+        self.enabled = enabled
+        self.prefix = prefix
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help, labels, **kwargs):
+        if not self.enabled:
+            return NULL
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            metric = self._metrics.get(key)
+            if metric is None:
+                metric = self._metrics[key] = cls(name, help, key[1], **kwargs)
+            return metric
+
+    def counter(self, name, help="", **labels):
+        return self._get(Counter, name, help, labels)
+
+    def histogram(self, name, help="", buckets=DEFAULT_BUCKETS, **labels):
+        return self._get(Histogram, name, help, labels, buckets=buckets)
+
+    def timer(self, name, help="", **labels):
+        return self._get(Timer, name, help, labels)
+
+    def __iter__(self):
+        with self._lock:
+            return iter(list(self._metrics.values()))
+
+    def reset(self):
+        for metric in self:
+            metric.reset()
+
+    def prometheus(self):
+        """All metrics in the Prometheus text exposition format"""
+        lines, described = [], set()
+        for metric in sorted(self, key=lambda m: (m.name, m.labels)):
+            name = self.prefix + metric.name
+            if name not in described:
+                described.add(name)
+                if metric.help:
+                    lines.append(f"# HELP {name} {metric.help}")
+                lines.append(f"# TYPE {name} {metric.kind}")
+            lines += metric._prometheus(name)
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self):
+        """JSON-serialisable state of every metric"""
+        return {
+            "time": time.time(),
+            "metrics": [{"name": m.name, "kind": m.kind, "labels": dict(m.labels), **m.snapshot()}
+                        for m in sorted(self, key=lambda m: (m.name, m.labels))],
+        }
+
+    def summary(self):
+        """Short human-readable lines for printing during a run"""
+        lines = []
+        for metric in sorted(self, key=lambda m: (m.name, m.labels)):
+            if metric.kind != "counter" and not metric.count:
+                continue
+            labels = " ".join(f"{value}" for _, value in metric.labels)
+            lines.append(f"   {metric.name:<22} {labels:<24} {metric._summary()}")
+        return "\n".join(["📊 Metrics", *lines]) if lines else "📊 Metrics: nothing recorded yet"
+
+    def dump(self, path):
+        """Write a ``.prom`` text file or (any other suffix) a JSON snapshot"""
+        path = Path(path)
+        text = self.prometheus() if path.suffix == ".prom" else json.dumps(self.snapshot(), indent=2)
+        path.write_text(text)
+        return path
+
+    def start_reporter(self, interval=10.0, out=print):
+        """Print :meth:`summary` every ``interval`` seconds; set the returned event to stop"""
+        stop = threading.Event()
+
+        def report():
+            while not stop.wait(interval):
+                out(self.summary())
+
+        threading.Thread(target=report, name="aura-metrics", daemon=True).start()
+        return stop
+
+
+# AURA_METRICS=0 turns instrumentation off for the whole process
+metrics = MetricsRegistry(enabled=os.environ.get("AURA_METRICS", "1") != "0")
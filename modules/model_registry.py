@@ -0,0 +1,201 @@
+"""Process-wide model registry: lazy loading, warm-up and reuse across modes"""
+
+import gc
+import os
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_BUDGET_MB = float(os.environ.get("AURA_MODEL_BUDGET_MB", "2048"))
+
+
+def pin_threads(threads):
+    """Limit BLAS/OpenMP and torch to ``threads`` threads in this process
+
+    Call it before any model is loaded; worker processes that each run a
+    model use it so N workers do not start N x cores threads.
+    """
+    if not threads:
+        return
+    for var in ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS"):
+        os.environ[var] = str(threads)
+    try:
+        import torch
+        torch.set_num_threads(threads)
+        torch.set_num_interop_threads(1)
+    except (ImportError, RuntimeError):
+        pass  # no torch, or interop threads already started
+
+
+def model_size_mb(model):
+    """Estimate resident size of a PyTorch-style model from its parameters"""
+    parameters = getattr(model, "parameters", None)
+    if parameters is None:
+        return 0.0
+    try:
+        return sum(p.numel() * p.element_size() for p in parameters()) / 2**20
+    except Exception:
+        return 0.0
+
+
+class _Spec:
+    def __init__(self, loader, warmup, size_mb):
+        self.loader = loader
+        self.warmup = warmup
+        self.size_mb = size_mb
+        self.lock = threading.Lock()
+
+
+class ModelRegistry:
+    """Load models on first use and keep them resident within a memory budget
+
+    Each model is loaded once, warmed up with a dummy inference so the first
+    real frame is not slow, and then shared by every mode. When the total
+    estimated size exceeds ``budget_mb`` the least recently used models are
+    dropped.
+    """
+
+    def __init__(self, budget_mb=DEFAULT_BUDGET_MB):
+        self.budget_mb = budget_mb
+        self.errors = {}
+        self.load_seconds = {}
+        self.hits = 0
+        self.misses = 0
+        self._specs = {}
+        self._models = OrderedDict()
+        self._sizes = {}
+        self._lock = threading.Lock()
+
+    def register(self, name, loader, warmup=None, size_mb=None):
+        """Register a model factory; nothing is loaded until :meth:`get`"""
+        self._specs[name] = _Spec(loader, warmup, size_mb)
+
+    def __contains__(self, name):
+        return name in self._specs
+
+    @property
+    def loaded(self):
+        """Names of resident models, least recently used first"""
+        with self._lock:
+            return list(self._models)
+
+    @property
+    def resident_mb(self):
+        """Estimated memory held by resident models"""
+        with self._lock:
+            return sum(self._sizes[name] for name in self._models)
+
+    def get(self, name):
+        """Return the named model, loading and warming it up if needed"""
+        spec = self._specs.get(name)
+        if spec is None:
+            raise KeyError(f"Unknown model: {name}")
+        with self._lock:
+            if name in self._models:
+                self._models.move_to_end(name)
+                self.hits += 1
+                return self._models[name]
+
+        # Per-model lock: a background preload and a foreground get of the
+        # same model wait for each other instead of loading it twice.
+        with spec.lock:
+            with self._lock:
+                if name in self._models:
+                    self._models.move_to_end(name)
+                    self.hits += 1
+                    return self._models[name]
+            started = time.perf_counter()
+            model = spec.loader()
+            if spec.warmup is not None:
+                spec.warmup(model)
+            size = spec.size_mb if spec.size_mb is not None else model_size_mb(model)
+            with self._lock:
+                self.misses += 1
+                self.load_seconds[name] = time.perf_counter() - started
+                self._models[name] = model
+                self._sizes[name] = size
+                self._evict_over_budget(keep=name)
+            return model
+
+    def evict(self, name):
+        """Drop a resident model so its memory can be reclaimed"""
+        with self._lock:
+            self._models.pop(name, None)
+            self._sizes.pop(name, None)
+        gc.collect()
+
+    def clear(self):
+        """Drop every resident model"""
+        with self._lock:
+            self._models.clear()
+            self._sizes.clear()
+        gc.collect()
+
+    def preload(self, *names, background=True):
+        """Load models ahead of time, by default on a daemon thread"""
+        def worker():
+            for name in names:
+                try:
+                    self.get(name)
+                except Exception as e:
+                    self.errors[name] = e
+
+        if not background:
+            worker()
+            return None
+        thread = threading.Thread(target=worker, name="aura-model-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def _evict_over_budget(self, keep):
+        total = sum(self._sizes.values())
+        for name in list(self._models):
+            if total <= self.budget_mb:
+                break
+            if name == keep:
+                continue
+            total -= self._sizes.pop(name)
+            del self._models[name]
+
+
+def _yolo_loader(weights, backend=None):
+    def load():
+        from .backends import get_backend
+        return get_backend(backend).load(weights)
+    return load
+
+
+def _warm_yolo(model):
+    import numpy as np
+    model(np.zeros((480, 640, 3), dtype=np.uint8), verbose=False)
+
+
+def _whisper_loader(size):
+    def load():
+        import whisper
+        return whisper.load_model(size)
+    return load
+
+
+def _warm_whisper(model):
+    import numpy as np
+    model.transcribe(np.zeros(16000, dtype=np.float32))
+
+
+registry = ModelRegistry()
+for _variant in ("n", "s"):
+    registry.register(f"yolov8{_variant}", _yolo_loader(f"yolov8{_variant}.pt"), _warm_yolo)
+    for _backend in ("torch", "onnx"):
+        registry.register(f"yolov8{_variant}-{_backend}", _yolo_loader(f"yolov8{_variant}.pt", _backend), _warm_yolo)
+for _size in ("tiny", "base"):
+    registry.register(f"whisper-{_size}", _whisper_loader(_size), _warm_whisper)
+
+
+def get_model(name):
+    """Return a model from the shared registry"""
+    return registry.get(name)
+
+
+def preload(*names):
+    """Start loading models from the shared registry in the background"""
+    return registry.preload(*names)
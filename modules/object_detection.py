@@ -1,46 +1,119 @@
 """Object Detection module for blind users"""
 
-try:
-    from ultralytics import YOLO  # type: ignore
-    import cv2  # type: ignore
-    HAS_VISION = True
-except ImportError:
-    HAS_VISION = False
-
-def run():
-    """Run real-time object detection"""
-    if not HAS_VISION:
+import os
+import sys
+
+from .lazy import has_modules
+
+# Probed without importing: ultralytics brings in torch, loaded when the mode starts
+HAS_VISION = has_modules("ultralytics", "cv2")
+
+def run(source=0, show=True, realtime=True, change_threshold=0.03, max_stale=2.0, config=None,
+        adaptive=None, target_ms=None, devices=None, model_name="yolov8n"):
+    """Run real-time object detection
+
+    ``source`` is a camera index or a video file path. Video files are paced
+    at their own frame rate unless ``realtime`` is False, which runs them as
+    fast as possible for benchmarking. Frames that differ from the last
+    inferred one by less than ``change_threshold`` reuse its results for up
+    to ``max_stale`` seconds. ``config`` is an :class:`InferenceConfig`
+    (input size, classes, thresholds, ROI); by default it comes from the
+    AURA_* environment variables.
+
+    With ``adaptive`` (or AURA_ADAPTIVE=1) the model, input size and frame
+    stride are stepped down and up to keep inference near ``target_ms``
+    per frame (AURA_TARGET_MS, default 66).
+
+    ``devices`` supplies the camera and window (:meth:`Devices.from_env`
+    by default); replayed video is paced by the fake camera itself.
+    """
+    from .devices import CAP_PROP_FPS, Devices
+
+    devices = devices or Devices.from_env()
+    if not HAS_VISION and not devices.simulated:
         print("⚠️  Object Detection requires: pip install ultralytics opencv-python")
         print("Demo mode: Would detect objects from camera")
         return
-    
+    from .change_gate import ChangeGate, format_gate_stats
+    from .detections import DetectionFrame
+    from .event_log import open_log
+    from .frame_pipeline import DetectionPipeline, format_stats
+    from .inference_config import ConfiguredDetector, InferenceConfig
+    from .model_registry import get_model
+    from .quality import VISION_LEVELS, AdaptiveDetector, QualityController
+
+    if adaptive is None:
+        adaptive = os.environ.get("AURA_ADAPTIVE") == "1"
     try:
-        model = YOLO("yolov8n.pt")
-        cap = cv2.VideoCapture(0)
+        config = config or InferenceConfig.from_env()
+        if adaptive:
+            target = (target_ms or float(os.environ.get("AURA_TARGET_MS", "66"))) / 1000
+            controller = QualityController(VISION_LEVELS, target, start="n-640", name="detection")
+            model = AdaptiveDetector(controller, config)
+        else:
+            model = ConfiguredDetector(get_model(model_name), config)
+        cap = devices.camera(source)
         
         if not cap.isOpened():
             print("❌ Error: Camera not available")
             return
         
+        from_file = isinstance(source, str) and not devices.simulated
+        pace_fps = cap.get(CAP_PROP_FPS) if from_file and realtime else None
+        display = devices.display("Object Detection") if show else None
+        gate = ChangeGate(threshold=change_threshold, max_stale=max_stale)
+        events = open_log()
+        pipeline = DetectionPipeline(cap, gate.wrap(model), pace_fps=pace_fps).start()
         print("📹 Object Detection started (Press 'q' to quit)")
+        logged = None
         while True:
-            ret, frame = cap.read()
-            if not ret:
-                print("❌ Error: Failed to read from camera")
-                break
+            packet = pipeline.next_result()
+            if packet is None:
+                if pipeline.done or (show and display.poll() == ord('q')):
+                    break
+                continue
             
-            results = model(frame)
-            annotated_frame = results[0].plot()
+            # the gate hands back the same result object when it skips a frame; log each inference once
+            if packet.result is not logged:
+                logged = packet.result
+                events.log_frame(DetectionFrame.from_results(packet.result[0], seq=packet.seq))
+            with pipeline.timed("render"):
+                annotated_frame = packet.result[0].plot()
+                if show:
+                    display.show(annotated_frame)
+            pipeline.rendered(packet)
             
-            cv2.imshow("Object Detection", annotated_frame)
-            
-            if cv2.waitKey(1) == ord('q'):
+            if show and display.poll() == ord('q'):
                 break
         
+        pipeline.stop()
+        events.stop()
+        if pipeline.error is not None:
+            raise pipeline.error
+        if pipeline.eof and not isinstance(source, str) and not devices.simulated:
+            print("❌ Error: Failed to read from camera")
+        stats = pipeline.stats()
+        print("⏱️  Pipeline timings:")
+        print(format_stats(stats))
+        print(format_gate_stats(gate.stats))
         cap.release()
-        cv2.destroyAllWindows()
+        if show:
+            display.close()
+        return stats
     except Exception as e:
         print(f"❌ Error: {e}")
+        if 'pipeline' in locals():
+            pipeline.stop()
+        if 'events' in locals():
+            events.stop()
         if 'cap' in locals():
             cap.release()
-        cv2.destroyAllWindows()
+        if locals().get('display') is not None:
+            display.close()
+
+if __name__ == "__main__":
+    # python -m modules.object_detection clip.mp4 --headless --fast
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    run(source=args[0] if args else 0,
+        show="--headless" not in sys.argv,
+        realtime="--fast" not in sys.argv)
@@ -0,0 +1,201 @@
+"""Adaptive quality: step model size, input size and frame rate to meet a latency target"""
+
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+
+from .inference_config import ConfiguredDetector, InferenceConfig
+from .metrics import metrics
+
+
+@dataclass(frozen=True)
+class QualityLevel:
+    """One rung of a quality ladder
+
+    Vision levels use ``model``, ``imgsz`` and ``stride`` (detect every
+    ``stride``-th frame). Speech levels use ``model``, ``window`` and
+    ``step`` (seconds of audio per decode and between decodes).
+    """
+    name: str
+    model: str
+    imgsz: int = 640
+    stride: int = 1
+    window: float = 5.0
+    step: float = 0.5
+
+
+# Cheapest first
+VISION_LEVELS = (
+    QualityLevel("n-320/3", "yolov8n", imgsz=320, stride=3),
+    QualityLevel("n-320/2", "yolov8n", imgsz=320, stride=2),
+    QualityLevel("n-480", "yolov8n", imgsz=480),
+    QualityLevel("n-640", "yolov8n", imgsz=640),
+    QualityLevel("s-640", "yolov8s", imgsz=640),
+)
+SPEECH_LEVELS = (
+    QualityLevel("tiny-3s", "whisper-tiny", window=3.0, step=1.0),
+    QualityLevel("tiny-5s", "whisper-tiny", window=5.0, step=0.5),
+    QualityLevel("base-5s", "whisper-base", window=5.0, step=0.5),
+)
+
+
+@dataclass
+class QualitySwitch:
+    """A logged change of level"""
+    at: float
+    old: QualityLevel
+    new: QualityLevel
+    latency: float
+    reason: str
+
+
+class QualityController:
+    """Move along a ladder of :class:`QualityLevel` to keep latency near ``target``
+
+    ``start`` is a level index or name (default: the best level). Feed it
+    one latency per frame or chunk with :meth:`observe` (seconds;
+    0 for frames a stride skipped). When the rolling mean exceeds
+    ``target`` over at least ``min_samples`` fresh samples, it steps down
+    one level. It steps up only after a full ``window`` of samples below
+    ``up_below * target``; the gap between the two thresholds is the
+    hysteresis. A level that had to be abandoned needs twice as long a
+    quiet spell (per failure) before it is tried again, so the controller
+    settles instead of oscillating at a boundary.
+
+    The latency source is whatever calls :meth:`observe`, so tests can
+    drive it with synthetic numbers and an injected ``clock``.
+    """
+
+    def __init__(self, levels, target, start=None, window=30, min_samples=10, up_below=0.6,
+                 clock=time.monotonic, log=print, name="quality"):
+        if not 0 < up_below < 1:
+            raise ValueError("up_below must be between 0 and 1")
+        self.levels = tuple(levels)
+        self.target = target
+        if start is None:
+            start = len(self.levels) - 1
+        elif isinstance(start, str):
+            start = [level.name for level in self.levels].index(start)
+        self.index = start
+        self.window = window
+        self.min_samples = min(min_samples, window)
+        self.up_below = up_below
+        self.switches = []
+        self.name = name
+        self._samples = deque(maxlen=window)
+        self._quiet = 0
+        self._failures = [0] * len(self.levels)
+        self._listeners = []
+        self._clock = clock
+        self._log = log
+        self._up = metrics.counter("quality_switches", "Adaptive quality changes", mode=name, direction="up")
+        self._down = metrics.counter("quality_switches", "Adaptive quality changes", mode=name, direction="down")
+
+    @property
+    def level(self):
+        return self.levels[self.index]
+
+    @property
+    def latency(self):
+        """Rolling mean of the samples since the last switch"""
+        return sum(self._samples) / len(self._samples) if self._samples else 0.0
+
+    def on_change(self, fn):
+        """Call ``fn(level)`` after every switch"""
+        self._listeners.append(fn)
+
+    def observe(self, seconds):
+        """Record one latency; returns the new level if this caused a switch"""
+        self._samples.append(seconds)
+        latency = self.latency
+        if len(self._samples) >= self.min_samples and latency > self.target and self.index > 0:
+            self._failures[self.index] += 1
+            return self._switch(self.index - 1, latency,
+                                f"{latency * 1000:.0f} ms > target {self.target * 1000:.0f} ms")
+        if self.index + 1 < len(self.levels) and latency < self.up_below * self.target:
+            needed = self.window * 2 ** min(self._failures[self.index + 1], 10)
+            self._quiet += 1
+            if len(self._samples) >= self.window and self._quiet >= needed:
+                return self._switch(self.index + 1, latency,
+                                    f"{latency * 1000:.0f} ms < {self.up_below:.0%} of target")
+        else:
+            self._quiet = 0
+        return None
+
+    def _switch(self, index, latency, reason):
+        up = index > self.index
+        old, self.index = self.level, index
+        self.switches.append(QualitySwitch(self._clock(), old, self.level, latency, reason))
+        self._samples.clear()
+        self._quiet = 0
+        (self._up if up else self._down).inc()
+        self._log(f"{'⬆️' if up else '⬇️'}  {self.name}: {old.name} → {self.level.name} ({reason})")
+        for fn in self._listeners:
+            fn(self.level)
+        return self.level
+
+
+class AdaptiveDetector:
+    """A detector whose model, input size and frame stride follow a controller
+
+    Call it like :class:`ConfiguredDetector`. Frames skipped by the stride
+    return the previous result and count as zero latency, so the
+    controller sees the amortised cost per frame. Callers that fill the
+    skipped frames themselves use :meth:`detect`, which ignores the stride.
+    Model loading after a switch is not counted.
+    """
+
+    def __init__(self, controller, config=None, load=None, clock=time.perf_counter):
+        if load is None:
+            from .model_registry import get_model as load
+        self.controller = controller
+        self.config = config or InferenceConfig()
+        self._load = load
+        self._clock = clock
+        self._detectors = {}
+        self._result = None
+        self._frame = 0
+
+    def detector(self, level):
+        key = (level.model, level.imgsz)
+        if key not in self._detectors:
+            self._detectors[key] = ConfiguredDetector(self._load(level.model), replace(self.config, imgsz=level.imgsz))
+        return self._detectors[key]
+
+    def __call__(self, frame):
+        level = self.controller.level
+        skip = self._result is not None and self._frame % level.stride
+        self._frame += 1
+        if skip:
+            self.controller.observe(0.0)
+            return self._result
+        self._result = self.detect(frame)
+        return self._result
+
+    def detect(self, frame):
+        """Run the current level on ``frame`` and report its latency, whatever the stride"""
+        detector = self.detector(self.controller.level)
+        started = self._clock()
+        result = detector(frame)
+        self.controller.observe(self._clock() - started)
+        return result
+
+
+def adapt_transcriber(transcriber, controller, load=None):
+    """Apply the controller's speech levels to a StreamingTranscriber as they change
+
+    Also applies the current level straight away. Caption latencies must be
+    passed to ``controller.observe`` by the caller.
+    """
+    if load is None:
+        from .model_registry import get_model as load
+
+    def apply(level):
+        transcriber.model = load(level.model)
+        transcriber.window_samples = int(level.window * transcriber.samplerate)
+        transcriber.step_samples = int(level.step * transcriber.samplerate)
+        transcriber.overlap_samples = min(transcriber.overlap_samples, transcriber.window_samples // 2)
+
+    apply(controller.level)
+    controller.on_change(apply)
+    return transcriber
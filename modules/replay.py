@@ -0,0 +1,282 @@
+"""Synthetic scenes, stub models and results, and a soak harness that runs whole modes on replayed input"""
+
+import os
+import threading
+import time
+from contextlib import nullcontext, redirect_stdout
+
+import numpy as np
+
+from .metrics import metrics
+
+SR = 16000
+SHAPE = (480, 640, 3)
+
+
+def alert_scene(seconds, seed=0):
+    """Room noise with an alarm, doorbell, knock and siren every few seconds"""
+    from . import synthetic_audio
+    audio = synthetic_audio.background(seconds, SR, seed=seed)
+    sounds = [synthetic_audio.smoke_alarm(1.5), synthetic_audio.doorbell(), synthetic_audio.knock(),
+              synthetic_audio.siren(1.5)]
+    for i, start in enumerate(range(SR, len(audio) - 2 * SR, 4 * SR)):
+        sound = sounds[i % len(sounds)]
+        audio[start:start + len(sound)] += sound
+    return audio
+
+
+def speech_scene(seconds):
+    """Two-second utterances separated by silence"""
+    from . import synthetic_audio
+    audio = synthetic_audio.background(seconds, SR)
+    for start in range(SR // 2, len(audio) - 2 * SR, int(3.5 * SR)):
+        audio[start:start + 2 * SR] += synthetic_audio.voice(2.0, SR)
+    return audio
+
+
+def room_scene(seconds=30.0):
+    """Speech with an alert sound now and then; loops cleanly at ``seconds``"""
+    audio = speech_scene(seconds)
+    alerts = alert_scene(seconds / 2)  # second half is speech only
+    audio[:len(alerts)] += alerts
+    return audio
+
+
+def moving_object(index, shape=SHAPE):
+    """Frame ``index`` of a bright square moving across a dim gradient"""
+    frame = np.empty(shape, np.uint8)
+    frame[:] = np.linspace(20, 90, shape[1], dtype=np.uint8)[None, :, None]
+    x = 40 + (index * 7) % (shape[1] - 160)
+    frame[180:300, x:x + 120] = (60, 120, 240)
+    return frame
+
+
+class Tensor(np.ndarray):
+    """ndarray with the ``.cpu().numpy()`` and ``clone()`` calls callers make on torch tensors"""
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return np.asarray(self)
+
+    def clone(self):
+        return self.copy()
+
+
+class Boxes:
+    """ultralytics ``Boxes``: ``data`` rows are x1, y1, x2, y2, [track id], conf, cls"""
+
+    def __init__(self, data):
+        data = np.asarray(data, np.float32)
+        self.data = data.reshape(-1, data.shape[-1] if data.ndim == 2 else 6).view(Tensor)
+
+    def __len__(self):
+        return len(self.data)
+
+    def __getitem__(self, i):
+        return Boxes(self.data[i:i + 1])
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    @property
+    def xyxy(self):
+        return self.data[:, :4]
+
+    @property
+    def id(self):
+        return self.data[:, 4] if self.data.shape[1] == 7 else None
+
+    @property
+    def conf(self):
+        return self.data[:, -2]
+
+    @property
+    def cls(self):
+        return self.data[:, -1]
+
+
+class Result:
+    """ultralytics ``Results``: names, boxes (rows or :class:`Boxes`) and ``plot()`` of the annotated image"""
+
+    def __init__(self, names, boxes, image=None):
+        self.names = names
+        self.boxes = boxes if isinstance(boxes, Boxes) else Boxes(boxes)
+        self.orig_img = image
+        self.orig_shape = None if image is None else image.shape[:2]
+
+    def update(self, boxes):
+        self.boxes = Boxes(boxes)
+
+    def plot(self):
+        from .detections import DetectionFrame, draw_detections
+        return draw_detections(self.orig_img, DetectionFrame.from_results(self))
+
+
+class StubYolo:
+    """Detector stand-in: one "person" box around the brightest region"""
+    names = {0: "person", 56: "chair"}
+
+    def __call__(self, images, **kwargs):
+        images = images if isinstance(images, list) else [images]
+        return [self._detect(image) for image in images]
+
+    def _detect(self, image):
+        mask = image[::4, ::4, 2] > 200
+        rows, cols = np.flatnonzero(mask.any(axis=1)), np.flatnonzero(mask.any(axis=0))
+        if not len(rows):
+            return Result(self.names, [], image)
+        return Result(self.names, [[cols[0] * 4.0, rows[0] * 4.0, cols[-1] * 4.0 + 4, rows[-1] * 4.0 + 4, 0.9, 0]],
+                      image)
+
+
+class StubWhisper:
+    """Whisper stand-in that returns a fixed caption instantly"""
+
+    def transcribe(self, audio, **kwargs):
+        return {"text": " hello there", "segments": []}
+
+
+STUB_MODELS = {"stub-yolo": StubYolo, "stub-whisper": StubWhisper}
+
+
+def register_stubs():
+    """Make the stub models loadable by name from the model registry"""
+    from .model_registry import registry
+    for name, loader in STUB_MODELS.items():
+        if name not in registry:
+            registry.register(name, loader, size_mb=0)
+
+
+def rss_mb():
+    """Resident memory of this process (peak RSS where /proc is missing)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float("nan")
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _sound_alert(devices):
+    from . import sound_alert
+    sound_alert.run(devices=devices)
+
+
+def _speech_to_text(devices):
+    from . import speech_to_text
+    speech_to_text.run_live(devices=devices, model_name="stub-whisper", adaptive=False)
+
+
+def _object_detection(devices):
+    from . import object_detection
+    object_detection.run(devices=devices, model_name="stub-yolo", adaptive=False)
+
+
+def _voice_object_detection(devices):
+    from . import voice_object_detection
+    voice_object_detection.run(devices=devices, model_name="stub-yolo", adaptive=False)
+
+
+# mode: (runner, unit of throughput, the latency metric watched for drift)
+MODES = {
+    "sound_alert": (_sound_alert, "audio_s",
+                    lambda: metrics.timer("stage_seconds", mode="alerts", stage="loudness")),
+    "speech_to_text": (_speech_to_text, "audio_s", lambda: metrics.histogram("caption_latency_seconds")),
+    "object_detection": (_object_detection, "frames",
+                         lambda: metrics.timer("stage_seconds", mode="detection", stage="end_to_end")),
+    "voice_object_detection": (_voice_object_detection, "frames",
+                               lambda: metrics.timer("stage_seconds", mode="voice", stage="inference")),
+}
+
+
+class _ErrorsOnly:
+    """stdout stand-in that drops mode output except its error lines"""
+
+    def __init__(self, keep=20):
+        self.errors = []
+        self.keep = keep
+
+    def write(self, text):
+        if "❌" in text and len(self.errors) < self.keep:
+            self.errors.append(text.strip())
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+def _latency_between(samples, lo, hi):
+    """Mean latency over the ``lo``..``hi`` fraction of observations in ``samples`` (count, sum pairs)"""
+    first, total = samples[0][0], samples[-1][0] - samples[0][0]
+    if total <= 0:
+        return float("nan")
+    start = max(i for i, (count, _) in enumerate(samples) if count <= first + lo * total)
+    stop = min(i for i, (count, _) in enumerate(samples) if count >= first + hi * total)
+    (c0, s0), (c1, s1) = samples[start], samples[stop]
+    return (s1 - s0) / (c1 - c0) if c1 > c0 else float("nan")
+
+
+def soak(mode, seconds=60.0, speed=None, interval=1.0, video=None, audio=None, quiet=True):
+    """Run ``mode`` on ``seconds`` of replayed input and report how it held up
+
+    Input comes from :class:`~modules.devices.ReplayDevices` (``video`` /
+    ``audio``, synthetic by default) at ``speed`` times real time, or as
+    fast as the mode keeps up with ``speed`` None. Every ``interval``
+    seconds RSS and the mode's latency metric are sampled. The report has
+    throughput (``unit`` per wall second), the mean latency of the second
+    and last quarter of the latency observations and their ratio
+    (``latency_drift``), and RSS growth from the second to the last quarter
+    of the run; the first quarter is warm-up. Mode output is dropped unless
+    ``quiet`` is False, but any error lines it printed are in ``errors``.
+    """
+    from .devices import ReplayDevices
+
+    runner, unit, latency_metric = MODES[mode]
+    register_stubs()
+    devices = ReplayDevices(video=video, audio=audio, speed=speed, seconds=seconds)
+    metric = latency_metric()
+    samples = []  # (wall seconds, RSS MB, latency count, latency sum)
+    done = threading.Event()
+
+    def sample():
+        samples.append((time.perf_counter() - started, rss_mb(), getattr(metric, "count", 0),
+                        getattr(metric, "sum", 0.0)))
+
+    def sampler():
+        while not done.wait(interval):
+            sample()
+
+    thread = threading.Thread(target=sampler, name="aura-soak", daemon=True)
+    out = _ErrorsOnly()
+    started = time.perf_counter()
+    sample()
+    thread.start()
+    try:
+        with redirect_stdout(out) if quiet else nullcontext():
+            runner(devices)
+    finally:
+        done.set()
+        thread.join()
+    sample()
+
+    wall = samples[-1][0]
+    rss = [s[1] for s in samples]
+    quarter = max(1, len(rss) // 4)
+    latency = [(count, total) for _, _, count, total in samples]
+    early, late = _latency_between(latency, 0.25, 0.5), _latency_between(latency, 0.75, 1.0)
+    processed = devices.input_seconds if unit == "audio_s" else devices.frames_shown
+    return {
+        "mode": mode, "unit": unit, "input_s": devices.input_seconds, "wall_s": wall,
+        "processed": processed, "throughput": processed / wall if wall > 0 else 0.0,
+        "latency_early_ms": early * 1000, "latency_late_ms": late * 1000,
+        "latency_drift": late / early if early > 0 else float("nan"),
+        "rss_start_mb": rss[0], "rss_peak_mb": max(rss),
+        "memory_growth_mb": float(np.median(rss[-quarter:]) - np.median(rss[quarter:2 * quarter])),
+        "samples": len(samples), "errors": out.errors,
+    }
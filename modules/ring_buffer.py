@@ -0,0 +1,102 @@
+"""Preallocated ring buffer for streaming microphone audio"""
+
+import threading
+import time
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Fixed-size mono float32 ring buffer addressed by absolute sample index
+
+    The writer (usually a sounddevice callback) never allocates; readers ask
+    for any range of the last ``capacity`` samples by absolute position.
+
+    With ``mirror`` > 0 the first ``mirror`` samples are also kept after the
+    end of the array, so :meth:`view` can hand out any range up to that
+    long as one contiguous slice instead of a copy.
+    """
+
+    def __init__(self, capacity, clock=time.monotonic, mirror=0):
+        self.capacity = int(capacity)
+        self.mirror = min(int(mirror), self.capacity)
+        self._data = np.zeros(self.capacity + self.mirror, dtype=np.float32)
+        self._written = 0
+        self._last_write_time = None
+        self._clock = clock
+        self._lock = threading.Lock()
+
+    @property
+    def written(self):
+        """Total number of samples written since creation"""
+        return self._written
+
+    @property
+    def oldest(self):
+        """Absolute index of the oldest sample still held"""
+        return max(0, self._written - self.capacity)
+
+    @property
+    def last_write_time(self):
+        """Clock time at which the newest sample arrived"""
+        return self._last_write_time
+
+    def write(self, block):
+        """Append a block of samples (1-D, or first channel of 2-D input)"""
+        if block.ndim > 1:
+            block = block[:, 0]
+        n = len(block)
+        if n == 0:
+            return
+        skipped = max(0, n - self.capacity)
+        if skipped:
+            block = block[skipped:]
+            n = self.capacity
+        with self._lock:
+            start = (self._written + skipped) % self.capacity
+            first = min(n, self.capacity - start)
+            self._data[start:start + first] = block[:first]
+            self._data[:n - first] = block[first:]
+            if self.mirror:
+                if start < self.mirror:
+                    end = min(start + first, self.mirror)
+                    self._data[self.capacity + start:self.capacity + end] = self._data[start:end]
+                wrapped = min(n - first, self.mirror)
+                self._data[self.capacity:self.capacity + wrapped] = self._data[:wrapped]
+            self._written += skipped + n
+            self._last_write_time = self._clock()
+
+    def read(self, start, stop):
+        """Return a copy of samples ``[start, stop)``, clamped to what is held"""
+        with self._lock:
+            start = max(start, self.oldest)
+            stop = min(stop, self._written)
+            if stop <= start:
+                return np.zeros(0, dtype=np.float32)
+            i, j = start % self.capacity, stop % self.capacity
+            if i < j:
+                return self._data[i:j].copy()
+            return np.concatenate((self._data[i:self.capacity], self._data[:j]))
+
+    def view(self, start, stop):
+        """Return a read-only view of samples ``[start, stop)`` without copying
+
+        The view aliases the buffer, so it is only valid until the writer
+        laps it. Ranges that cross the wrap point must fit in ``mirror``.
+        """
+        with self._lock:
+            start = max(start, self.oldest)
+            stop = min(stop, self._written)
+            if stop <= start:
+                return self._data[:0]
+            i = start % self.capacity
+            if i + stop - start > self.capacity + self.mirror:
+                raise ValueError("range crosses the wrap point and is longer than the mirror")
+            view = self._data[i:i + stop - start]
+            view.flags.writeable = False
+            return view
+
+    def latest(self, n):
+        """Return a copy of the newest ``n`` samples"""
+        end = self._written
+        return self.read(end - n, end)
@@ -1,29 +1,85 @@
 """Sound Alert module for deaf users - detects loud sounds"""
 
-try:
-    import sounddevice as sd
-    import numpy as np
-    HAS_AUDIO = True
-except ImportError:
-    HAS_AUDIO = False
-
-def run():
-    """Run sound detection alert"""
-    if not HAS_AUDIO:
+from .lazy import has_modules
+
+HAS_AUDIO = has_modules("sounddevice", "numpy")
+
+ICONS = {
+    "alarm": "🔥 ALARM",
+    "siren": "🚑 SIREN",
+    "doorbell": "🔔 DOORBELL",
+    "knock": "🚪 KNOCKING",
+}
+
+def show_alert(event):
+    """Visual alert for a loud sound"""
+    print(f"🚨 LOUD SOUND DETECTED! (Level: {event.rms_db:.1f} dBFS, "
+          f"peak {event.peak_db:.1f} dBFS, {event.latency * 1000:.0f} ms)")
+
+def show_label(event):
+    """Follow-up line naming what the loud sound was"""
+    if event.label in ICONS:
+        print(f"   ↳ {ICONS[event.label]} ({event.confidence:.0%})")
+    else:
+        print(f"   ↳ {event.label}")
+
+def run(threshold_db=-22.0, devices=None):
+    """Run sound detection alert
+
+    ``devices`` supplies the microphone (:meth:`Devices.from_env` by
+    default); with replayed audio the mode stops when the input ends.
+    """
+    from .devices import Devices
+
+    devices = devices or Devices.from_env()
+    if not HAS_AUDIO and not devices.simulated:
         print("⚠️  Sound Alert requires: pip install sounddevice numpy")
         print("Demo mode: Would monitor for loud sounds")
         return
-    
+    from .audio_bus import AudioBus
+    from .event_log import open_log
+    from .loudness import LoudnessMonitor
+    from .metrics import metrics
+    from .sound_classifier import EventLabeler, SoundClassifier
+
+    loudness = metrics.timer("stage_seconds", mode="alerts", stage="loudness")
+    classify = metrics.timer("stage_seconds", mode="alerts", stage="classify")
+    latency = metrics.histogram("alert_latency_seconds", "Sound reaching the buffer to alert shown")
+    events = None
     try:
+        events = open_log()
+        monitor = LoudnessMonitor(samplerate=16000, threshold_db=threshold_db)
+        bus = AudioBus(devices.microphone(blocksize=monitor.hop), samplerate=16000)
+        reader = bus.subscribe()
+        labeler = EventLabeler(SoundClassifier(16000), bus.buffer, origin=reader.position)
+
+        def label(flush=False):
+            with classify.time():
+                labelled = labeler.ready(flush=flush)
+            for event in labelled:
+                metrics.counter("alerts", "Loud sounds by label", label=event.label).inc()
+                show_label(event)
+                events.alert(event.label, event.confidence, event.rms_db)
+
         print("🔊 Listening for loud sounds... (Press Ctrl+C to stop)")
-        while True:
-            audio = sd.rec(int(1 * 16000), samplerate=16000, channels=1)
-            sd.wait()
-            volume = np.linalg.norm(audio)
-            
-            if volume > 10:
-                print(f"🚨 LOUD SOUND DETECTED! (Volume: {volume:.1f})")
+        with bus:
+            while not reader.finished:
+                if reader.wait(timeout=0.1):
+                    block = reader.read()
+                    with loudness.time():
+                        loud = monitor.process(block, bus.buffer.last_write_time)
+                    for event in loud:
+                        show_alert(event)
+                        latency.observe(event.latency)
+                        labeler.add(event)
+                label()
+        label(flush=True)  # sounds near the end never get a full analysis window
+        print("\n✓ Sound detection stopped")
     except KeyboardInterrupt:
+        if 'label' in locals():
+            label(flush=True)
         print("\n✓ Sound detection stopped")
     except Exception as e:
         print(f"❌ Error: {e}")
+    if events is not None:
+        events.stop()
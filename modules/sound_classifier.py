@@ -0,0 +1,232 @@
+"""Spectral classifier that labels loud sounds (alarm, siren, doorbell, knock)"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+EPS = 1e-10
+LABELS = ("alarm", "siren", "doorbell", "knock")
+DEFAULT_LABEL = "loud sound"
+
+
+def hz_to_mel(freq):
+    return 2595.0 * np.log10(1.0 + np.asarray(freq) / 700.0)
+
+
+def mel_to_hz(mel):
+    return 700.0 * (10 ** (np.asarray(mel) / 2595.0) - 1.0)
+
+
+def mel_filterbank(samplerate, n_fft, n_mels=40, fmin=0.0, fmax=None):
+    """Triangular HTK-style mel filters, shape ``(n_mels, n_fft // 2 + 1)``"""
+    fmax = samplerate / 2 if fmax is None else fmax
+    freqs = np.fft.rfftfreq(n_fft, 1.0 / samplerate)
+    edges = mel_to_hz(np.linspace(hz_to_mel(fmin), hz_to_mel(fmax), n_mels + 2))
+    lower, center, upper = edges[:-2, None], edges[1:-1, None], edges[2:, None]
+    rising = (freqs - lower) / (center - lower)
+    falling = (upper - freqs) / (upper - center)
+    return np.maximum(0.0, np.minimum(rising, falling)).astype(np.float32)
+
+
+def _ramp(x, lo, hi):
+    """0 below ``lo``, 1 above ``hi``, linear in between"""
+    return float(np.clip((x - lo) / (hi - lo), 0.0, 1.0))
+
+
+def _band(x, lo, hi, soft):
+    """1 inside ``[lo, hi]``, fading to 0 over ``soft`` on either side"""
+    return min(_ramp(x, lo - soft, lo), 1.0 - _ramp(x, hi, hi + soft))
+
+
+@dataclass
+class SoundClass:
+    """Result of classifying one clip"""
+    label: str
+    confidence: float
+    scores: dict = field(default_factory=dict)
+    features: dict = field(default_factory=dict)
+
+
+class SoundClassifier:
+    """Rule-based detectors over STFT and mel-band features
+
+    A clip is cut into overlapping ``n_fft`` frames every ``hop_ms`` and the
+    whole stack goes through one ``rfft`` call. From the spectrogram we
+    take, per frame, how concentrated the energy is around its strongest
+    bin (tonality) and where that bin is (pitch); from the mel bands, how
+    the energy splits between low and alarm-range frequencies; and from the
+    frame energy envelope, onsets, decay and periodicity. Each detector
+    turns those into a 0-1 score:
+
+    - alarm: steady tone at 2.5-4.5 kHz, often beeping periodically
+    - siren: tone at 0.4-2 kHz whose pitch sweeps by hundreds of Hz
+    - doorbell: steady tones at 0.3-2 kHz that ring and decay
+    - knock: repeated short, low thuds
+
+    The best score above ``min_confidence`` wins; anything else stays a
+    generic loud sound.
+    """
+
+    def __init__(self, samplerate=16000, n_fft=512, hop_ms=10, n_mels=40,
+                 active_db=30.0, min_confidence=0.5):
+        self.samplerate = samplerate
+        self.n_fft = n_fft
+        self.hop = int(samplerate * hop_ms / 1000)
+        self.fps = samplerate / self.hop
+        self.active_db = active_db
+        self.min_confidence = min_confidence
+        self.window = np.hanning(n_fft).astype(np.float32)
+        self.freqs = np.fft.rfftfreq(n_fft, 1.0 / samplerate)
+        self.mel = mel_filterbank(samplerate, n_fft, n_mels)
+        mel_centers = mel_to_hz(np.linspace(hz_to_mel(0), hz_to_mel(samplerate / 2), n_mels + 2)[1:-1])
+        self._low_bands = mel_centers < 800
+        self._alarm_bands = (mel_centers >= 2500) & (mel_centers <= 4500)
+
+    def frames(self, audio):
+        """Overlapping frames as a ``(n_frames, n_fft)`` strided view"""
+        audio = np.asarray(audio, dtype=np.float32)
+        if len(audio) < self.n_fft:
+            audio = np.pad(audio, (0, self.n_fft - len(audio)))
+        return sliding_window_view(audio, self.n_fft)[::self.hop]
+
+    def spectrogram(self, audio):
+        """Power spectrogram, shape ``(n_frames, n_fft // 2 + 1)``"""
+        return self._power(self.frames(audio)[None])[0]
+
+    def _power(self, frames):
+        spec = np.fft.rfft(frames * self.window, axis=-1)
+        return (spec.real ** 2 + spec.imag ** 2).astype(np.float32)
+
+    def features(self, audio):
+        return self._features(self.spectrogram(audio))
+
+    def classify(self, audio):
+        return self.classify_batch([audio])[0]
+
+    def classify_batch(self, clips):
+        """Classify several clips with a single FFT over all their frames"""
+        if not clips:
+            return []
+        length = max(max(len(c) for c in clips), self.n_fft)
+        stack = np.zeros((len(clips), length), dtype=np.float32)
+        for row, clip in zip(stack, clips):
+            row[:len(clip)] = clip
+        frames = sliding_window_view(stack, self.n_fft, axis=1)[:, ::self.hop]
+        power = self._power(frames)
+        results = []
+        for clip, spec in zip(clips, power):
+            n = max(1, 1 + (len(clip) - self.n_fft) // self.hop)
+            results.append(self._decide(self._features(spec[:n])))
+        return results
+
+    def _features(self, power):
+        energy = power.sum(axis=1) + EPS
+        energy_db = 10 * np.log10(energy)
+        active = energy_db > max(energy_db.max() - self.active_db, -70.0)
+
+        peak = power.argmax(axis=1)
+        cols = np.clip(peak[:, None] + np.arange(-2, 3), 0, power.shape[1] - 1)
+        near = np.take_along_axis(power, cols, axis=1).sum(axis=1)
+        tonal = active & (near / energy > 0.5)
+        pitch = self.freqs[peak[tonal]]
+
+        mel = power[active] @ self.mel.T
+        mel_total = mel.sum() + EPS
+
+        steps = np.diff(energy_db)
+        both = active[1:] & active[:-1]
+        decay = -float(np.median(steps[both])) * self.fps if both.any() else 0.0
+
+        return {
+            "active_fraction": float(active.mean()),
+            "loud_fraction": float((energy_db > energy_db.max() - 10.0).mean()),
+            "tonal_fraction": float(tonal.sum() / max(active.sum(), 1)),
+            "pitch_hz": float(np.median(pitch)) if len(pitch) else 0.0,
+            "pitch_spread_hz": float(np.percentile(pitch, 90) - np.percentile(pitch, 10)) if len(pitch) else 0.0,
+            "low_ratio": float(mel[:, self._low_bands].sum() / mel_total),
+            "alarm_ratio": float(mel[:, self._alarm_bands].sum() / mel_total),
+            "onsets": self._onsets(energy_db, active),
+            "decay_db_per_s": decay,
+            "periodicity": self._periodicity(energy),
+        }
+
+    def _onsets(self, energy_db, active, rise_db=12.0, gap_s=0.05):
+        """Count sharp energy rises, merging ones closer than ``gap_s``"""
+        recent = sliding_window_view(np.r_[np.full(3, energy_db[0]), energy_db[:-1]], 3).min(axis=1)
+        rises = np.flatnonzero(active & (energy_db - recent > rise_db))
+        if not len(rises):
+            return 0
+        return int(1 + np.count_nonzero(np.diff(rises) > gap_s * self.fps))
+
+    def _periodicity(self, energy, min_lag=0.15, max_lag=1.5):
+        """Peak of the normalized envelope autocorrelation over plausible beat periods"""
+        env = energy - energy.mean()
+        lo, hi = int(min_lag * self.fps), min(int(max_lag * self.fps), len(env) // 2)
+        if hi <= lo:
+            return 0.0
+        spectrum = np.fft.rfft(env, 2 * len(env))
+        acf = np.fft.irfft(spectrum.real ** 2 + spectrum.imag ** 2)[:len(env)]
+        if acf[0] <= 0:
+            return 0.0
+        return float(max(0.0, acf[lo:hi].max() / acf[0]))
+
+    def _scores(self, f):
+        tonal = _ramp(f["tonal_fraction"], 0.3, 0.6)
+        steady = 1.0 - _ramp(f["pitch_spread_hz"], 120, 300)
+        return {
+            "alarm": tonal * steady * _band(f["pitch_hz"], 2500, 4500, 300)
+                     * (0.85 + 0.15 * _ramp(f["periodicity"], 0.2, 0.5)),
+            "siren": tonal * _band(f["pitch_hz"], 400, 2000, 200) * _ramp(f["pitch_spread_hz"], 200, 400),
+            "doorbell": tonal * steady * _band(f["pitch_hz"], 300, 2000, 150) * _ramp(f["decay_db_per_s"], 3, 10)
+                        * _ramp(f["loud_fraction"], 0.15, 0.3),
+            "knock": _ramp(f["onsets"], 1, 2) * _ramp(f["low_ratio"], 0.3, 0.6)
+                     * (1.0 - _ramp(f["loud_fraction"], 0.3, 0.6)),
+        }
+
+    def _decide(self, features):
+        scores = self._scores(features)
+        label = max(scores, key=scores.get)
+        confidence = scores[label]
+        if confidence < self.min_confidence:
+            label = DEFAULT_LABEL
+        return SoundClass(label, confidence, scores, features)
+
+
+class EventLabeler:
+    """Labels loud-sound events once enough audio after their onset has arrived
+
+    Events come from :class:`~modules.loudness.LoudnessMonitor`; their onset
+    times are stream seconds, which map straight onto sample positions in
+    the :class:`~modules.ring_buffer.AudioRingBuffer` fed by the same
+    callback. ``origin`` is the buffer position of stream time zero, for
+    monitors that started reading a shared buffer part way through. Every
+    event that is ready is classified in one batch.
+    """
+
+    def __init__(self, classifier, buffer, before=0.05, after=0.8, origin=0):
+        self.classifier = classifier
+        self.buffer = buffer
+        self.origin = origin
+        self.before = before
+        self.after = after
+        self._pending = []
+
+    def add(self, event):
+        self._pending.append(event)
+
+    def ready(self, flush=False):
+        """Classify and return the events whose analysis window is complete"""
+        sr = self.classifier.samplerate
+        spans = [(event, self.origin + int((event.onset - self.before) * sr),
+                  self.origin + int((event.onset + self.after) * sr))
+                 for event in self._pending]
+        done = [s for s in spans if flush or s[2] <= self.buffer.written]
+        if not done:
+            return []
+        self._pending = [s[0] for s in spans if s not in done]
+        clips = [self.buffer.read(start, stop) for _, start, stop in done]
+        for (event, _, _), result in zip(done, self.classifier.classify_batch(clips)):
+            event.label = result.label
+            event.confidence = result.confidence
+        return [s[0] for s in done]
@@ -1,29 +1,148 @@
 """Speech to Text module for deaf users"""
 
-try:
-    import whisper
-    import sounddevice as sd
-    import numpy as np
-    HAS_WHISPER = True
-except ImportError:
-    HAS_WHISPER = False
-
-def run():
-    """Run speech-to-text transcription"""
-    if not HAS_WHISPER:
+import os
+
+from .lazy import has_modules
+
+# Probed without importing: whisper brings in torch, loaded when a mode starts
+HAS_WHISPER = has_modules("whisper", "sounddevice", "numpy")
+
+def run(devices=None, model_name="whisper-base"):
+    """Run speech-to-text transcription
+
+    ``devices`` supplies the microphone (:meth:`Devices.from_env` by default).
+    """
+    from .devices import Devices
+
+    devices = devices or Devices.from_env()
+    if not HAS_WHISPER and not devices.simulated:
         print("⚠️  Speech-to-Text requires: pip install openai-whisper sounddevice numpy")
         print("Demo mode: Would transcribe audio input")
         return
-    
+    from .audio_bus import AudioBus
+    from .event_log import open_log
+    from .metrics import metrics
+    from .model_registry import get_model
+    from .vad import VoiceActivityDetector
+
+    events = None
     try:
-        model = whisper.load_model("base")
+        events = open_log()
+        model = get_model(model_name)
         print("🎤 Listening... Speak now (5 seconds)")
         
-        audio = sd.rec(int(5 * 16000), samplerate=16000, channels=1)
-        sd.wait()
-        audio = np.squeeze(audio)
+        bus = AudioBus(devices.microphone(), samplerate=16000)
+        reader = bus.subscribe()  # before the capture starts, so replayed audio is not missed
+        with bus:
+            with metrics.timer("stage_seconds", mode="speech", stage="capture").time():
+                audio = reader.read_exactly(5 * 16000, timeout=10)
         
-        result = model.transcribe(audio)
-        print(f"📝 Transcribed: {result['text']}")
+        vad = VoiceActivityDetector(samplerate=16000)
+        speech = vad.extract(audio)
+        if len(speech) == 0:
+            print("🔇 No speech detected")
+        else:
+            with metrics.timer("stage_seconds", mode="speech", stage="inference").time():
+                result = model.transcribe(speech, fp16=False)
+            print(f"📝 Transcribed: {result['text']}")
+            events.transcript(result["text"].strip(), duration=len(speech) / 16000)
+        print_vad_stats(vad)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+    finally:
+        if events is not None:
+            events.stop()
+
+def print_vad_stats(vad):
+    """Show how much audio the voice activity gate kept away from Whisper"""
+    stats = vad.stats
+    print(f"🔎 Decoded {stats['seconds_decoded']:.1f}s, skipped {stats['seconds_dropped']:.1f}s "
+          f"of silence ({stats['fraction_saved']:.0%} saved)")
+
+def show_caption(caption):
+    """Print a caption; partial captions are rewritten in place"""
+    if caption.final:
+        print(f"\r📝 {caption.text}  ({caption.latency * 1000:.0f} ms)")
+    else:
+        print(f"\r💬 {caption.text}", end="", flush=True)
+
+def finish_captions(transcriber, events):
+    """Caption whatever audio is left once input stops"""
+    caption = transcriber.flush() if transcriber else None
+    if caption is not None:
+        show_caption(caption)
+        events.transcript(caption.text, duration=caption.end - caption.start)
+    print("\n✓ Live captions stopped")
+
+def run_live(window=5.0, step=0.5, overlap=1.0, use_vad=True, adaptive=None, target_ms=None, devices=None,
+             model_name="whisper-base"):
+    """Run continuous live captioning from the microphone
+
+    With ``adaptive`` (or AURA_ADAPTIVE=1) the Whisper size and the decode
+    window/step follow caption latency against ``target_ms``
+    (AURA_CAPTION_TARGET_MS, default 1500) instead of ``window``/``step``.
+    ``devices`` supplies the microphone (:meth:`Devices.from_env` by
+    default); with replayed audio captioning stops when the input ends.
+    """
+    from .devices import Devices
+
+    devices = devices or Devices.from_env()
+    if not HAS_WHISPER and not devices.simulated:
+        print("⚠️  Live Captions require: pip install openai-whisper sounddevice numpy")
+        print("Demo mode: Would caption audio input continuously")
+        return
+    from .audio_bus import AudioBus
+    from .event_log import open_log
+    from .model_registry import get_model
+    from .quality import SPEECH_LEVELS, QualityController, adapt_transcriber
+    from .streaming_stt import SAMPLE_RATE, StreamingTranscriber
+    from .vad import VoiceActivityDetector
+
+    if adaptive is None:
+        adaptive = os.environ.get("AURA_ADAPTIVE") == "1"
+    transcriber = controller = events = None
+    try:
+        events = open_log()
+        model = get_model(model_name)
+        vad = VoiceActivityDetector(samplerate=SAMPLE_RATE) if use_vad else None
+        # Cached features feed Whisper's decoder; other models transcribe audio
+        transcriber = StreamingTranscriber(model, window=window, step=step, overlap=overlap, vad=vad,
+                                           mel_cache=True if hasattr(model, "dims") else None)
+        if adaptive:
+            target = (target_ms or float(os.environ.get("AURA_CAPTION_TARGET_MS", "1500"))) / 1000
+            controller = QualityController(SPEECH_LEVELS, target, start="base-5s", window=10, min_samples=4,
+                                           name="captions")
+            adapt_transcriber(transcriber, controller)
+        bus = AudioBus(devices.microphone(blocksize=int(0.1 * SAMPLE_RATE)), samplerate=SAMPLE_RATE)
+        reader = bus.subscribe()
+        print("🎤 Live captions started (Press Ctrl+C to stop)")
+        with bus:
+            while not reader.finished:
+                if reader.wait(timeout=0.02):
+                    # Take everything buffered, so a decode slower than ``step`` can't leave us behind
+                    pending = reader.available
+                    while pending > 0:
+                        block = reader.read(pending)
+                        transcriber.callback(block)
+                        pending -= len(block)
+                caption = transcriber.poll()
+                if caption is not None:
+                    show_caption(caption)
+                    if caption.final:
+                        events.transcript(caption.text, duration=caption.end - caption.start)
+                    if controller is not None:
+                        controller.observe(caption.latency)
+        finish_captions(transcriber, events)
+    except KeyboardInterrupt:
+        finish_captions(transcriber, events)
     except Exception as e:
         print(f"❌ Error: {e}")
+
+    if events is not None:
+        events.stop()
+    if transcriber is not None and transcriber.latencies:
+        stats = transcriber.latency_stats()
+        print(f"⏱️  Caption latency: p50 {stats['p50'] * 1000:.0f} ms, "
+              f"p95 {stats['p95'] * 1000:.0f} ms over {stats['count']} captions")
+    if transcriber is not None and transcriber.vad is not None:
+        print_vad_stats(transcriber.vad)
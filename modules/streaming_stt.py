@@ -0,0 +1,198 @@
+"""Incremental Whisper captioning over a ring-buffered audio stream"""
+
+import re
+import time
+from dataclasses import dataclass, replace
+
+import numpy as np
+
+from .audio_io import iter_blocks, load_wav
+from .metrics import metrics
+from .ring_buffer import AudioRingBuffer
+
+SAMPLE_RATE = 16000
+MAX_WHISPER_SECONDS = 30
+PROMPT_WORDS = 40  # recent caption words passed to Whisper as context
+
+DECODE = metrics.timer("stage_seconds", mode="captions", stage="inference")
+LATENCY = metrics.histogram("caption_latency_seconds", "Audio arrival to caption")
+SKIPPED = metrics.counter("caption_windows_skipped", "Windows without speech, never decoded")
+
+
+@dataclass
+class Caption:
+    """A partial or final caption for one decoding window"""
+    text: str
+    final: bool
+    start: float
+    end: float
+    latency: float
+
+
+def drop_repeated_words(previous, text, max_words=8):
+    """Remove the start of ``text`` that repeats the end of ``previous``
+
+    Consecutive windows overlap, so the words spoken in the overlap come
+    back at the start of the next caption. Matching ignores case and
+    punctuation; ``text`` is never emptied completely.
+    """
+    words = text.split()
+    if not previous or not words:
+        return text
+
+    def norm(ws):
+        return [re.sub(r"[^\w']", "", w).lower() for w in ws]
+
+    tail, head = norm(previous.split()[-max_words:]), norm(words[:max_words])
+    for k in range(min(len(tail), len(head), len(words) - 1), 0, -1):
+        if tail[-k:] == head[:k]:
+            return " ".join(words[k:])
+    return text
+
+
+class StreamingTranscriber:
+    """Decode overlapping, growing windows of a live stream
+
+    Audio arrives through :meth:`callback` (the ``sd.InputStream`` callback
+    signature) into a preallocated ring buffer. Every ``step`` seconds of new
+    audio, :meth:`poll` re-decodes the current window so the partial caption
+    is corrected as more speech comes in. Once the window reaches ``window``
+    seconds the caption is finalised and the next window starts ``overlap``
+    seconds before its end so words on the boundary are not cut.
+
+    With a ``vad`` the window is trimmed to its speech and windows without
+    any speech are never sent to the model.
+
+    With ``context`` the last PROMPT_WORDS words of the final captions so
+    far are passed to Whisper as ``initial_prompt`` and words the overlap
+    repeats are dropped from the next caption. With ``mel_cache`` (a :class:`MelCache`, or True to make
+    one) log-mel features are computed once per hop as audio arrives and
+    each window is decoded from them, instead of ``model.transcribe``
+    recomputing the spectrogram of the whole window every step.
+    """
+
+    def __init__(self, model, samplerate=SAMPLE_RATE, window=5.0, step=0.5,
+                 overlap=1.0, buffer_seconds=MAX_WHISPER_SECONDS, vad=None,
+                 clock=time.monotonic, context=True, mel_cache=None):
+        if overlap >= window:
+            raise ValueError("overlap must be shorter than window")
+        self.model = model
+        self.vad = vad
+        self.samplerate = samplerate
+        self.window_samples = int(window * samplerate)
+        self.step_samples = int(step * samplerate)
+        self.overlap_samples = int(overlap * samplerate)
+        self.buffer = AudioRingBuffer(int(buffer_seconds * samplerate), clock=clock)
+        if mel_cache is True:
+            from .mel_cache import MelCache
+            dims = getattr(model, "dims", None)
+            mel_cache = MelCache(self.buffer, n_mels=getattr(dims, "n_mels", 80))
+        self.mel_cache = mel_cache
+        self.context = context
+        self.prompt = ""
+        self.latencies = []
+        self._clock = clock
+        self._segment_start = 0
+        self._decoded_until = 0
+        self._vad_counted = 0  # end of the audio already in the VAD counters
+        self._last = None
+
+    def callback(self, indata, frames=None, time_info=None, status=None):
+        """sounddevice callback: copy the block into the ring buffer"""
+        self.buffer.write(indata)
+
+    @property
+    def due(self):
+        """True when :meth:`poll` would decode rather than return None"""
+        return self.buffer.written - self._decoded_until >= self.step_samples
+
+    def poll(self):
+        """Decode the current window if enough new audio arrived"""
+        if not self.due:
+            return None
+        end = self.buffer.written
+        return self._decode(end, final=end - self._segment_start >= self.window_samples)
+
+    def flush(self):
+        """Finalise whatever audio is left after the stream stops"""
+        end = self.buffer.written
+        if end == self._decoded_until:
+            if self._last is None or self._last.final:
+                return None
+            self._last = replace(self._last, final=True)
+            return self._last
+        return self._decode(end, final=True)
+
+    def _decode(self, end, final):
+        start = max(self._segment_start, self.buffer.oldest)
+        audio = self.buffer.read(start, end)
+        arrived = self.buffer.last_write_time
+        self._decoded_until = end
+        if final:
+            self._segment_start = end - self.overlap_samples
+        lo, hi = start, end
+        if self.vad is not None:
+            a, b = self.vad.trim_bounds(audio, new=end - max(start, self._vad_counted))
+            self._vad_counted = end
+            if b <= a:
+                SKIPPED.inc()
+                if final and self._last is not None and not self._last.final:
+                    self._last = replace(self._last, final=True)
+                    return self._last
+                return None
+            audio, lo, hi = audio[a:b], start + a, start + b
+        prompt = self.prompt if self.context else ""
+        with DECODE.time():
+            if self.mel_cache is not None:
+                text = self.mel_cache.transcribe(self.model, lo, hi, prompt)
+            elif prompt:
+                text = self.model.transcribe(audio, fp16=False, initial_prompt=prompt)["text"]
+            else:
+                text = self.model.transcribe(audio, fp16=False)["text"]
+        latency = self._clock() - arrived
+        self.latencies.append(latency)
+        LATENCY.observe(latency)
+        text = drop_repeated_words(prompt, text.strip())
+        if final and self.context:
+            self.prompt = " ".join(f"{self.prompt} {text}".split()[-PROMPT_WORDS:])
+        self._last = Caption(
+            text=text,
+            final=final,
+            start=start / self.samplerate,
+            end=end / self.samplerate,
+            latency=latency,
+        )
+        return self._last
+
+    def latency_stats(self):
+        """Return p50/p95/max caption latency in seconds"""
+        if not self.latencies:
+            return {"count": 0, "p50": 0.0, "p95": 0.0, "max": 0.0}
+        values = np.asarray(self.latencies)
+        return {
+            "count": len(values),
+            "p50": float(np.percentile(values, 50)),
+            "p95": float(np.percentile(values, 95)),
+            "max": float(values.max()),
+        }
+
+
+def transcribe_file(path, model, blocksize=1024, realtime=False, on_caption=None, **kwargs):
+    """Caption a WAV file through the same ring-buffer path as the microphone"""
+    audio = load_wav(path, SAMPLE_RATE)
+    transcriber = StreamingTranscriber(model, **kwargs)
+    captions = []
+
+    def emit(caption):
+        if caption is not None:
+            captions.append(caption)
+            if on_caption:
+                on_caption(caption)
+
+    for block in iter_blocks(audio, blocksize):
+        transcriber.callback(block[:, None], len(block), None, None)
+        emit(transcriber.poll())
+        if realtime:
+            time.sleep(len(block) / SAMPLE_RATE)
+    emit(transcriber.flush())
+    return captions, transcriber.latency_stats()
@@ -0,0 +1,458 @@
+"""Run several assistive modes at once on one asyncio event loop"""
+
+import asyncio
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+import numpy as np
+
+from .audio_bus import AudioBus
+from .event_log import open_log
+from .frame_bus import VideoSource
+from .lazy import has_modules
+
+HAS_AUDIO = has_modules("sounddevice")
+HAS_VISION = has_modules("cv2")
+
+SAMPLE_RATE = 16000
+
+
+class TaskStats:
+    """Latency and CPU time of one supervised task"""
+
+    def __init__(self, name, window=500):
+        self.name = name
+        self.items = 0
+        self.cpu_seconds = 0.0
+        self.overruns = 0
+        self.error = None
+        self._latencies = deque(maxlen=window)
+
+    def record(self, latency):
+        self.items += 1
+        self._latencies.append(latency)
+
+    @contextmanager
+    def cpu(self):
+        """Charge the CPU time of the enclosed block to this task"""
+        start = time.thread_time()
+        try:
+            yield
+        finally:
+            self.cpu_seconds += time.thread_time() - start
+
+    def summary(self):
+        values = np.asarray(self._latencies) * 1000 if self._latencies else np.zeros(1)
+        return {
+            "items": self.items,
+            "p50_ms": float(np.percentile(values, 50)),
+            "p95_ms": float(np.percentile(values, 95)),
+            "cpu_s": self.cpu_seconds,
+            "overruns": self.overruns,
+            "error": None if self.error is None else repr(self.error),
+        }
+
+
+class AsyncBusReader:
+    """Await audio from an :class:`~modules.audio_bus.AudioBus` cursor
+
+    :meth:`get` returns ``(view, arrival_time)`` with a zero-copy view of
+    the shared ring, or None once the bus is closed and drained;
+    :meth:`drain` yields the views already buffered without waiting.
+    """
+
+    def __init__(self, reader, stats=None):
+        self.reader = reader
+        self.stats = stats
+        self._event = asyncio.Event()
+
+    def wake(self):
+        self._event.set()
+
+    async def get(self, max_samples=None):
+        while True:
+            self._event.clear()
+            if self.reader.available > 0:
+                return self._read(max_samples), self.reader.bus.buffer.last_write_time
+            if self.reader.bus.closed:
+                return None
+            await self._event.wait()
+
+    def drain(self):
+        pending = self.reader.available
+        while pending > 0:
+            view = self._read(pending)
+            if not len(view):
+                return
+            pending -= len(view)
+            yield view
+
+    def _read(self, max_samples):
+        overruns = self.reader.overruns
+        view = self.reader.read(max_samples)
+        if self.stats is not None:
+            self.stats.overruns += self.reader.overruns - overruns
+        return view
+
+
+class AsyncFrameReader:
+    """Await the newest frame from a :class:`~modules.frame_bus.FrameBus`
+
+    :meth:`get` returns a :class:`~modules.frame_bus.Frame` whose image is
+    a view into shared memory, or None once the bus is closed.
+    """
+
+    def __init__(self, reader, stats=None):
+        self.reader = reader
+        self.stats = stats
+        self._event = asyncio.Event()
+
+    def wake(self):
+        self._event.set()
+
+    async def get(self):
+        while True:
+            self._event.clear()
+            frame = self.reader.latest(timeout=0)
+            if frame is not None:
+                return frame
+            if self.reader.bus.closed:
+                return None
+            await self._event.wait()
+
+
+class Supervisor:
+    """Run consumer coroutines concurrently over shared capture sources
+
+    Each consumer is ``async def consumer(supervisor, stats)``. Consumers
+    call :meth:`audio` for a cursor on the one microphone
+    :class:`~modules.audio_bus.AudioBus` or :meth:`frames` for one on the
+    camera :class:`~modules.frame_bus.FrameBus`, and :meth:`offload` to run blocking model calls on
+    the executor so the loop keeps feeding the other tasks. The run ends
+    when :meth:`stop` is called, ``duration`` elapses, or every consumer
+    has returned (for example at the end of a file source); remaining
+    tasks are cancelled and the sources closed either way. While it runs,
+    :attr:`events` is the open event log consumers write to. ``devices``
+    supplies other hardware consumers need, such as the voice.
+    """
+
+    def __init__(self, mic=None, camera=None, workers=2, clock=time.monotonic, devices=None):
+        self.mic = mic
+        self.camera = camera
+        self.devices = devices
+        self.workers = workers
+        self.stats = {}
+        self._clock = clock
+        self._consumers = {}
+        self._audio_readers = []
+        self._frame_readers = []
+        self.events = None
+        self._executor = None
+        self._stopping = None
+        self._loop = None
+        self._wall = 0.0
+        self._process_cpu = 0.0
+
+    def add(self, name, consumer):
+        self._consumers[name] = consumer
+        self.stats[name] = TaskStats(name)
+        return self
+
+    def audio(self, stats=None):
+        """New cursor on the microphone bus; overruns are counted on ``stats``"""
+        if self.mic is None:
+            raise RuntimeError("no microphone source configured")
+        reader = AsyncBusReader(self.mic.subscribe(), stats)
+        self._audio_readers.append(reader)
+        return reader
+
+    def frames(self, stats=None):
+        """New latest-frame cursor on the camera bus"""
+        if self.camera is None:
+            raise RuntimeError("no camera source configured")
+        reader = AsyncFrameReader(self.camera.subscribe(), stats)
+        self._frame_readers.append(reader)
+        return reader
+
+    def _listener(self, readers):
+        """Capture-thread callback that wakes ``readers`` on the loop"""
+        def wake_all():
+            for reader in readers:
+                reader.wake()
+
+        def written():
+            try:
+                self._loop.call_soon_threadsafe(wake_all)
+            except RuntimeError:
+                pass  # loop already closed during shutdown
+
+        return written
+
+    async def offload(self, stats, fn, *args):
+        """Run a blocking call on the executor, charging its CPU time to ``stats``"""
+        def call():
+            start = time.thread_time()
+            try:
+                return fn(*args)
+            finally:
+                if stats is not None:
+                    stats.cpu_seconds += time.thread_time() - start
+
+        return await self._loop.run_in_executor(self._executor, call)
+
+    def now(self):
+        return self._clock()
+
+    def stop(self):
+        """Thread-safe request to end the run"""
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+
+    async def run(self, duration=None):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="aura")
+        started, cpu_started = time.perf_counter(), time.process_time()
+        self.events = open_log()
+
+        tasks = {asyncio.create_task(self._guard(name, consumer), name=name): name
+                 for name, consumer in self._consumers.items()}
+        await asyncio.sleep(0)  # let consumers subscribe before data flows
+        try:
+            for bus, readers in ((self.mic, self._audio_readers), (self.camera, self._frame_readers)):
+                if bus is not None:
+                    bus.add_listener(self._listener(readers))
+                    bus.start()
+            waiters = [asyncio.create_task(self._stopping.wait())]
+            waiters.append(asyncio.create_task(asyncio.wait(list(tasks))))
+            await asyncio.wait(waiters, timeout=duration, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in waiters:
+                waiter.cancel()
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            for source in (self.mic, self.camera):
+                if source is not None:
+                    source.stop()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self.events.stop()
+            self._wall = time.perf_counter() - started
+            self._process_cpu = time.process_time() - cpu_started
+        return self.report()
+
+    async def _guard(self, name, consumer):
+        try:
+            await consumer(self, self.stats[name])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats[name].error = e
+            print(f"❌ Error in {name}: {e}")
+
+    def report(self):
+        """Per-task latency and CPU, with CPU share of the whole process"""
+        report = {}
+        for name, stats in self.stats.items():
+            summary = stats.summary()
+            summary["cpu_share"] = stats.cpu_seconds / self._process_cpu if self._process_cpu else 0.0
+            summary["cores"] = stats.cpu_seconds / self._wall if self._wall else 0.0
+            report[name] = summary
+        return report
+
+
+def format_report(report):
+    lines = []
+    for name, s in report.items():
+        lines.append(f"  {name:<10} {s['items']:>6} items  p50 {s['p50_ms']:7.1f} ms  "
+                     f"p95 {s['p95_ms']:7.1f} ms  CPU {s['cpu_s']:6.2f} s "
+                     f"({s['cpu_share']:.0%} of process, {s['cores']:.2f} cores)")
+        if s["error"]:
+            lines.append(f"  {'':<10} failed: {s['error']}")
+    return "\n".join(lines)
+
+
+def captions(model="whisper-base", window=5.0, step=0.5, overlap=1.0, use_vad=True):
+    """Live captions consumer; Whisper decodes run on the executor"""
+    async def consume(sup, stats):
+        from .model_registry import get_model
+        from .speech_to_text import show_caption
+        from .streaming_stt import StreamingTranscriber
+        from .vad import VoiceActivityDetector
+
+        sub = sup.audio(stats)
+        whisper = await sup.offload(None, get_model, model)
+        vad = VoiceActivityDetector(SAMPLE_RATE) if use_vad else None
+        transcriber = StreamingTranscriber(whisper, SAMPLE_RATE, window=window, step=step,
+                                           overlap=overlap, vad=vad, clock=sup.now)
+        while True:
+            item = await sub.get()
+            if item is None:
+                caption = await sup.offload(stats, transcriber.flush)
+            else:
+                with stats.cpu():
+                    transcriber.callback(item[0])
+                    for view in sub.drain():  # catch up on audio that arrived during the last decode
+                        transcriber.callback(view)
+                if not transcriber.due:
+                    continue
+                caption = await sup.offload(stats, transcriber.poll)
+            if caption is not None:
+                stats.record(caption.latency)
+                show_caption(caption)
+                if caption.final:
+                    sup.events.transcript(caption.text, duration=caption.end - caption.start)
+            if item is None:
+                return
+
+    return consume
+
+
+def sound_alerts(threshold_db=-22.0):
+    """Loud-sound alert consumer; cheap enough to run on the loop itself"""
+    async def consume(sup, stats):
+        from .loudness import LoudnessMonitor
+        from .sound_alert import show_alert, show_label
+        from .sound_classifier import EventLabeler, SoundClassifier
+
+        sub = sup.audio(stats)
+        monitor = LoudnessMonitor(SAMPLE_RATE, threshold_db=threshold_db, clock=sup.now)
+        # the bus ring doubles as the history the classifier looks back into
+        labeler = EventLabeler(SoundClassifier(SAMPLE_RATE), sup.mic.buffer, origin=sub.reader.position)
+        while True:
+            item = await sub.get()
+            with stats.cpu():
+                if item is not None:
+                    block, arrived = item
+                    for event in monitor.process(block, arrived):
+                        stats.record(event.latency)
+                        show_alert(event)
+                        labeler.add(event)
+                labelled = labeler.ready(flush=item is None)
+            for event in labelled:
+                show_label(event)
+                sup.events.alert(event.label, event.confidence, event.rms_db)
+            if item is None:
+                return
+
+    return consume
+
+
+def detection(model="yolov8n", config=None, speak=False, change_threshold=0.03, max_stale=2.0):
+    """Object detection consumer on the newest camera frame
+
+    Runs headless: detections are printed and, with ``speak``, announced.
+    Frames that arrive while the detector is busy are skipped.
+    """
+    async def consume(sup, stats):
+        from .announcer import Announcer, summarize
+        from .devices import Devices
+        from .change_gate import ChangeGate
+        from .detections import DetectionFrame
+        from .inference_config import ConfiguredDetector, InferenceConfig
+        from .model_registry import get_model
+
+        sub = sup.frames(stats)
+        yolo = await sup.offload(None, get_model, model)
+        detector = ConfiguredDetector(yolo, config or InferenceConfig.from_env())
+        gate = ChangeGate(threshold=change_threshold, max_stale=max_stale, clock=sup.now)
+        announcer = Announcer((sup.devices or Devices()).speaker()).start() if speak else None
+        last = None
+        try:
+            while True:
+                frame = await sub.get()
+                if frame is None:
+                    return
+                results = await sup.offload(stats, gate.run, frame.image, detector)
+                if not sup.camera.valid(frame):
+                    stats.overruns += 1  # slot reused while the detector had it
+                stats.record(sup.now() - frame.timestamp)
+                detections = DetectionFrame.from_results(results[0], seq=frame.seq)
+                if not gate.last_skipped:  # a reused result was logged when it was inferred
+                    sup.events.log_frame(detections)
+                labels = sorted(detections.names())
+                if labels != last:
+                    last = labels
+                    text = summarize(labels) if labels else "nothing"
+                    print(f"🎯 Detected: {text}")
+                    if announcer is not None and labels:
+                        announcer.announce_labels(labels)
+        finally:
+            if announcer is not None:
+                announcer.stop()
+
+    return consume
+
+
+MODES = {
+    "captions": captions,
+    "alerts": sound_alerts,
+    "detection": detection,
+    "voice": lambda: detection(speak=True),
+}
+
+
+def build(modes, mic=None, camera=None, workers=2, devices=None):
+    """Create a supervisor for the named modes, opening only the devices they need
+
+    ``devices`` supplies the microphone, camera and voice
+    (:meth:`Devices.from_env` by default).
+    """
+    from .devices import Devices
+
+    unknown = [m for m in modes if m not in MODES]
+    if unknown:
+        raise ValueError(f"unknown modes: {', '.join(unknown)}")
+    devices = devices or Devices.from_env()
+    needs_mic = any(m in ("captions", "alerts") for m in modes)
+    needs_camera = any(m in ("detection", "voice") for m in modes)
+    if needs_mic and mic is None:
+        mic = AudioBus(devices.microphone(), SAMPLE_RATE)
+    if needs_camera and camera is None:
+        camera = VideoSource(devices.camera(0)).open_bus()
+    sup = Supervisor(mic=mic if needs_mic else None, camera=camera if needs_camera else None, workers=workers,
+                     devices=devices)
+    for mode in modes:
+        sup.add(mode, MODES[mode]())
+    return sup
+
+
+def run(modes=("alerts", "detection"), duration=None, devices=None):
+    """Run several modes together until Ctrl+C
+
+    ``devices`` is passed to :func:`build`; with replayed input the run
+    ends when the input does.
+    """
+    from .devices import Devices
+
+    devices = devices or Devices.from_env()
+    missing = []
+    if any(m in ("captions", "alerts") for m in modes) and not HAS_AUDIO and not devices.simulated:
+        missing.append("sounddevice")
+    if any(m in ("detection", "voice") for m in modes) and not HAS_VISION and not devices.simulated:
+        missing.append("opencv-python")
+    if missing:
+        print(f"⚠️  Combined mode requires: pip install {' '.join(missing)}")
+        print(f"Demo mode: Would run {', '.join(modes)} together")
+        return
+
+    sup = None
+    try:
+        sup = build(list(modes), devices=devices)
+        print(f"🧩 Running {', '.join(modes)} together (Press Ctrl+C to stop)")
+        report = asyncio.run(sup.run(duration))
+    except KeyboardInterrupt:
+        print("\n✓ Combined mode stopped")
+        report = sup.report() if sup is not None else None
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        return
+    finally:
+        if sup is not None and sup.camera is not None:
+            sup.camera.release()
+    if report:
+        print("⏱️  Per-task latency and CPU:")
+        print(format_report(report))
+    return report
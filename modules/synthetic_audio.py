@@ -0,0 +1,85 @@
+"""Synthetic household sounds for offline tests and benchmarks"""
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def _t(seconds, samplerate):
+    return np.arange(int(seconds * samplerate)) / samplerate
+
+
+def smoke_alarm(seconds=2.0, samplerate=SAMPLE_RATE, freq=3100.0, amplitude=0.5):
+    """T3-style beeping: a ~3 kHz tone, 0.5 s on / 0.5 s off"""
+    t = _t(seconds, samplerate)
+    gate = (t % 1.0) < 0.5
+    tone = np.sin(2 * np.pi * freq * t) + 0.2 * np.sin(2 * np.pi * 3 * freq * t)
+    return (amplitude * gate * tone / 1.2).astype(np.float32)
+
+
+def siren(seconds=2.0, samplerate=SAMPLE_RATE, low=600.0, high=1400.0, period=1.0, amplitude=0.5):
+    """Wailing siren sweeping between ``low`` and ``high`` Hz"""
+    t = _t(seconds, samplerate)
+    freq = low + (high - low) * (0.5 - 0.5 * np.cos(2 * np.pi * t / period))
+    phase = 2 * np.pi * np.cumsum(freq) / samplerate
+    return (amplitude * np.sin(phase)).astype(np.float32)
+
+
+def doorbell(seconds=1.5, samplerate=SAMPLE_RATE, notes=(660.0, 523.0), amplitude=0.5):
+    """Ding-dong: two decaying bell notes"""
+    t = _t(seconds, samplerate)
+    out = np.zeros_like(t)
+    step = seconds / (len(notes) + 1)
+    for i, freq in enumerate(notes):
+        local = t - i * step
+        on = local >= 0
+        env = np.exp(-np.clip(local, 0, None) * 3.0) * on
+        out += env * (np.sin(2 * np.pi * freq * local) + 0.3 * np.sin(2 * np.pi * 2 * freq * local))
+    return (amplitude * out / np.abs(out).max()).astype(np.float32)
+
+
+def knock(seconds=1.5, samplerate=SAMPLE_RATE, knocks=3, spacing=0.22, amplitude=0.6, seed=0):
+    """Knuckles on a door: short low-pitched thuds"""
+    rng = np.random.default_rng(seed)
+    out = np.zeros(int(seconds * samplerate))
+    length = int(0.03 * samplerate)
+    decay = np.exp(-np.arange(length) / (0.006 * samplerate))
+    thud = np.sin(2 * np.pi * 180 * np.arange(length) / samplerate) * decay
+    for i in range(knocks):
+        start = int((0.1 + i * spacing) * samplerate)
+        burst = thud + 0.3 * rng.normal(0, 1, length) * decay
+        out[start:start + length] += burst
+    return (amplitude * out / np.abs(out).max()).astype(np.float32)
+
+
+def slam(seconds=1.0, samplerate=SAMPLE_RATE, amplitude=0.8, seed=0):
+    """A single broadband bang, e.g. a door slamming"""
+    rng = np.random.default_rng(seed)
+    out = np.zeros(int(seconds * samplerate))
+    length = int(0.15 * samplerate)
+    out[int(0.1 * samplerate):int(0.1 * samplerate) + length] = (
+        rng.normal(0, 1, length) * np.exp(-np.arange(length) / (0.03 * samplerate)))
+    return (amplitude * out / np.abs(out).max()).astype(np.float32)
+
+
+def background(seconds=1.0, samplerate=SAMPLE_RATE, level=0.005, seed=0):
+    """Quiet room noise to mix under the other sounds"""
+    rng = np.random.default_rng(seed)
+    return rng.normal(0, level, int(seconds * samplerate)).astype(np.float32)
+
+
+def voice(seconds=1.0, samplerate=SAMPLE_RATE, pitch=140.0, syllables=4.0, amplitude=0.3):
+    """Speech-like harmonics with a syllable-rate envelope (for VAD and captions)"""
+    t = _t(seconds, samplerate)
+    tone = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 12))
+    envelope = 0.55 - 0.45 * np.cos(2 * np.pi * syllables * t)
+    return (amplitude * envelope * tone / np.abs(tone).max()).astype(np.float32)
+
+
+SOUNDS = {
+    "alarm": smoke_alarm,
+    "siren": siren,
+    "doorbell": doorbell,
+    "knock": knock,
+    "loud sound": slam,
+}
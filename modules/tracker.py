@@ -0,0 +1,168 @@
+"""Lightweight multi-object tracker over YOLO boxes"""
+
+from dataclasses import dataclass, field
+
+import numpy as np
+
+
+def iou_matrix(a, b):
+    """Pairwise IoU of ``(N, 4)`` and ``(M, 4)`` xyxy boxes"""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0)
+
+
+def centroid_distance(a, b):
+    """Pairwise centroid distance normalised by the diagonal of the ``a`` boxes"""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    ca = (a[:, :2] + a[:, 2:]) / 2
+    cb = (b[:, :2] + b[:, 2:]) / 2
+    diag = np.hypot(a[:, 2] - a[:, 0], a[:, 3] - a[:, 1])
+    return np.linalg.norm(ca[:, None] - cb[None], axis=2) / np.maximum(diag[:, None], 1e-9)
+
+
+def greedy_assign(cost, max_cost):
+    """Match rows to columns cheapest-first; returns ``(rows, cols)`` arrays"""
+    if cost.size == 0:
+        return np.zeros(0, int), np.zeros(0, int)
+    rows, cols = np.nonzero(cost <= max_cost)
+    order = np.argsort(cost[rows, cols], kind="stable")
+    used_r, used_c, out_r, out_c = set(), set(), [], []
+    for r, c in zip(rows[order], cols[order]):
+        if r not in used_r and c not in used_c:
+            used_r.add(r)
+            used_c.add(c)
+            out_r.append(r)
+            out_c.append(c)
+    return np.asarray(out_r, int), np.asarray(out_c, int)
+
+
+@dataclass
+class Track:
+    """One object followed across frames"""
+    id: int
+    box: np.ndarray
+    cls: int
+    confidence: float
+    velocity: np.ndarray = field(default_factory=lambda: np.zeros(4, np.float32))
+    last_box: np.ndarray = None  # last detected box; ``box`` may be a prediction
+    hits: int = 1
+    missed: int = 0
+    confirmed: bool = False
+
+    def __post_init__(self):
+        if self.last_box is None:
+            self.last_box = self.box
+
+
+@dataclass
+class TrackUpdate:
+    """Tracks after a frame, plus the ones that just appeared or left"""
+    tracks: list
+    appeared: list
+    departed: list
+
+
+class IoUTracker:
+    """Associate detections to tracks by IoU, falling back to centroid distance
+
+    Tracks must be seen ``min_hits`` times before they count as appeared and
+    are dropped (departed) after ``max_missed`` detection rounds without a
+    match. :meth:`predict` moves tracks along their last velocity (per
+    detection round, measured between detected boxes) so the detector can
+    be skipped on frames in between.
+    """
+
+    def __init__(self, iou_threshold=0.3, max_centroid=0.5, max_missed=3, min_hits=2):
+        self.iou_threshold = iou_threshold
+        self.max_centroid = max_centroid
+        self.max_missed = max_missed
+        self.min_hits = min_hits
+        self.tracks = []
+        self._next_id = 1
+
+    def update(self, boxes, classes, confidences=None):
+        """Feed one frame of detections (xyxy boxes, class ids, scores)"""
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        classes = np.asarray(classes, dtype=int).reshape(-1)
+        if confidences is None:
+            confidences = np.ones(len(boxes), np.float32)
+        confidences = np.asarray(confidences, dtype=np.float32).reshape(-1)
+
+        track_boxes = np.array([t.box for t in self.tracks], np.float32).reshape(-1, 4)
+        track_cls = np.array([t.cls for t in self.tracks], int)
+        same_class = track_cls[:, None] == classes[None, :]
+
+        cost = np.where(same_class, 1.0 - iou_matrix(track_boxes, boxes), np.inf)
+        rows, cols = greedy_assign(cost, 1.0 - self.iou_threshold)
+
+        # Second pass for fast movers whose boxes no longer overlap
+        free_r = np.setdiff1d(np.arange(len(self.tracks)), rows)
+        free_c = np.setdiff1d(np.arange(len(boxes)), cols)
+        if len(free_r) and len(free_c):
+            dist = centroid_distance(track_boxes[free_r], boxes[free_c])
+            dist = np.where(same_class[np.ix_(free_r, free_c)], dist, np.inf)
+            r2, c2 = greedy_assign(dist, self.max_centroid)
+            rows = np.concatenate([rows, free_r[r2]])
+            cols = np.concatenate([cols, free_c[c2]])
+
+        appeared = []
+        for r, c in zip(rows, cols):
+            track = self.tracks[r]
+            track.velocity = (boxes[c] - track.last_box) / (track.missed + 1)
+            track.last_box = boxes[c]
+            track.box = boxes[c]
+            track.confidence = float(confidences[c])
+            track.hits += 1
+            track.missed = 0
+            if not track.confirmed and track.hits >= self.min_hits:
+                track.confirmed = True
+                appeared.append(track)
+
+        matched = set(rows.tolist())
+        departed, kept = [], []
+        for i, track in enumerate(self.tracks):
+            if i not in matched:
+                track.missed += 1
+                track.velocity = np.zeros(4, np.float32)
+                if track.missed > self.max_missed:
+                    if track.confirmed:
+                        departed.append(track)
+                    continue
+            kept.append(track)
+
+        for c in np.setdiff1d(np.arange(len(boxes)), cols):
+            track = Track(self._next_id, boxes[c], int(classes[c]), float(confidences[c]))
+            self._next_id += 1
+            if self.min_hits <= 1:
+                track.confirmed = True
+                appeared.append(track)
+            kept.append(track)
+
+        self.tracks = kept
+        return TrackUpdate(self.visible(), appeared, departed)
+
+    def predict(self, steps=1):
+        """Advance tracks without a detection (frames between detector runs)"""
+        for track in self.tracks:
+            track.box = track.box + track.velocity * steps
+        return TrackUpdate(self.visible(), [], [])
+
+    def visible(self):
+        """Confirmed tracks that were matched recently"""
+        return [t for t in self.tracks if t.confirmed]
+
+
+def draw_tracks(frame, tracks, names):
+    """Overlay track boxes and ids on a copy of ``frame``"""
+    from .detections import DetectionFrame, draw_detections, label_table
+    return draw_detections(frame, DetectionFrame.from_tracks(tracks, label_table(names)))
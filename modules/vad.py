@@ -0,0 +1,127 @@
+"""Lightweight voice activity detection to skip Whisper on silence"""
+
+import numpy as np
+
+EPS = 1e-10
+
+
+class VoiceActivityDetector:
+    """Frame-level speech gate from energy, zero-crossing rate and flatness
+
+    All features are computed over every frame at once with NumPy. A frame
+    counts as speech when it is loud enough, its zero-crossing rate is in the
+    voice range (rejects mains hum and hiss) and its spectrum is not flat
+    (rejects broadband noise). Hangover keeps short pauses inside a segment,
+    and segments are padded so word onsets and tails are not clipped.
+    """
+
+    def __init__(self, samplerate=16000, frame_ms=30, energy_db=-45.0,
+                 zcr_range=(0.01, 0.35), max_flatness=0.5, hangover_ms=300,
+                 min_speech_ms=90, pad_ms=200):
+        self.samplerate = samplerate
+        self.frame = int(samplerate * frame_ms / 1000)
+        self.energy_db = energy_db
+        self.zcr_range = zcr_range
+        self.max_flatness = max_flatness
+        self.hangover = max(0, round(hangover_ms / frame_ms))
+        self.min_speech = max(1, round(min_speech_ms / frame_ms))
+        self.pad = int(samplerate * pad_ms / 1000)
+        self._window = np.hanning(self.frame).astype(np.float32)
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Zero the dropped/decoded counters"""
+        self.seconds_in = 0.0
+        self.seconds_decoded = 0.0
+        self.seconds_dropped = 0.0
+        self.blocks_skipped = 0
+
+    @property
+    def stats(self):
+        """Counters showing how much audio never reached the model"""
+        saved = self.seconds_dropped / self.seconds_in if self.seconds_in else 0.0
+        return {
+            "seconds_in": self.seconds_in,
+            "seconds_decoded": self.seconds_decoded,
+            "seconds_dropped": self.seconds_dropped,
+            "blocks_skipped": self.blocks_skipped,
+            "fraction_saved": saved,
+        }
+
+    def frame_features(self, audio):
+        """Return per-frame (energy dB, zero-crossing rate, spectral flatness)"""
+        n = len(audio) // self.frame
+        frames = np.asarray(audio[:n * self.frame], dtype=np.float32).reshape(n, self.frame)
+        energy = 10 * np.log10(np.mean(frames ** 2, axis=1) + EPS)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / (self.frame - 1)
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2 + EPS
+        flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+        return energy, zcr, flatness
+
+    def speech_mask(self, audio):
+        """Per-frame speech decision with hangover smoothing"""
+        energy, zcr, flatness = self.frame_features(audio)
+        raw = ((energy > self.energy_db)
+               & (zcr >= self.zcr_range[0]) & (zcr <= self.zcr_range[1])
+               & (flatness < self.max_flatness))
+        starts, stops = _runs(raw)
+        for start, stop in zip(starts, stops):
+            if stop - start < self.min_speech:
+                raw[start:stop] = False
+        if self.hangover and raw.any():
+            kernel = np.ones(self.hangover + 1)
+            raw = np.convolve(raw, kernel)[:len(raw)] > 0
+        return raw
+
+    def segments(self, audio):
+        """Return padded, merged ``(start, stop)`` sample ranges of speech"""
+        starts, stops = _runs(self.speech_mask(audio))
+        segments = []
+        for start, stop in zip(starts * self.frame - self.pad, stops * self.frame + self.pad):
+            start, stop = max(0, start), min(len(audio), stop)
+            if segments and start <= segments[-1][1]:
+                segments[-1] = (segments[-1][0], stop)
+            else:
+                segments.append((start, stop))
+        return segments
+
+    def extract(self, audio):
+        """Concatenate the speech segments of ``audio`` (empty when silent)"""
+        segments = self.segments(audio)
+        if segments:
+            speech = np.concatenate([audio[start:stop] for start, stop in segments])
+        else:
+            speech = audio[:0]
+        self._count(len(audio), len(speech), skipped=not len(speech))
+        return speech
+
+    def trim(self, audio):
+        """Cut leading and trailing non-speech from ``audio``"""
+        start, stop = self.trim_bounds(audio)
+        return audio[start:stop]
+
+    def trim_bounds(self, audio, new=None):
+        """``(start, stop)`` of the speech in ``audio``; ``(0, 0)`` when silent
+
+        With ``new`` only the last ``new`` samples go into the counters, for
+        callers that re-check a growing window whose start was counted before.
+        """
+        segments = self.segments(audio)
+        start, stop = (segments[0][0], segments[-1][1]) if segments else (0, 0)
+        new = len(audio) if new is None else min(new, len(audio))
+        self._count(new, max(0, stop - max(start, len(audio) - new)), skipped=stop <= start)
+        return start, stop
+
+    def _count(self, total, kept, skipped):
+        self.seconds_in += total / self.samplerate
+        self.seconds_decoded += kept / self.samplerate
+        self.seconds_dropped += (total - kept) / self.samplerate
+        if skipped:
+            self.blocks_skipped += 1
+
+
+def _runs(mask):
+    """Start and stop indices of each run of True values"""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
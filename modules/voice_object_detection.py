@@ -1,58 +1,126 @@
 """Voice + Object Detection module for blind users"""
 
-try:
-    from ultralytics import YOLO  # type: ignore
-    import cv2  # type: ignore
-    import pyttsx3  # type: ignore
-    HAS_VOICE_VISION = True
-except ImportError:
-    HAS_VOICE_VISION = False
-
-def run():
-    """Run combined voice and object detection"""
-    if not HAS_VOICE_VISION:
+import os
+
+from .lazy import has_modules
+
+HAS_VOICE_VISION = has_modules("ultralytics", "cv2", "pyttsx3")
+
+def run(detect_every=3, change_threshold=0.03, max_stale=2.0, config=None, adaptive=None, target_ms=None,
+        devices=None, model_name="yolov8n"):
+    """Run combined voice and object detection
+
+    The detector runs on every ``detect_every``-th frame and the tracker
+    carries boxes in between. Detection frames that barely differ from the
+    last inferred one reuse its results. Only objects that appear or leave
+    are announced. ``config`` is an :class:`InferenceConfig`; by default it
+    comes from the AURA_* environment variables. ``devices`` supplies the
+    camera, window and voice (:meth:`Devices.from_env` by default).
+
+    With ``adaptive`` (or AURA_ADAPTIVE=1) the model and input size follow
+    the vision quality ladder to keep each inference near ``target_ms``
+    (AURA_TARGET_MS, default 66), and its frame stride multiplies
+    ``detect_every``; the tracker covers the extra frames.
+    """
+    from .devices import Devices
+
+    devices = devices or Devices.from_env()
+    if not HAS_VOICE_VISION and not devices.simulated:
         print("⚠️  Voice Object Detection requires: pip install ultralytics opencv-python pyttsx3")
         print("Demo mode: Would detect objects and announce them")
         return
-    
+    from .announcer import Announcer, summarize
+    from .change_gate import ChangeGate, format_gate_stats
+    from .detections import DetectionFrame, draw_detections
+    from .event_log import open_log
+    from .inference_config import ConfiguredDetector, InferenceConfig
+    from .metrics import metrics
+    from .model_registry import get_model
+    from .quality import VISION_LEVELS, AdaptiveDetector, QualityController
+    from .tracker import IoUTracker
+
+    timers = {stage: metrics.timer("stage_seconds", mode="voice", stage=stage)
+              for stage in ("capture", "inference", "tracking", "render")}
+    if adaptive is None:
+        adaptive = os.environ.get("AURA_ADAPTIVE") == "1"
     try:
-        engine = pyttsx3.init()
-        model = YOLO("yolov8n.pt")
-        cap = cv2.VideoCapture(0)
+        config = config or InferenceConfig.from_env()
+        controller = None
+        if adaptive:
+            target = (target_ms or float(os.environ.get("AURA_TARGET_MS", "66"))) / 1000
+            controller = QualityController(VISION_LEVELS, target, start="n-640", name="voice")
+            # the stride is applied here so the tracker, not a repeated result, fills skipped frames
+            model = AdaptiveDetector(controller, config).detect
+        else:
+            model = ConfiguredDetector(get_model(model_name), config)
+        announcer = Announcer(devices.speaker()).start()
+        events = open_log()
+        tracker = IoUTracker()
+        gate = ChangeGate(threshold=change_threshold, max_stale=max_stale)
+        cap = devices.camera(0)
         
         if not cap.isOpened():
             print("❌ Error: Camera not available")
             return
         
+        display = devices.display("AURA AI")
         print("📹🔊 Voice Object Detection started (Press 'q' to quit)")
+        frame_index = 0
+        since_detection = None
         while True:
-            ret, frame = cap.read()
+            with timers["capture"].time():
+                ret, frame = cap.read()
             if not ret:
-                print("❌ Error: Failed to read from camera")
+                if not devices.simulated:
+                    print("❌ Error: Failed to read from camera")
                 break
             
-            results = model(frame)
-            names = results[0].names
-            boxes = results[0].boxes
+            every = detect_every * (controller.level.stride if controller else 1)
+            if since_detection is None or since_detection >= every:
+                since_detection = 1
+                with timers["inference"].time():
+                    results = gate.run(frame, model)
+                detections = DetectionFrame.from_results(results[0], seq=frame_index)
+                labels = detections.labels
+                if not gate.last_skipped:
+                    events.log_frame(detections)
+                with timers["tracking"].time():
+                    update = tracker.update(detections.boxes, detections.classes, detections.confidences)
+            else:
+                since_detection += 1
+                with timers["tracking"].time():
+                    update = tracker.predict(steps=1 / every)
+            frame_index += 1
             
-            for box in boxes:
-                cls = int(box.cls[0])
-                label = names[cls]
-                print(f"🎯 Detected: {label}")
-                engine.say(label)
-                engine.runAndWait()
+            if update.appeared:
+                text = announcer.announce_frame(DetectionFrame.from_tracks(update.appeared, labels))
+                if text:
+                    print(f"🎯 Detected: {text}")
+            if update.departed:
+                text = summarize(DetectionFrame.from_tracks(update.departed, labels).names()) + " gone"
+                announcer.say(text, key="departed")
+                print(f"👋 {text}")
             
-            annotated_frame = results[0].plot()
-            cv2.imshow("AURA AI", annotated_frame)
+            with timers["render"].time():
+                annotated_frame = draw_detections(frame, DetectionFrame.from_tracks(update.tracks, labels))
+                display.show(annotated_frame)
             
-            if cv2.waitKey(1) == ord('q'):
+            if display.poll() == ord('q'):
                 break
         
+        announcer.stop()
+        events.stop()
+        print(f"🔊 Announcements: {announcer.stats}")
+        print(format_gate_stats(gate.stats))
         cap.release()
-        cv2.destroyAllWindows()
+        display.close()
     except Exception as e:
         print(f"❌ Error: {e}")
+        if 'announcer' in locals():
+            announcer.stop()
+        if 'events' in locals():
+            events.stop()
         if 'cap' in locals():
             cap.release()
-        if 'cv2' in locals():
-            cv2.destroyAllWindows()
+        if 'display' in locals():
+            display.close()
@@ -87,7 +87,7 @@ class TestAccessibilityFeatures:
     
     def test_error_messages_are_visible(self, capsys):
         """Test that errors are clearly communicated (not just audio)"""
-        with patch('sounddevice.rec', side_effect=Exception("Test error")):
+        with patch('sounddevice.InputStream', side_effect=Exception("Test error")):
             sound_alert.HAS_AUDIO = True
             try:
                 sound_alert.run()
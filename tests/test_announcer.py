@@ -0,0 +1,119 @@
+"""
+Tests for spoken announcements (audio feedback for blind users)
+The speaker is faked so tests run without pyttsx3 or a sound card
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.announcer import Announcer, plural, summarize
+
+
+class FakeSpeaker:
+    """Records spoken text; can be held busy to simulate a slow TTS engine"""
+
+    def __init__(self, delay=0.0):
+        self.spoken = []
+        self.delay = delay
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self, text):
+        self.release.wait(5)
+        time.sleep(self.delay)
+        self.spoken.append(text)
+
+
+class TestSummaries:
+    """Test collapsing detections into one phrase"""
+
+    def test_plurals(self):
+        assert plural("person", 3) == "3 people"
+        assert plural("bus", 2) == "2 buses"
+        assert plural("chair", 1) == "chair"
+        assert plural("cell phone", 2) == "2 cell phones"
+
+    def test_counts_and_priority_order(self):
+        """Traffic comes before people, people before furniture"""
+        labels = ["chair", "person", "person", "car", "person"]
+        assert summarize(labels) == "car, 3 people, chair"
+
+
+class TestAnnouncer:
+    """Test the scheduling thread"""
+
+    def test_frame_is_spoken_once_as_summary(self):
+        """Five people are one announcement, not five"""
+        speaker = FakeSpeaker()
+        announcer = Announcer(speaker).start()
+        assert announcer.announce_labels(["person"] * 5) == "5 people"
+        assert announcer.wait_idle()
+        announcer.stop()
+        assert speaker.spoken == ["5 people"]
+        assert announcer.stats["merged"] == 4
+
+    def test_cooldown_suppresses_repeats(self):
+        """A static scene is not announced again on every frame"""
+        speaker = FakeSpeaker()
+        announcer = Announcer(speaker, cooldown=60).start()
+        announcer.announce_labels(["chair"])
+        announcer.wait_idle()
+        for _ in range(10):
+            assert announcer.announce_labels(["chair"]) is None
+        announcer.stop()
+        assert speaker.spoken == ["chair"]
+        assert announcer.stats["suppressed"] == 10
+
+    def test_newer_frames_replace_pending_ones(self):
+        """While the speaker is busy only the newest scene is kept"""
+        speaker = FakeSpeaker()
+        speaker.release.clear()
+        announcer = Announcer(speaker).start()
+        announcer.announce_labels(["dog"])
+        time.sleep(0.05)
+        announcer.announce_labels(["chair"])
+        announcer.announce_labels(["cup"])
+        announcer.announce_labels(["bottle"])
+        speaker.release.set()
+        announcer.wait_idle()
+        announcer.stop()
+        assert speaker.spoken == ["dog", "bottle"]
+        assert announcer.stats["dropped"] == 2
+        assert announcer.stats["queued"] == 4
+
+    def test_stale_announcements_are_dropped(self):
+        """Nothing is spoken about a scene that is long gone"""
+        now = [0.0]
+        speaker = FakeSpeaker()
+        speaker.release.clear()
+        announcer = Announcer(speaker, max_age=1.0, clock=lambda: now[0]).start()
+        announcer.announce_labels(["dog"])
+        time.sleep(0.05)
+        announcer.say("low battery", key="status")
+        now[0] = 5.0
+        speaker.release.set()
+        announcer.wait_idle()
+        announcer.stop()
+        assert speaker.spoken == ["dog"]
+        assert announcer.stats["dropped"] == 1
+
+    def test_queueing_never_blocks_the_caller(self):
+        """The vision loop returns immediately even with a slow voice"""
+        announcer = Announcer(FakeSpeaker(delay=0.5)).start()
+        started = time.perf_counter()
+        for i in range(20):
+            announcer.announce_labels([f"object {i}"])
+        assert time.perf_counter() - started < 0.1
+        announcer.stop(timeout=0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
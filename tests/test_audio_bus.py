@@ -0,0 +1,102 @@
+"""
+Tests for the shared microphone capture bus
+A file-backed source replaces the sounddevice stream
+"""
+
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.audio_bus import AudioBus, FileCapture
+from modules.audio_io import save_wav
+from modules.ring_buffer import AudioRingBuffer
+
+SR = 16000
+
+
+def ramp(n):
+    return np.arange(n, dtype=np.float32)
+
+
+class TestMirroredRing:
+    """Test zero-copy views across the wrap point"""
+
+    def test_view_across_wrap_is_contiguous(self):
+        ring = AudioRingBuffer(10, mirror=4)
+        ring.write(ramp(8))
+        ring.write(ramp(6) + 8)
+        view = ring.view(7, 11)
+        np.testing.assert_array_equal(view, [7, 8, 9, 10])
+        assert np.shares_memory(view, ring._data)
+        assert not view.flags.writeable
+
+    def test_view_longer_than_mirror_across_wrap_fails(self):
+        ring = AudioRingBuffer(10, mirror=2)
+        ring.write(ramp(14))
+        with pytest.raises(ValueError):
+            ring.view(5, 13)
+
+
+class TestAudioBus:
+    """Test fan-out, cursors and overrun detection"""
+
+    def test_readers_see_every_sample_at_their_own_pace(self):
+        bus = AudioBus(samplerate=SR, seconds=1.0, max_read=0.1)
+        fast, slow = bus.subscribe(), bus.subscribe()
+        got_fast, got_slow = [], []
+        for block in np.split(ramp(8000), 16):
+            bus.write(block)
+            got_fast.append(fast.read().copy())
+            if len(got_fast) % 4 == 0:
+                while slow.available:
+                    got_slow.append(slow.read(700).copy())
+        np.testing.assert_array_equal(np.concatenate(got_fast), ramp(8000))
+        np.testing.assert_array_equal(np.concatenate(got_slow), ramp(8000))
+
+    def test_reads_are_views_of_the_shared_ring(self):
+        bus = AudioBus(samplerate=SR, seconds=1.0)
+        a, b = bus.subscribe(), bus.subscribe()
+        bus.write(ramp(1000))
+        va, vb = a.read(), b.read()
+        assert np.shares_memory(va, vb)
+        assert bytes(memoryview(va)) == ramp(1000).tobytes()
+
+    def test_lagging_reader_detects_overrun(self):
+        bus = AudioBus(samplerate=SR, seconds=0.5)
+        reader = bus.subscribe()
+        bus.write(ramp(SR))
+        view = reader.read()
+        assert reader.overruns == 1
+        assert reader.lost_samples == SR // 2
+        assert view[0] == SR // 2
+
+    def test_file_capture_feeds_bus_and_closes(self, tmp_path):
+        path = tmp_path / "clip.wav"
+        audio = np.sin(np.linspace(0, 200, SR)).astype(np.float32) * 0.5
+        save_wav(path, audio, SR)
+        bus = AudioBus(FileCapture(path, blocksize=300), samplerate=SR, seconds=0.2)
+        reader = bus.subscribe()
+        with bus:
+            out = np.concatenate([view.copy() for view in reader])
+        assert reader.overruns == 0
+        np.testing.assert_allclose(out, audio, atol=1e-4)
+
+    def test_read_exactly_waits_for_live_samples(self):
+        bus = AudioBus(samplerate=SR)
+        reader = bus.subscribe()
+        feeder = threading.Thread(target=lambda: [bus.write(ramp(500)) for _ in range(4)])
+        feeder.start()
+        out = reader.read_exactly(1800, timeout=2.0)
+        feeder.join()
+        assert len(out) == 1800
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,108 @@
+"""
+Tests for detector backend selection and the ONNX export cache
+Exports are faked with small files so no weights or onnxruntime are needed
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules import backends
+from modules.backends import OnnxBackend, TorchBackend, get_backend
+from modules.model_registry import registry
+
+
+@pytest.fixture
+def onnx(tmp_path, monkeypatch):
+    backend = OnnxBackend(cache_dir=tmp_path / "cache")
+    calls = []
+
+    def fake_export(weights):
+        calls.append(weights)
+        out = tmp_path / f"export-{len(calls)}.onnx"
+        out.write_bytes(b"onnx")
+        return out
+
+    monkeypatch.setattr(backend, "_export", fake_export)
+    return backend, calls
+
+
+class TestOnnxCache:
+    """Test that exports are built once and invalidated by new weights"""
+
+    def test_second_prepare_reuses_export(self, onnx, tmp_path):
+        backend, calls = onnx
+        weights = tmp_path / "yolov8n.pt"
+        weights.write_bytes(b"v1")
+        first = backend.prepare(weights)
+        assert backend.prepare(weights) == first
+        assert first.exists() and first.parent == tmp_path / "cache"
+        assert first.name.startswith("yolov8n-")
+        assert len(calls) == 1 and backend.exports == 1
+
+    def test_changed_weights_get_a_new_export(self, onnx, tmp_path):
+        backend, calls = onnx
+        weights = tmp_path / "yolov8n.pt"
+        weights.write_bytes(b"v1")
+        first = backend.prepare(weights)
+        weights.write_bytes(b"version 2")
+        assert backend.prepare(weights) == first
+        assert len(calls) == 2
+        assert backend.prepare(weights) == first and len(calls) == 2
+
+    def test_downloaded_weights_reuse_export(self, onnx, tmp_path, monkeypatch):
+        """Weights fetched during the first export don't force a second one"""
+        backend, calls = onnx
+        monkeypatch.chdir(tmp_path)
+        export = backend._export
+
+        def download_and_export(weights):
+            Path(weights).write_bytes(b"downloaded")
+            return export(weights)
+
+        monkeypatch.setattr(backend, "_export", download_and_export)
+        first = backend.prepare("yolov8n.pt")
+        restarted = OnnxBackend(cache_dir=backend.cache_dir)
+        assert restarted.prepare("yolov8n.pt") == first
+        assert len(calls) == 1
+
+    def test_export_is_shared_by_new_backend_instances(self, onnx, tmp_path):
+        """A later start finds the cached file without exporting"""
+        backend, calls = onnx
+        backend.prepare("yolov8n.pt")
+        restarted = OnnxBackend(cache_dir=backend.cache_dir)
+        assert restarted.artifact("yolov8n.pt").exists()
+
+
+class TestBackendSelection:
+    """Test AURA_BACKEND handling and fallbacks"""
+
+    def test_default_is_torch(self, monkeypatch):
+        monkeypatch.delenv("AURA_BACKEND", raising=False)
+        assert isinstance(get_backend(), TorchBackend)
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError):
+            get_backend("tensorrt")
+
+    def test_missing_onnxruntime_falls_back_to_torch(self, monkeypatch, capsys):
+        monkeypatch.setenv("AURA_BACKEND", "onnx")
+        monkeypatch.setattr(backends.OnnxBackend, "available", lambda self: False)
+        assert isinstance(get_backend(), TorchBackend)
+        assert "onnxruntime" in capsys.readouterr().out
+
+    def test_backend_must_implement_load(self):
+        with pytest.raises(TypeError):
+            backends.Backend()
+
+    def test_registry_names_each_backend(self):
+        assert "yolov8n-onnx" in registry and "yolov8n-torch" in registry
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,145 @@
+"""
+Tests for offline batch processing of recorded audio and video
+Fake models are registered in the shared registry so no weights are needed
+"""
+
+import json
+import os
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules import batch
+from modules.audio_io import save_wav
+from modules.batch import BatchOptions, find_inputs, run_batch, transcribe_audio
+from modules.model_registry import registry
+from modules.replay import Result
+from modules.vad import VoiceActivityDetector
+
+SR = 16000
+
+
+class FakeWhisper:
+    def __init__(self):
+        self.calls = []
+        self.options = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(len(audio))
+        self.options.append(kwargs)
+        seconds = len(audio) / SR
+        return {"text": "hello", "segments": [{"start": 0.0, "end": seconds, "text": " hello"}]}
+
+
+class FakeYolo:
+    """Sees one chair in every frame; records batch sizes"""
+    names = {0: "person", 56: "chair"}
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, images, **kwargs):
+        images = images if isinstance(images, list) else [images]
+        self.batches.append(len(images))
+        return [Result(self.names, [[1.0, 2.0, 3.0, 4.0, 0.8, 56]], image) for image in images]
+
+
+def voiced(seconds):
+    t = np.arange(int(seconds * SR)) / SR
+    return sum(0.1 / k * np.sin(2 * np.pi * 140 * k * t) for k in range(1, 12)).astype(np.float32)
+
+
+@pytest.fixture
+def recordings(tmp_path):
+    folder = tmp_path / "recordings"
+    folder.mkdir()
+    silence = np.zeros(SR, np.float32)
+    save_wav(folder / "talk.wav", np.concatenate([silence, voiced(1.0), silence]))
+    (folder / "notes.txt").write_text("ignored")
+    cv2 = pytest.importorskip("cv2")
+    writer = cv2.VideoWriter(str(folder / "walk.avi"), cv2.VideoWriter_fourcc(*"MJPG"), 10, (64, 48))
+    for i in range(20):
+        writer.write(np.full((48, 64, 3), i * 10, np.uint8))
+    writer.release()
+    return folder
+
+
+@pytest.fixture
+def fake_models():
+    whisper, yolo = FakeWhisper(), FakeYolo()
+    registry.register("fake-whisper", lambda: whisper)
+    registry.register("fake-yolo", lambda: yolo)
+    yield whisper, yolo
+    registry.evict("fake-whisper")
+    registry.evict("fake-yolo")
+
+
+class TestBatchMode:
+    """Test the batch pipeline end to end in one process"""
+
+    def test_find_inputs(self, recordings):
+        audio, video = find_inputs([recordings])
+        assert [Path(p).name for p in audio] == ["talk.wav"]
+        assert [Path(p).name for p in video] == ["walk.avi"]
+
+    def test_vad_only_sends_speech_to_whisper(self, tmp_path):
+        """Silence in long recordings is not transcribed"""
+        path = tmp_path / "talk.wav"
+        save_wav(path, np.concatenate([np.zeros(3 * SR, np.float32), voiced(1.0)]))
+        model = FakeWhisper()
+        records, seconds = transcribe_audio(path, model, VoiceActivityDetector(SR))
+        assert seconds == pytest.approx(4.0)
+        assert sum(model.calls) < 2 * SR
+        assert all(options.get("fp16") is False for options in model.options)  # no FP16 warning per segment on CPU
+        assert records[0]["start"] >= 2.5 and records[0]["text"] == "hello"
+
+    def test_run_batch_writes_jsonl_and_throughput(self, recordings, tmp_path, fake_models):
+        whisper, yolo = fake_models
+        out = tmp_path / "results.jsonl"
+        options = BatchOptions(whisper="fake-whisper", yolo="fake-yolo", batch_size=4, stride=2)
+        totals = run_batch([recordings], out, workers=1, options=options)
+
+        records = [json.loads(line) for line in out.read_text().splitlines()]
+        transcripts = [r for r in records if r["type"] == "transcript"]
+        detections = [r for r in records if r["type"] == "detections"]
+        assert transcripts[0]["file"].endswith("talk.wav")
+        assert [d["frame"] for d in detections] == list(range(0, 20, 2))
+        assert detections[0]["labels"] == ["chair"]
+        assert yolo.batches == [4, 4, 2]
+        assert totals["errors"] == 0
+        assert totals["frames"] == 10
+        assert totals["audio_seconds"] == pytest.approx(3.0)
+        assert totals["frames_per_sec"] > 0 and totals["audio_seconds_per_sec"] > 0
+
+    def test_failures_are_reported_per_file(self, tmp_path, fake_models):
+        """One broken file does not stop the batch"""
+        (tmp_path / "broken.mp4").write_bytes(b"not a video")
+        out = tmp_path / "results.jsonl"
+        options = BatchOptions(whisper="fake-whisper", yolo="fake-yolo")
+        totals = run_batch([tmp_path], out, options=options)
+        assert totals["errors"] == 1
+        assert json.loads(out.read_text().splitlines()[0])["type"] == "error"
+
+    def test_dead_worker_is_reported_per_file(self, recordings, tmp_path, monkeypatch):
+        """A crashed worker process turns into error lines, not an aborted run"""
+        monkeypatch.setattr(batch, "_init_worker", _crash)
+        out = tmp_path / "results.jsonl"
+        totals = run_batch([recordings], out, workers=2, options=BatchOptions(whisper="fake-whisper"))
+        records = [json.loads(line) for line in out.read_text().splitlines()]
+        assert totals["files"] == 2 and totals["errors"] == 2
+        assert {Path(r["file"]).name for r in records} == {"talk.wav", "walk.avi"}
+        assert all(r["type"] == "error" and "BrokenProcessPool" in r["error"] for r in records)
+
+
+def _crash(threads):
+    os._exit(1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
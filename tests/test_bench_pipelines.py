@@ -0,0 +1,51 @@
+"""
+Tests for the pipeline benchmark suite and its regression gate
+Runs every case on a few seconds of synthetic input with stub devices
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "benchmarks" / "bench_pipelines.py"
+QUICK = ["--seconds", "6", "--frames", "30"]
+
+
+def bench(*args):
+    return subprocess.run([sys.executable, str(SCRIPT), *QUICK, *args], cwd=ROOT,
+                          capture_output=True, text=True, timeout=300)
+
+
+class TestPipelineBenchmarks:
+    """Test baseline recording and regression detection"""
+
+    def test_update_records_every_case(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        out = bench("--baseline", str(baseline), "--update")
+        assert out.returncode == 0, out.stdout + out.stderr
+        recorded = json.loads(baseline.read_text())
+        assert set(recorded) == {"sound_alert", "speech_to_text", "object_detection", "voice_object_detection"}
+        for row in recorded.values():
+            assert row["throughput"] > 0 and row["p95_ms"] >= row["p50_ms"] > 0
+            assert row["peak_rss_mb"] > 0
+
+    def test_regression_past_tolerance_fails(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({"sound_alert": {"throughput": 1e12, "p50_ms": 1e6}}))
+        out = bench("--baseline", str(baseline), "--cases", "sound_alert")
+        assert out.returncode == 1
+        assert "throughput" in out.stdout and "regression" in out.stdout
+
+    def test_within_tolerance_passes(self, tmp_path):
+        baseline = tmp_path / "baseline.json"
+        baseline.write_text(json.dumps({"object_detection": {"throughput": 1.0, "p95_ms": 1e6}}))
+        out = bench("--baseline", str(baseline), "--cases", "object_detection")
+        assert out.returncode == 0, out.stdout + out.stderr
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,99 @@
+"""
+Tests for skipping YOLO inference on unchanged camera frames
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules import change_gate
+from modules.change_gate import ChangeGate, format_gate_stats
+
+
+class CountingModel:
+    def __init__(self):
+        self.calls = 0
+
+    def __call__(self, frame):
+        self.calls += 1
+        return f"result {self.calls}"
+
+
+def scene(value=80, noise=0, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = np.full((240, 320, 3), value, np.int16)
+    frame += rng.integers(-noise, noise + 1, frame.shape) if noise else 0
+    return np.clip(frame, 0, 255).astype(np.uint8)
+
+
+@pytest.fixture(params=["cv2", "numpy"])
+def backend(request, monkeypatch):
+    """Run each test with and without OpenCV"""
+    if request.param == "cv2":
+        pytest.importorskip("cv2")
+    else:
+        monkeypatch.setattr(change_gate, "cv2", None)
+    return request.param
+
+
+class TestChangeGate:
+    """Test the change detector in front of the model"""
+
+    def test_still_scene_reuses_result(self, backend):
+        """Sensor noise on a still scene does not trigger inference"""
+        now = [0.0]
+        gate, model = ChangeGate(clock=lambda: now[0]), CountingModel()
+        results = [gate.run(scene(noise=3, seed=i), model) for i in range(30)]
+        assert model.calls == 1
+        assert set(results) == {"result 1"}
+        assert gate.last_skipped
+
+    def test_scene_change_triggers_inference(self, backend):
+        """Someone walking in front of the camera is detected straight away"""
+        gate, model = ChangeGate(clock=lambda: 0.0), CountingModel()
+        gate.run(scene(), model)
+        frame = scene()
+        frame[60:200, 100:220] = 250
+        assert gate.run(frame, model) == "result 2"
+        assert gate.last_diff > gate.threshold
+
+    def test_slow_drift_is_measured_against_last_inference(self, backend):
+        """Small per-frame changes still add up to a new inference"""
+        gate, model = ChangeGate(threshold=0.03, clock=lambda: 0.0), CountingModel()
+        for value in range(80, 120, 2):
+            gate.run(scene(value), model)
+        assert 1 < model.calls < 20
+
+    def test_max_staleness_forces_refresh(self, backend):
+        """Results are refreshed periodically even on a still scene"""
+        now = [0.0]
+        gate, model = ChangeGate(max_stale=1.0, clock=lambda: now[0]), CountingModel()
+        for _ in range(25):
+            gate.run(scene(), model)
+            now[0] += 0.1
+        assert model.calls == 3
+
+    def test_stats_report_skip_ratio_and_savings(self, backend):
+        """Skip ratio and CPU saved per minute are exposed"""
+        now = [0.0]
+        gate = ChangeGate(clock=lambda: now[0])
+        infer = gate.wrap(CountingModel())
+        for _ in range(10):
+            infer(scene())
+            now[0] += 0.1
+        stats = gate.stats
+        assert stats["frames"] == 10
+        assert stats["skipped"] == 9
+        assert stats["skip_ratio"] == pytest.approx(0.9)
+        assert stats["cpu_saved_s_per_min"] >= 0
+        assert "9/10" in format_gate_stats(stats)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,108 @@
+"""
+Tests for the compact detection-frame representation and its consumers
+Results are faked in the shape ultralytics returns them
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.announcer import Announcer
+from modules.detections import DETECTION, DetectionFrame, LabelTable, draw_detections, label_table
+from modules.event_log import EventLog
+from modules.replay import Result
+from modules.tracker import IoUTracker
+
+NAMES = {0: "person", 2: "car", 56: "chair"}
+
+
+def result(rows):
+    return Result(NAMES, rows)
+
+
+ROWS = [[10, 10, 50, 90, 0.9, 0], [60, 20, 120, 80, 0.6, 56], [0, 0, 30, 30, 0.8, 0]]
+
+
+class TestLabelTable:
+    """Test the interned id -> name table"""
+
+    def test_sparse_ids(self):
+        table = LabelTable(NAMES)
+        assert len(table) == 57 and table.ids["chair"] == 56
+        assert table.lookup(np.array([56, 0, 2], np.uint16)) == ["chair", "person", "car"]
+        assert table.counts([0, 56, 0]) == {"person": 2, "chair": 1}
+
+    def test_one_table_per_names_mapping(self):
+        assert label_table(NAMES) is label_table(NAMES)
+        assert label_table(dict(NAMES)) is not label_table(NAMES)
+
+
+class TestDetectionFrame:
+    """Test building frames and reading their columns"""
+
+    def test_from_results(self):
+        frame = DetectionFrame.from_results(result(ROWS), seq=4)
+        assert frame.data.dtype == DETECTION and len(frame) == 3 and frame.seq == 4
+        assert frame.names() == ["person", "chair", "person"]
+        assert frame.counts() == {"person": 2, "chair": 1}
+        np.testing.assert_allclose(frame.boxes[1], [60, 20, 120, 80])
+        np.testing.assert_allclose(frame.confidences, [0.9, 0.6, 0.8])
+        assert (frame.track_ids == -1).all()
+
+    def test_tracked_results_keep_ids(self):
+        rows = [[10, 10, 50, 90, 7, 0.9, 0], [60, 20, 120, 80, 9, 0.6, 2]]
+        frame = DetectionFrame.from_results(result(rows))
+        assert frame.track_ids.tolist() == [7, 9] and frame.names() == ["person", "car"]
+
+    def test_no_detections(self):
+        frame = DetectionFrame.from_results(result([]))
+        assert len(frame) == 0 and frame.names() == [] and frame.counts() == {}
+
+    def test_from_tracks_and_select(self):
+        tracker = IoUTracker(min_hits=1)
+        detections = DetectionFrame.from_results(result(ROWS))
+        update = tracker.update(detections.boxes, detections.classes, detections.confidences)
+        tracked = DetectionFrame.from_tracks(update.tracks, detections.labels)
+        assert tracked.track_ids.tolist() == [1, 2, 3]
+        people = tracked.select(tracked.classes == 0)
+        assert people.names() == ["person", "person"] and people.track_ids.tolist() == [1, 3]
+
+
+class TestConsumers:
+    """Test the announcer, event log and overlay on a DetectionFrame"""
+
+    def test_announcer_summarises_the_frame(self):
+        spoken = []
+        announcer = Announcer(spoken.append).start()
+        assert announcer.announce_frame(DetectionFrame.from_results(result(ROWS))) == "2 people, chair"
+        assert announcer.announce_frame(DetectionFrame.from_results(result([]))) is None
+        assert announcer.wait_idle()
+        announcer.stop()
+        assert spoken == ["2 people, chair"]
+
+    def test_event_log_maps_label_ids(self, tmp_path):
+        log = EventLog(tmp_path)
+        log.alert("doorbell", t=0.5)  # takes log label id 0
+        log.log_frame(DetectionFrame.from_results(result(ROWS), seq=12), t=1.0)
+        log.flush()
+        rows = log.query(kind="detection")
+        assert [log.labels[i] for i in rows["label"]] == ["person", "chair", "person"]
+        assert rows["frame"].tolist() == [12, 12, 12]
+        assert log.counts() == {"person": 2, "chair": 1}
+
+    def test_overlay(self):
+        pytest.importorskip("cv2")
+        image = np.zeros((128, 128, 3), np.uint8)
+        canvas = draw_detections(image, DetectionFrame.from_results(result(ROWS)))
+        assert canvas.any() and not image.any()
+        assert canvas[10, 30].any()  # top edge of the first box
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
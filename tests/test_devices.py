@@ -0,0 +1,204 @@
+"""
+Tests for the device layer and for running whole modes on replayed input
+Modes run their real loops against fake cameras, microphones, windows and voices
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.audio_bus import AudioBus, FileCapture
+from modules.devices import CAP_PROP_FPS, Devices, FakeCamera, HeadlessDisplay, RecordingSpeaker, ReplayDevices
+from modules.replay import alert_scene, moving_object, register_stubs, speech_scene
+
+SR = 16000
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def replay_env(tmp_path, monkeypatch):
+    """Event log in a temp dir, stub models registered"""
+    monkeypatch.setenv("AURA_EVENT_DIR", str(tmp_path))
+    register_stubs()
+
+
+class TestFakeCamera:
+    """Test replaying frames like a camera"""
+
+    def test_list_plays_once(self):
+        frames = [np.full((4, 4, 3), i, np.uint8) for i in range(3)]
+        cam = FakeCamera(frames, speed=None)
+        read = [cam.read() for _ in range(4)]
+        assert [ok for ok, _ in read] == [True, True, True, False]
+        assert read[1][1][0, 0, 0] == 1 and read[1][1] is not frames[1]
+        assert cam.isOpened() and cam.get(CAP_PROP_FPS) == 30.0
+
+    def test_loop_until_seconds(self):
+        frames = [np.zeros((2, 2, 3), np.uint8)] * 4
+        cam = FakeCamera(frames, fps=10, speed=None, loop=True, seconds=1.5)
+        count = 0
+        while cam.read()[0]:
+            count += 1
+        assert count == 15 == cam.frames_read
+
+    def test_paced_at_speed(self):
+        clock = FakeClock()
+        cam = FakeCamera(moving_object, fps=20, speed=2.0, seconds=1.0, clock=clock, sleep=clock.sleep)
+        while cam.read()[0]:
+            pass
+        assert cam.frames_read == 20
+        assert clock.now == pytest.approx(19 / 40)
+
+    def test_generator_and_release(self):
+        cam = FakeCamera(lambda i: moving_object(i) if i < 2 else None, speed=None)
+        assert cam.read()[0] and cam.read()[0] and not cam.read()[0]
+        cam.release()
+        assert not cam.isOpened() and not cam.read()[0]
+
+
+class TestFileCapture:
+    """Test speed, looping and block streams feeding an AudioBus"""
+
+    def drain(self, capture):
+        bus = AudioBus(capture, samplerate=SR)
+        reader = bus.subscribe()
+        with bus:
+            out = np.concatenate(list(reader))
+        return out
+
+    def test_loop_until_seconds(self):
+        audio = np.arange(SR // 2, dtype=np.float32)
+        out = self.drain(FileCapture(audio, blocksize=1000, loop=True, seconds=1.25))
+        assert len(out) == int(1.25 * SR)
+        np.testing.assert_array_equal(out[SR // 2:SR], audio)
+
+    def test_iterable_of_blocks(self):
+        blocks = (np.full(1600, i, np.float32) for i in range(10))
+        capture = FileCapture(blocks, seconds=0.5)
+        out = self.drain(capture)
+        assert len(out) == 8000 == capture.written and out[-1] == 4
+
+    def test_accelerated_realtime(self):
+        import time
+        started = time.monotonic()
+        self.drain(FileCapture(np.zeros(SR, np.float32), blocksize=1600, realtime=True, speed=10.0))
+        assert 0.08 < time.monotonic() - started < 0.5
+
+
+class TestSinks:
+    """Test the headless window and the recording voice"""
+
+    def test_headless_display(self):
+        display = HeadlessDisplay(keep_last=True, quit_after=2)
+        display.show("a")
+        assert display.poll() == -1
+        display.show("b")
+        assert display.poll() == ord("q") and display.last == "b" and display.shown == 2
+
+    def test_recording_speaker_keeps_recent(self):
+        speak = RecordingSpeaker(keep=2)
+        for text in ("one", "two", "three"):
+            speak(text)
+        assert speak.texts == ["two", "three"] and speak.count == 3
+
+    def test_from_env(self, monkeypatch):
+        for name in ("AURA_REPLAY_VIDEO", "AURA_REPLAY_AUDIO", "AURA_REPLAY_SECONDS"):
+            monkeypatch.delenv(name, raising=False)
+        assert not Devices.from_env().simulated
+        monkeypatch.setenv("AURA_REPLAY_VIDEO", "synthetic")
+        monkeypatch.setenv("AURA_REPLAY_SPEED", "0")
+        monkeypatch.setenv("AURA_REPLAY_SECONDS", "2")
+        devices = Devices.from_env()
+        assert devices.simulated and devices.video is None and devices.speed is None and devices.seconds == 2
+
+
+class TestModesOnReplay:
+    """Test each mode's real run() loop end to end on replayed input"""
+
+    def test_sound_alert(self, replay_env, capsys):
+        from modules import sound_alert
+        devices = ReplayDevices(audio=alert_scene(10), speed=None)
+        sound_alert.run(devices=devices)
+        out = capsys.readouterr().out
+        assert "❌" not in out and "LOUD SOUND DETECTED" in out and "Sound detection stopped" in out
+        assert devices.input_seconds == pytest.approx(10.0)
+
+    def test_live_captions(self, replay_env, capsys):
+        from modules import speech_to_text
+        devices = ReplayDevices(audio=speech_scene(8), speed=None)
+        speech_to_text.run_live(devices=devices, model_name="stub-whisper", adaptive=False)
+        out = capsys.readouterr().out
+        assert "❌" not in out and "📝 hello there" in out and "Live captions stopped" in out
+
+    def test_slow_captions_catch_up(self, replay_env):
+        """A decode slower than the caption step covers everything heard meanwhile"""
+        import time
+        from modules import speech_to_text
+        from modules.model_registry import registry
+        decoded = []
+
+        class SlowWhisper:
+            def transcribe(self, audio, **kwargs):
+                decoded.append(len(audio))
+                time.sleep(0.3)
+                return {"text": " hello", "segments": []}
+
+        registry.register("slow-whisper", SlowWhisper, size_mb=0)
+        devices = ReplayDevices(audio=speech_scene(8), speed=4.0)
+        try:
+            speech_to_text.run_live(devices=devices, model_name="slow-whisper", adaptive=False)
+        finally:
+            registry.evict("slow-whisper")
+        assert 0 < len(decoded) < 10  # one decode per 0.5 s step would be ~15
+
+    def test_object_detection(self, replay_env, capsys):
+        pytest.importorskip("cv2")
+        from modules import object_detection
+        devices = ReplayDevices(speed=None, seconds=2)
+        stats = object_detection.run(devices=devices, model_name="stub-yolo", adaptive=False)
+        out = capsys.readouterr().out
+        assert "❌" not in out and stats["inference"]["count"] > 0
+        assert 0 < devices.frames_shown <= 60 and devices.cameras[0].frames_read == 60
+
+    def test_voice_object_detection(self, replay_env, capsys):
+        pytest.importorskip("cv2")
+        from modules import voice_object_detection
+        devices = ReplayDevices(speed=None, seconds=2)
+        voice_object_detection.run(devices=devices, model_name="stub-yolo", adaptive=False)
+        out = capsys.readouterr().out
+        assert "❌" not in out and "🎯 Detected: person" in out
+        assert devices.frames_shown == 60 and "person" in devices.spoken
+
+    def test_adaptive_voice_object_detection(self, replay_env, capsys, monkeypatch):
+        """Over budget, the quality ladder's stride widens the gap between detections"""
+        pytest.importorskip("cv2")
+        from modules import quality, voice_object_detection
+        monkeypatch.setattr(quality, "VISION_LEVELS", (
+            quality.QualityLevel("n-320/3", "stub-yolo", imgsz=320, stride=3),
+            quality.QualityLevel("n-640", "stub-yolo", imgsz=640),
+        ))
+        devices = ReplayDevices(speed=None, seconds=2)
+        voice_object_detection.run(devices=devices, adaptive=True, target_ms=0.001, change_threshold=-1)
+        out = capsys.readouterr().out
+        assert "❌" not in out and "🎯 Detected: person" in out
+        assert "voice: n-640 → n-320/3" in out and devices.frames_shown == 60
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
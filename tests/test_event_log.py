@@ -0,0 +1,183 @@
+"""
+Tests for the on-disk event log
+Every log lives in pytest's tmp_path; timestamps are passed in explicitly
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.event_log import RECORD, EventLog, open_log
+
+BOX = np.array([[10, 20, 110, 220]], np.float32)
+
+
+def fill(log, seconds, fps=30, labels=("person", "chair")):
+    """One detection per label per frame, ``fps`` frames a second from t=0"""
+    boxes = np.repeat(BOX, len(labels), axis=0)
+    for frame in range(int(seconds * fps)):
+        log.detections(labels, [0.9] * len(labels), boxes, frame=frame, t=frame / fps)
+
+
+class TestEventLog:
+    """Test writing, reopening and querying the log"""
+
+    def test_round_trip_of_each_kind(self, tmp_path):
+        log = EventLog(tmp_path)
+        log.detections(["person", "dog"], [0.9, 0.5], np.repeat(BOX, 2, axis=0), frame=7, t=1.0)
+        log.alert("doorbell", confidence=0.8, level_db=-12.5, t=2.0)
+        log.transcript("hello there", duration=1.5, t=3.0)
+        assert log.flush() == 4
+
+        rows = log.query()
+        assert rows.dtype == RECORD and rows["t"].tolist() == [1.0, 1.0, 2.0, 3.0]
+        assert [log.labels[i] for i in log.query(kind="detection")["label"]] == ["person", "dog"]
+        assert rows["frame"][0] == 7 and rows["box"][0].tolist() == BOX[0].tolist()
+        (alert,) = log.query(kind="alert")
+        assert log.labels[alert["label"]] == "doorbell" and alert["value"] == pytest.approx(-12.5)
+        assert log.transcripts() == [(3.0, "hello there")]
+
+    def test_time_range_and_label_queries(self, tmp_path):
+        log = EventLog(tmp_path)
+        fill(log, seconds=10)
+        log.flush()
+        rows = log.query(2.0, 3.0)
+        assert len(rows) == 60 and rows["t"].min() >= 2.0 and rows["t"].max() < 3.0
+        assert len(log.query(2.0, 3.0, labels="chair")) == 30
+        assert len(log.query(labels="sofa")) == 0
+        assert log.counts(0, 1) == {"person": 30, "chair": 30}
+
+    def test_reopen_keeps_labels_and_appends(self, tmp_path):
+        with EventLog(tmp_path) as log:
+            log.transcript("first", t=1.0)
+            log.detections(["cat"], [0.7], BOX, t=1.5)
+        log = EventLog(tmp_path)
+        assert log.count == 2 and log.labels == ["cat"]
+        log.detections(["cat"], [0.6], BOX, t=2.0)
+        log.transcript("second", t=2.5)
+        log.stop()
+        assert len(log.segments) == 1
+        assert EventLog(tmp_path).transcripts() == [(1.0, "first"), (2.5, "second")]
+
+    def test_query_before_write_after_reopen(self, tmp_path):
+        with EventLog(tmp_path) as log:
+            log.alert("alarm", t=1.0)
+        log = EventLog(tmp_path)
+        assert len(log.query()) == 1  # maps the columns read-only
+        log.alert("doorbell", t=2.0)
+        assert log.flush() == 1
+        assert [log.labels[i] for i in log.query(kind="alert")["label"]] == ["alarm", "doorbell"]
+
+    def test_failed_flush_keeps_events(self, tmp_path, monkeypatch):
+        log = EventLog(tmp_path)
+        log.alert("alarm", t=1.0)
+        write = log._write
+
+        def fail(rows, blob):
+            monkeypatch.setattr(log, "_write", write)
+            raise OSError("disk full")
+
+        monkeypatch.setattr(log, "_write", fail)
+        with pytest.raises(OSError):
+            log.flush()
+        log.transcript("later", t=2.0)
+        assert log.flush() == 2 and log.transcripts() == [(2.0, "later")]
+
+    def test_segments_rotate_and_oldest_are_dropped(self, tmp_path):
+        log = EventLog(tmp_path, segment_bytes=RECORD.itemsize * 100, max_bytes=RECORD.itemsize * 300)
+        fill(log, seconds=20)  # 1200 events, 12 segments worth
+        log.flush()
+        assert len(log.segments) == 3 and log.dropped_segments == 9
+        assert len(list(tmp_path.glob("seg-*"))) == 3
+        rows = log.query()
+        assert len(rows) == 300 and rows["t"][0] == pytest.approx(900 / 2 / 30)
+
+    def test_late_events_are_still_found(self, tmp_path):
+        log = EventLog(tmp_path)
+        log.alert("knock", t=5.0)
+        log.flush()
+        log.alert("siren", t=4.0)
+        log.flush()
+        assert not log.segments[0].ordered
+        assert log.query(3.5, 4.5)["t"].tolist() == [4.0]
+        assert log.query()["t"].tolist() == [4.0, 5.0]
+
+    def test_background_flush(self, tmp_path):
+        log = EventLog(tmp_path, flush_interval=0.01).start()
+        log.alert("alarm", t=1.0)
+        deadline = time.monotonic() + 2.0
+        while log.count == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        log.stop()
+        assert log.count == 1
+
+    def test_disabled_log(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("AURA_EVENT_LOG", "0")
+        log = open_log(tmp_path)
+        log.detections(["person"], [0.9], BOX)
+        log.transcript("nothing")
+        log.stop()
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestModeLogging:
+    """Test that modes write their events while running"""
+
+    def test_sound_alert_logs_labelled_alerts(self, tmp_path, monkeypatch, capsys):
+        from modules import sound_alert
+        from modules.devices import ReplayDevices
+        from modules.replay import alert_scene
+        monkeypatch.setenv("AURA_EVENT_DIR", str(tmp_path))
+        sound_alert.run(devices=ReplayDevices(audio=alert_scene(10), speed=None))
+        assert "❌" not in capsys.readouterr().out
+        log = EventLog(tmp_path)
+        alerts = log.query(kind="alert")
+        assert len(alerts) > 0 and all(log.labels[i] for i in alerts["label"])
+
+    def test_sound_at_the_end_is_still_labelled(self, tmp_path, monkeypatch, capsys):
+        """Alerts whose analysis window runs past the end of the input are flushed"""
+        from modules import sound_alert, synthetic_audio
+        from modules.devices import ReplayDevices
+        monkeypatch.setenv("AURA_EVENT_DIR", str(tmp_path))
+        audio = synthetic_audio.background(2.0, 16000)
+        bell = synthetic_audio.doorbell()[:4800]  # ends 0.3 s after onset, short of the 0.8 s window
+        audio[-len(bell):] += bell
+        sound_alert.run(devices=ReplayDevices(audio=audio, speed=None))
+        out = capsys.readouterr().out
+        assert out.count("LOUD SOUND DETECTED") == out.count("↳") > 0
+        assert len(EventLog(tmp_path).query(kind="alert")) == out.count("↳")
+
+    def test_still_scene_is_logged_once_per_inference(self, tmp_path, monkeypatch, capsys):
+        """Frames the change gate skips do not repeat the detections in the log"""
+        pytest.importorskip("cv2")
+        from modules import object_detection
+        from modules.devices import ReplayDevices
+        from modules.replay import moving_object, register_stubs
+        monkeypatch.setenv("AURA_EVENT_DIR", str(tmp_path))
+        register_stubs()
+        devices = ReplayDevices(video=[moving_object(0)] * 30, speed=4.0)  # paced, so most frames get rendered
+        object_detection.run(devices=devices, model_name="stub-yolo", adaptive=False, max_stale=60)
+        assert "❌" not in capsys.readouterr().out
+        assert devices.frames_shown > 1
+        assert len(EventLog(tmp_path).query(kind="detection")) == 1
+
+    def test_speech_to_text_logs_its_transcript(self, tmp_path, monkeypatch, capsys):
+        from modules import speech_to_text
+        from modules.devices import ReplayDevices
+        from modules.replay import register_stubs, speech_scene
+        monkeypatch.setenv("AURA_EVENT_DIR", str(tmp_path))
+        register_stubs()
+        speech_to_text.run(devices=ReplayDevices(audio=speech_scene(6), speed=None), model_name="stub-whisper")
+        assert "❌" not in capsys.readouterr().out
+        assert [text for _, text in EventLog(tmp_path).transcripts()] == ["hello there"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
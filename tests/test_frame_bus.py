@@ -0,0 +1,127 @@
+"""
+Tests for the shared-memory camera frame bus
+Frame lists and a short generated video stand in for the webcam
+"""
+
+import multiprocessing as mp
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.frame_bus import FrameBus, VideoSource
+
+SHAPE = (48, 64, 3)
+
+
+def numbered(i):
+    return np.full(SHAPE, i % 256, np.uint8)
+
+
+@pytest.fixture
+def bus():
+    bus = FrameBus(SHAPE, slots=4)
+    yield bus
+    bus.release()
+
+
+def checksum_frames(spec, count, results):
+    """Worker process: attach by name and read frames in order"""
+    bus = FrameBus.attach(**spec)
+    reader = bus.subscribe()
+    reader.last_seq = -1
+    seen = []
+    for _ in range(count):
+        frame = reader.next(timeout=5)
+        seen.append((frame.seq, int(frame.image[0, 0, 0])))
+    results.put(seen)
+    bus.release()
+
+
+class TestFrameBus:
+    """Test slots, sequence numbers and reader cursors"""
+
+    def test_publish_and_get_by_sequence(self, bus):
+        for i in range(3):
+            assert bus.publish(numbered(i)) == i
+        frame = bus.get(1)
+        assert frame.seq == 1 and frame.image[0, 0, 0] == 1
+        assert not frame.image.flags.writeable
+        assert bus.latest().seq == 2
+
+    def test_views_alias_shared_memory(self, bus):
+        bus.publish(numbered(7))
+        a, b = bus.get(0), bus.get(0)
+        assert np.shares_memory(a.image, b.image)
+
+    def test_reused_slot_invalidates_old_frame(self, bus):
+        bus.publish(numbered(0))
+        frame = bus.get(0)
+        for i in range(1, 5):
+            bus.publish(numbered(i))
+        assert not bus.valid(frame)
+        assert bus.get(0) is None
+
+    def test_latest_reader_skips_and_counts_drops(self, bus):
+        reader = bus.subscribe()
+        for i in range(3):
+            bus.publish(numbered(i))
+        assert reader.latest(timeout=0).seq == 2
+        assert reader.dropped == 2
+        assert reader.latest(timeout=0) is None
+
+    def test_next_reader_detects_overrun(self, bus):
+        reader = bus.subscribe()
+        for i in range(6):
+            bus.publish(numbered(i))
+        assert [reader.next(timeout=0).seq for _ in range(4)] == [2, 3, 4, 5]
+        assert reader.overruns == 1 and reader.dropped == 2
+
+    def test_frame_list_source_closes_bus(self):
+        source = VideoSource([numbered(i) for i in range(10)], realtime=False)
+        bus = source.open_bus(slots=16)
+        reader = bus.subscribe()
+        try:
+            with bus:
+                seqs = [frame.seq for frame in reader]
+            assert seqs == list(range(10))
+            assert bus.closed
+        finally:
+            bus.release()
+
+    def test_worker_process_reads_without_pickling_frames(self, bus):
+        ctx = mp.get_context("spawn")
+        results = ctx.Queue()
+        worker = ctx.Process(target=checksum_frames, args=(bus.spec, 3, results))
+        worker.start()
+        for i in range(3):
+            bus.publish(numbered(i + 10))
+        seen = results.get(timeout=30)
+        worker.join(timeout=10)
+        assert seen == [(0, 10), (1, 11), (2, 12)]
+
+    def test_video_file_decodes_into_slots(self, tmp_path):
+        cv2 = pytest.importorskip("cv2")
+        path = tmp_path / "clip.avi"
+        writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+        for i in range(12):
+            writer.write(np.full(SHAPE, i * 20, np.uint8))
+        writer.release()
+        bus = VideoSource(str(path), realtime=False).open_bus(slots=32)
+        reader = bus.subscribe()
+        try:
+            with bus:
+                frames = list(reader)
+            assert len(frames) == 12
+            assert abs(int(frames[5].image.mean()) - 100) < 5
+        finally:
+            bus.release()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
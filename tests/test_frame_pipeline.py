@@ -0,0 +1,136 @@
+"""
+Tests for the threaded object detection pipeline
+Uses fake cameras and models so no webcam or YOLO weights are needed
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.frame_pipeline import DetectionPipeline, LatestSlot, format_stats
+
+
+class FakeCamera:
+    """cv2.VideoCapture stand-in that yields numbered frames"""
+
+    def __init__(self, count, interval=0.0):
+        self.count = count
+        self.interval = interval
+        self.index = 0
+
+    def read(self):
+        if self.index >= self.count:
+            return False, None
+        time.sleep(self.interval)
+        frame = np.full((4, 4, 3), self.index, dtype=np.uint8)
+        self.index += 1
+        return True, frame
+
+
+def drain(pipeline):
+    """Render loop without a window"""
+    seen = []
+    while True:
+        packet = pipeline.next_result()
+        if packet is None:
+            if pipeline.done:
+                break
+            continue
+        with pipeline.timed("render"):
+            seen.append(packet.seq)
+        pipeline.rendered(packet)
+    pipeline.stop()
+    return seen
+
+
+class TestLatestSlot:
+    """Test the latest-wins handoff"""
+
+    def test_newer_item_replaces_unread_one(self):
+        """Stale items are dropped, not queued"""
+        slot = LatestSlot()
+        slot.put(1)
+        slot.put(2)
+        assert slot.get(timeout=0) == 2
+        assert slot.dropped == 1
+        assert slot.get(timeout=0) is None
+
+    def test_close_wakes_waiting_consumer(self):
+        """A blocked consumer returns once the producer is finished"""
+        slot = LatestSlot()
+        got = []
+        consumer = threading.Thread(target=lambda: got.append(slot.get(timeout=5)))
+        consumer.start()
+        slot.close()
+        consumer.join(timeout=1)
+        assert got == [None]
+
+
+class TestDetectionPipeline:
+    """Test the capture/inference/render stages"""
+
+    def test_slow_inference_drops_stale_frames(self):
+        """A slow model always works on the newest frame"""
+        def slow_model(frame):
+            time.sleep(0.02)
+            return int(frame[0, 0, 0])
+
+        pipeline = DetectionPipeline(FakeCamera(60, interval=0.002), slow_model).start()
+        seen = drain(pipeline)
+        assert seen == sorted(seen)
+        assert len(seen) < 60
+        assert pipeline.frames.dropped > 0
+        assert pipeline.eof
+
+    def test_every_frame_processed_when_model_keeps_up(self):
+        """Nothing is dropped when inference is faster than capture"""
+        pipeline = DetectionPipeline(FakeCamera(20, interval=0.005), lambda f: None).start()
+        assert drain(pipeline) == list(range(20))
+
+    def test_stats_report_each_stage(self):
+        """Per-stage timings and FPS are exposed"""
+        pipeline = DetectionPipeline(FakeCamera(10, interval=0.001), lambda f: time.sleep(0.002)).start()
+        drain(pipeline)
+        stats = pipeline.stats()
+        for stage in DetectionPipeline.STAGES:
+            assert stats[stage]["count"] > 0
+        assert stats["inference"]["mean_ms"] >= 2.0
+        assert stats["end_to_end"]["fps"] > 0
+        assert "inference" in format_stats(stats)
+
+    def test_inference_errors_are_surfaced(self):
+        """A crashing model stops the pipeline and keeps the error"""
+        def broken(frame):
+            raise RuntimeError("model crashed")
+
+        pipeline = DetectionPipeline(FakeCamera(5), broken).start()
+        drain(pipeline)
+        assert isinstance(pipeline.error, RuntimeError)
+
+    def test_runs_from_video_file(self, tmp_path):
+        """A recorded clip can stand in for the webcam"""
+        cv2 = pytest.importorskip("cv2")
+        path = str(tmp_path / "clip.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 30, (64, 48))
+        for i in range(15):
+            writer.write(np.full((48, 64, 3), i * 10, dtype=np.uint8))
+        writer.release()
+
+        cap = cv2.VideoCapture(path)
+        pipeline = DetectionPipeline(cap, lambda f: f.shape).start()
+        seen = drain(pipeline)
+        cap.release()
+        assert pipeline.eof
+        assert seen and seen == sorted(seen)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,119 @@
+"""
+Tests for the shared inference configuration of the vision modes
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules import inference_config
+from modules.inference_config import (
+    PRESETS, ConfiguredDetector, InferenceConfig, Letterboxer, center_roi, to_frame_coords,
+)
+from modules.replay import Result
+
+NAMES = {0: "person", 1: "bicycle", 2: "car", 56: "chair"}
+
+
+class FakeYolo:
+    """Finds one 'person' filling the middle half of whatever it is shown"""
+    names = NAMES
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, image, **kwargs):
+        self.calls.append((image.shape, kwargs))
+        h, w = image.shape[:2]
+        return [Result(NAMES, [[w / 4, h / 4, 3 * w / 4, 3 * h / 4, 0.9, 0]], image)]
+
+
+class TestInferenceConfig:
+    """Test settings and environment overrides"""
+
+    def test_defaults_match_plain_yolo(self):
+        config = InferenceConfig.from_env({})
+        assert config == PRESETS["accurate"]
+        assert config.predict_kwargs(NAMES)["imgsz"] == 640
+        assert config.predict_kwargs(NAMES)["classes"] is None
+
+    def test_environment_overrides(self):
+        env = {"AURA_PRESET": "fast", "AURA_CLASSES": "person, car", "AURA_CONF": "0.5"}
+        config = InferenceConfig.from_env(env)
+        assert config.imgsz == 320
+        assert config.conf == 0.5
+        assert config.class_ids(NAMES) == [0, 2]
+
+    def test_unknown_class_is_rejected(self):
+        with pytest.raises(ValueError):
+            InferenceConfig(classes=("unicorn",)).class_ids(NAMES)
+
+
+@pytest.fixture(params=["cv2", "numpy"])
+def backend(request, monkeypatch):
+    if request.param == "cv2":
+        pytest.importorskip("cv2")
+    else:
+        monkeypatch.setattr(inference_config, "cv2", None)
+    return request.param
+
+
+class TestGeometry:
+    """Test cropping, letterboxing and mapping boxes back"""
+
+    def test_letterbox_reuses_canvas(self, backend):
+        """Same-shape frames are resized into the same buffer"""
+        letterbox = Letterboxer(320)
+        frame = np.full((480, 640, 3), 200, np.uint8)
+        first = letterbox(frame)
+        assert first.shape == (320, 320, 3)
+        assert letterbox.scale == 0.5 and letterbox.pad == (0, 40)
+        assert first[0, 0, 0] == 114 and first[160, 160, 0] == 200
+        assert letterbox(frame) is first
+
+    def test_center_roi(self):
+        frame = np.zeros((100, 200, 3), np.uint8)
+        view, x0, y0 = center_roi(frame, 0.5)
+        assert view.shape == (50, 100, 3) and (x0, y0) == (50, 25)
+        assert center_roi(frame, 1.0)[0] is frame
+
+    def test_round_trip_to_frame_coords(self):
+        boxes = np.array([[10.0, 50.0, 110.0, 150.0]])
+        to_frame_coords(boxes, scale=0.5, pad=(0, 40), offset=(64, 48))
+        np.testing.assert_allclose(boxes, [[84, 68, 284, 268]])
+
+
+class TestConfiguredDetector:
+    """Test the detector wrapper used by both vision modes"""
+
+    def test_plain_config_passes_frame_through(self):
+        model = FakeYolo()
+        frame = np.zeros((480, 640, 3), np.uint8)
+        result = ConfiguredDetector(model)(frame)[0]
+        assert model.calls[0][0] == frame.shape
+        assert model.calls[0][1]["verbose"] is False
+        assert result.orig_img is frame
+
+    def test_roi_and_letterbox_results_are_in_frame_coords(self, backend):
+        """Downstream code sees full-frame boxes whatever the model saw"""
+        model = FakeYolo()
+        config = InferenceConfig(imgsz=320, roi=0.5, letterbox=True, classes=("person",))
+        frame = np.zeros((480, 640, 3), np.uint8)
+        result = ConfiguredDetector(model, config)(frame)[0]
+        shape, kwargs = model.calls[0]
+        assert shape == (320, 320, 3)
+        assert kwargs["classes"] == [0]
+        assert result.orig_img is frame
+        # middle half of the padded 320x320 input, shifted back by the
+        # 40px letterbox padding and the (160, 120) crop offset
+        np.testing.assert_allclose(result.boxes.data[0, :4], [240, 160, 400, 320], atol=1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
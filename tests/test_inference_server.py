@@ -0,0 +1,95 @@
+"""
+Tests for the multi-process inference server
+A slow fake detector stands in for YOLO; workers are real spawned processes
+"""
+
+import sys
+import time
+from functools import partial
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.frame_bus import FrameBus
+from modules.inference_server import InferenceServer
+from modules.replay import Result
+
+SHAPE = (48, 64, 3)
+
+
+class SlowYolo:
+    """Reports one box per frame whose confidence is the frame's pixel value / 255"""
+    names = {0: "person"}
+
+    def __init__(self, delay=0.02):
+        self.delay = delay
+
+    def __call__(self, images, **kwargs):
+        images = images if isinstance(images, list) else [images]
+        time.sleep(self.delay)
+        return [Result(self.names, [[1.0, 2.0, 3.0, 4.0, image[0, 0, 0] / 255, 0]], image) for image in images]
+
+
+class BrokenYolo(SlowYolo):
+    def __call__(self, images, **kwargs):
+        raise ValueError("bad weights")
+
+
+@pytest.fixture
+def bus():
+    bus = FrameBus(SHAPE, slots=16)
+    yield bus
+    bus.release()
+
+
+def publish(bus, i):
+    return bus.publish(np.full(SHAPE, i * 10, np.uint8))
+
+
+class TestInferenceServer:
+    """Test ordering, adaptive batching and worker failures"""
+
+    def test_results_come_back_in_frame_order(self, bus):
+        with InferenceServer(bus, workers=2, model=partial(SlowYolo, 0.01), max_batch=2) as server:
+            for i in range(12):
+                server.submit(publish(bus, i))
+            results = server.ready() + server.drain(timeout=30)
+        assert [det.seq for det in results] == list(range(12))
+        assert [round(float(det.conf[0]) * 255) for det in results] == [i * 10 for i in range(12)]
+        assert set(server.per_worker) == {0, 1}
+        assert results[0].boxes.shape == (1, 4) and not any(det.stale for det in results)
+
+    def test_backlog_is_batched_and_idle_frames_are_not(self, bus):
+        with InferenceServer(bus, workers=1, model=partial(SlowYolo, 0.05), max_batch=4) as server:
+            for i in range(8):
+                server.submit(publish(bus, i))
+            server.drain(timeout=30)
+            backlog = dict(server.batch_sizes)
+            server.batch_sizes.clear()
+            for i in range(8, 11):
+                server.submit(publish(bus, i))
+                server.drain(timeout=30)
+        assert max(backlog) > 1
+        assert dict(server.batch_sizes) == {1: 3}
+
+    def test_non_blocking_submit_drops_when_full(self, bus):
+        with InferenceServer(bus, workers=1, model=partial(SlowYolo, 0.2), max_in_flight=1) as server:
+            assert server.submit(publish(bus, 0), block=False)
+            assert not server.submit(publish(bus, 1), block=False)
+            assert len(server.drain(timeout=30)) == 1
+        assert server.dropped == 1
+
+    def test_worker_error_is_raised(self, bus):
+        with InferenceServer(bus, workers=1, model=BrokenYolo) as server:
+            server.submit(publish(bus, 0))
+            with pytest.raises(RuntimeError, match="bad weights"):
+                server.drain(timeout=30)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
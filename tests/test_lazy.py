@@ -0,0 +1,61 @@
+"""
+Tests for capability probing and lazy module loading
+Startup must not import the heavy stacks behind the assistive modes
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.lazy import has_modules, lazy_import
+
+HEAVY = ("cv2", "numpy", "torch", "whisper", "ultralytics", "sounddevice", "pyttsx3")
+
+
+class TestCapabilities:
+    """Test find_spec-based HAS_* probing"""
+
+    def test_installed_and_missing_packages(self):
+        assert has_modules("json", "email.mime")
+        assert not has_modules("json", "aura_no_such_package")
+        assert not has_modules("aura_no_such_package.sub")
+
+    def test_blocked_module_counts_as_missing(self):
+        with patch.dict("sys.modules", {"sounddevice": None}):
+            assert not has_modules("sounddevice")
+
+    def test_mode_modules_import_no_heavy_packages(self):
+        code = ("import sys; import modules.speech_to_text, modules.sound_alert, "
+                "modules.object_detection, modules.voice_object_detection; "
+                f"print(','.join(m for m in {HEAVY!r} if m in sys.modules))")
+        out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        assert out.stdout.strip() == ""
+
+
+class TestLazyImport:
+    """Test that modules run only when first used"""
+
+    def test_module_body_runs_on_first_attribute(self, tmp_path, monkeypatch):
+        (tmp_path / "aura_lazy_probe.py").write_text("import sys\nsys.aura_probe_runs = getattr(sys, 'aura_probe_runs', 0) + 1\nVALUE = 42\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "aura_lazy_probe", raising=False)
+        module = lazy_import("aura_lazy_probe")
+        assert getattr(sys, "aura_probe_runs", 0) == 0
+        assert module.VALUE == 42
+        assert sys.aura_probe_runs == 1
+        del sys.aura_probe_runs
+
+    def test_missing_module_raises_immediately(self):
+        with pytest.raises(ImportError):
+            lazy_import("aura_no_such_package")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,92 @@
+"""
+Tests for the continuous loud-sound monitor (visual alerts for deaf users)
+Synthetic buffers are pushed through the same callback the microphone uses
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.loudness import LoudnessMonitor
+
+SR = 16000
+
+
+def feed(monitor, audio, blocksize=160):
+    """Push audio through the sounddevice-style callback in small blocks"""
+    for start in range(0, len(audio), blocksize):
+        monitor.callback(audio[start:start + blocksize, None])
+    events = []
+    while not monitor.alerts.empty():
+        events.append(monitor.alerts.get())
+    return events
+
+
+def tone(seconds, amplitude, freq=1000.0):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amplitude * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def silence(seconds):
+    return np.zeros(int(seconds * SR), np.float32)
+
+
+class TestLoudnessMonitor:
+    """Test level tracking, debouncing and alert latency"""
+
+    def test_quiet_room_never_alerts(self):
+        rng = np.random.default_rng(0)
+        assert feed(LoudnessMonitor(), rng.normal(0, 0.01, 5 * SR).astype(np.float32)) == []
+
+    def test_short_loud_event_is_caught(self):
+        """A 40 ms bang would be averaged away in a one-second block"""
+        monitor = LoudnessMonitor()
+        events = feed(monitor, np.concatenate([silence(1.0), tone(0.04, 0.5), silence(1.0)]))
+        assert len(events) == 1
+        assert events[0].onset == pytest.approx(1.0, abs=0.011)
+
+    def test_event_straddling_blocks_is_caught(self):
+        """Odd block sizes that split hops do not lose the event"""
+        monitor = LoudnessMonitor()
+        audio = np.concatenate([silence(0.995), tone(0.03, 0.5), silence(0.5)])
+        assert len(feed(monitor, audio, blocksize=1000)) == 1
+
+    def test_alert_latency_is_tens_of_ms(self):
+        monitor = LoudnessMonitor()
+        event, = feed(monitor, np.concatenate([silence(0.5), tone(0.5, 0.3)]))
+        assert event.detected - 0.5 < 0.05
+        assert event.latency < 0.05
+
+    def test_single_hop_click_is_debounced(self):
+        """One 5 ms tick below the peak threshold does not alert"""
+        monitor = LoudnessMonitor(min_hops=3)
+        audio = np.concatenate([silence(0.5), tone(0.005, 0.3), silence(0.5)])
+        assert feed(monitor, audio) == []
+
+    def test_continuous_alarm_repeats_but_does_not_flood(self):
+        """A 5 s alarm alerts every `repeat` seconds, not every hop"""
+        monitor = LoudnessMonitor(repeat=2.0)
+        events = feed(monitor, tone(5.0, 0.5))
+        assert len(events) == 3
+
+    def test_separate_events_each_alert(self):
+        monitor = LoudnessMonitor(hold=0.2)
+        bang = np.concatenate([tone(0.05, 0.5), silence(0.5)])
+        assert len(feed(monitor, np.tile(bang, 4))) == 4
+
+    def test_threshold_matches_old_norm_rule(self):
+        """One second at the old L2-norm limit of 10 sits at -22 dBFS"""
+        audio = np.full(SR, 10 / np.sqrt(SR), np.float32)
+        monitor = LoudnessMonitor()
+        monitor.process(audio)
+        assert monitor.rms_db == pytest.approx(-22.0, abs=0.1)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,138 @@
+"""
+Tests for incremental Whisper features and caption context carry-over
+Feature values are checked against a from-scratch log-mel; decoding is faked
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.mel_cache import HOP, MelCache, log_mel, mel_filters
+from modules.ring_buffer import AudioRingBuffer
+from modules.streaming_stt import StreamingTranscriber, drop_repeated_words
+from modules.synthetic_audio import voice
+
+SR = 16000
+
+
+def speech(seconds, seed=0):
+    noise = np.random.default_rng(seed).normal(0, 0.01, int(seconds * SR)).astype(np.float32)
+    return voice(seconds) + noise
+
+
+def stream(audio, seconds=30, blocks=100):
+    ring = AudioRingBuffer(seconds * SR)
+    cache = MelCache(ring)
+    for block in np.array_split(audio, blocks):
+        ring.write(block)
+        cache.update()
+    return ring, cache
+
+
+class PromptedWhisper:
+    """Returns scripted captions and records the prompts it was given"""
+
+    def __init__(self, texts):
+        self.texts = iter(texts)
+        self.prompts = []
+
+    def transcribe(self, audio, initial_prompt=None, **kwargs):
+        self.prompts.append(initial_prompt)
+        return {"text": next(self.texts)}
+
+
+class TestMelCache:
+    """Test that cached features match a full recompute"""
+
+    def test_filter_bank_shape(self):
+        bank = mel_filters(80)
+        assert bank.shape == (80, 201)
+        assert (bank >= 0).all() and (bank.sum(axis=1) > 0).all()
+
+    def test_matches_full_log_mel_from_stream_start(self):
+        audio = speech(4.0)
+        _, cache = stream(audio)
+        np.testing.assert_allclose(cache.window(0, 3 * SR), log_mel(audio[:3 * SR]), atol=1e-5)
+
+    def test_mid_stream_window_differs_only_at_its_first_frames(self):
+        audio = speech(6.0)
+        _, cache = stream(audio)
+        start, end = 2 * SR, 5 * SR + 77
+        got, want = cache.window(start, end), log_mel(audio[start:end])
+        assert got.shape == want.shape == (80, (end - start) // HOP)
+        np.testing.assert_allclose(got[:, 2:], want[:, 2:], atol=1e-5)
+
+    def test_overlapping_windows_reuse_frames(self):
+        audio = speech(10.0)
+        ring = AudioRingBuffer(30 * SR)
+        cache = MelCache(ring)
+        served = 0
+        for end in range(SR // 2, 10 * SR + 1, SR // 2):
+            ring.write(audio[end - SR // 2:end])
+            served += cache.window(max(0, end - 5 * SR), end).shape[1]
+        assert cache.computed <= 10 * SR // HOP
+        assert cache.stats["reused"] > 0.9 * served
+
+    def test_ring_wraparound(self):
+        audio = speech(12.0)
+        _, cache = stream(audio, seconds=5, blocks=240)
+        start, end = 8 * SR, 12 * SR
+        np.testing.assert_allclose(cache.window(start, end)[:, 2:], log_mel(audio[start:end])[:, 2:], atol=1e-5)
+
+
+class TestContextCarryOver:
+    """Test prompting with the previous caption and dropping repeated words"""
+
+    @pytest.mark.parametrize("previous, text, expected", [
+        ("turn left at the corner", "the corner then go straight", "then go straight"),
+        ("Hello there.", "there, how are you", "how are you"),
+        ("hello there", "hello there", "hello there"),
+        ("", "first words", "first words"),
+        ("good morning", "see you later", "see you later"),
+    ])
+    def test_drop_repeated_words(self, previous, text, expected):
+        assert drop_repeated_words(previous, text) == expected
+
+    def test_previous_final_captions_are_the_prompt(self):
+        model = PromptedWhisper(["one two", "one two three", "three four", "three four five"])
+        stt = StreamingTranscriber(model, window=1.0, step=0.5, overlap=0.5)
+        captions = []
+        for _ in range(4):
+            stt.callback(np.zeros(SR // 2, np.float32))
+            captions.append(stt.poll())
+        assert model.prompts == [None, None, "one two three", "one two three four"]
+        assert [c.text for c in captions] == ["one two", "one two three", "four", "five"]
+
+    def test_context_can_be_turned_off(self):
+        model = PromptedWhisper(["a b", "a b c", "c d"])
+        stt = StreamingTranscriber(model, window=1.0, step=0.5, overlap=0.5, context=False)
+        for _ in range(3):
+            stt.callback(np.zeros(SR // 2, np.float32))
+            caption = stt.poll()
+        assert model.prompts == [None, None, None] and caption.text == "c d"
+
+    def test_windows_decode_from_cached_features(self):
+        decoded = []
+
+        def decode(model, mel, prompt):
+            decoded.append((mel.shape, prompt))
+            return "hello"
+
+        stt = StreamingTranscriber(object(), window=2.0, step=0.5, overlap=0.5)
+        stt.mel_cache = MelCache(stt.buffer, decode=decode)
+        for block in np.split(speech(3.0), 6):
+            stt.callback(block)
+            stt.poll()
+        assert [shape for shape, _ in decoded] == [(80, n * 50) for n in (1, 2, 3, 4, 2, 3)]
+        assert decoded[4][1] == "hello"
+        assert stt.mel_cache.computed <= 3 * SR // HOP
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,118 @@
+"""
+Tests for the metrics layer and its exports
+Uses private registries so the process-wide one is left alone
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.metrics import NULL, MetricsRegistry, metrics
+from modules.streaming_stt import StreamingTranscriber
+
+
+class EchoWhisper:
+    def transcribe(self, audio, **kwargs):
+        return {"text": "hi"}
+
+
+class TestMetrics:
+    """Test timers, counters, histograms and their exports"""
+
+    def test_same_name_and_labels_share_a_metric(self):
+        reg = MetricsRegistry()
+        a = reg.counter("alerts", label="knock")
+        assert reg.counter("alerts", label="knock") is a
+        assert reg.counter("alerts", label="siren") is not a
+
+    def test_histogram_buckets_and_quantiles(self):
+        reg = MetricsRegistry()
+        hist = reg.histogram("latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 2.0):
+            hist.observe(value)
+        assert list(hist.counts) == [2, 1, 1]
+        assert hist.count == 4 and hist.sum == pytest.approx(2.65)
+        assert hist.quantile(0.5) == 0.5
+
+    def test_quantiles_use_a_fixed_window(self):
+        hist = MetricsRegistry().histogram("x")
+        for value in range(1000):
+            hist.observe(float(value))
+        assert hist.quantile(0.0) == 1000 - len(hist.recent)
+
+    def test_timer_context_and_decorator(self):
+        reg = MetricsRegistry()
+        timer = reg.timer("stage_seconds", stage="inference")
+        with timer.time():
+            pass
+
+        @timer
+        def work(x):
+            return x * 2
+
+        assert work(3) == 6
+        assert timer.count == 2 and timer.sum >= 0
+
+    def test_prometheus_text(self):
+        reg = MetricsRegistry()
+        reg.counter("alerts", "Loud sounds", label="knock").inc(3)
+        reg.histogram("delay", buckets=(1.0,)).observe(0.5)
+        text = reg.prometheus()
+        assert "# TYPE aura_alerts counter" in text
+        assert 'aura_alerts{label="knock"} 3' in text
+        assert 'aura_delay_bucket{le="1.0"} 1' in text
+        assert 'aura_delay_bucket{le="+Inf"} 1' in text
+        assert "aura_delay_count 1" in text
+
+    def test_json_snapshot_and_dump(self, tmp_path):
+        reg = MetricsRegistry()
+        reg.timer("stage_seconds", mode="alerts", stage="loudness").observe(0.002)
+        snap = json.loads(json.dumps(reg.snapshot()))
+        (entry,) = snap["metrics"]
+        assert entry["labels"] == {"mode": "alerts", "stage": "loudness"} and entry["count"] == 1
+        assert "aura_stage_seconds_count" in reg.dump(tmp_path / "m.prom").read_text()
+        assert json.loads(reg.dump(tmp_path / "m.json").read_text())["metrics"]
+
+    def test_summary_lists_recorded_metrics(self):
+        reg = MetricsRegistry()
+        assert "nothing recorded" in reg.summary()
+        reg.timer("stage_seconds", stage="inference").observe(0.02)
+        assert "p95 20.0 ms" in reg.summary()
+
+    def test_disabled_registry_is_free(self):
+        reg = MetricsRegistry(enabled=False)
+        timer = reg.timer("stage_seconds")
+        assert timer is NULL and reg.counter("alerts") is NULL
+
+        def work():
+            return 1
+
+        assert timer(work) is work
+        with timer.time():
+            timer.observe(1.0)
+        assert list(reg) == [] and reg.prometheus() == "\n"
+
+
+@pytest.mark.skipif(not metrics.enabled, reason="AURA_METRICS=0")
+class TestInstrumentation:
+    """Test that the modes feed the process-wide registry"""
+
+    def test_caption_decode_is_timed(self):
+        decode = metrics.timer("stage_seconds", mode="captions", stage="inference")
+        latency = metrics.histogram("caption_latency_seconds")
+        before, latencies = decode.count, latency.count
+        transcriber = StreamingTranscriber(EchoWhisper(), window=1.0, step=0.5, overlap=0.2)
+        transcriber.callback(np.zeros(8000, np.float32))
+        assert transcriber.poll() is not None
+        assert decode.count == before + 1 and latency.count == latencies + 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,103 @@
+"""
+Tests for the shared model registry
+Switching modes should reuse loaded models instead of reloading them
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.model_registry import ModelRegistry, registry
+
+
+class CountingLoader:
+    """Model factory that records how often it is called"""
+
+    def __init__(self, delay=0.0):
+        self.loads = 0
+        self.delay = delay
+
+    def __call__(self):
+        self.loads += 1
+        time.sleep(self.delay)
+        return object()
+
+
+class TestModelRegistry:
+    """Test lazy loading, warm-up and eviction"""
+
+    def test_loads_once_and_warms_up(self):
+        """Second get is a cache hit and warm-up runs only on load"""
+        loader, warmed = CountingLoader(), []
+        reg = ModelRegistry()
+        reg.register("yolo", loader, warmup=warmed.append, size_mb=10)
+        first = reg.get("yolo")
+        assert reg.get("yolo") is first
+        assert loader.loads == 1
+        assert warmed == [first]
+        assert (reg.hits, reg.misses) == (1, 1)
+        assert "yolo" in reg.load_seconds
+
+    def test_unknown_model_raises(self):
+        """Asking for an unregistered model is an error"""
+        with pytest.raises(KeyError):
+            ModelRegistry().get("missing")
+
+    def test_lru_eviction_respects_budget(self):
+        """The least recently used model is dropped when over budget"""
+        reg = ModelRegistry(budget_mb=250)
+        for name in ("a", "b", "c"):
+            reg.register(name, CountingLoader(), size_mb=100)
+        reg.get("a")
+        reg.get("b")
+        reg.get("a")
+        reg.get("c")
+        assert reg.loaded == ["a", "c"]
+        assert reg.resident_mb == 200
+
+    def test_model_larger_than_budget_stays_resident(self):
+        """The model just requested is never evicted"""
+        reg = ModelRegistry(budget_mb=50)
+        reg.register("big", CountingLoader(), size_mb=100)
+        reg.get("big")
+        assert reg.loaded == ["big"]
+
+    def test_background_preload_is_shared_with_foreground_get(self):
+        """A mode started during preload waits for it instead of loading twice"""
+        loader = CountingLoader(delay=0.1)
+        reg = ModelRegistry()
+        reg.register("whisper", loader, size_mb=1)
+        thread = reg.preload("whisper")
+        results = []
+        getter = threading.Thread(target=lambda: results.append(reg.get("whisper")))
+        getter.start()
+        thread.join()
+        getter.join()
+        assert loader.loads == 1
+        assert results[0] is reg.get("whisper")
+
+    def test_preload_failures_are_recorded(self):
+        """Missing libraries do not crash the menu"""
+        def broken():
+            raise ImportError("no ultralytics")
+
+        reg = ModelRegistry()
+        reg.register("yolo", broken)
+        reg.preload("yolo", background=False)
+        assert isinstance(reg.errors["yolo"], ImportError)
+
+    def test_default_models_registered(self):
+        """The shared registry knows the models used by every mode"""
+        for name in ("yolov8n", "yolov8s", "whisper-tiny", "whisper-base"):
+            assert name in registry
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,147 @@
+"""
+Tests for the adaptive quality controller
+A synthetic latency source stands in for real inference timings
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.quality import (SPEECH_LEVELS, VISION_LEVELS, AdaptiveDetector, QualityController,
+                             adapt_transcriber)
+from modules.streaming_stt import StreamingTranscriber
+
+# Seconds per detection at each vision level on a "slow" and a "fast" unit
+SLOW = {"yolov8n": 0.03, "yolov8s": 0.09}
+FAST = {"yolov8n": 0.008, "yolov8s": 0.02}
+
+
+def synthetic_latency(level, costs, rng):
+    """Per-frame latency: model cost scaled by input area, amortised by stride, with jitter"""
+    cost = costs[level.model] * (level.imgsz / 640) ** 2 / level.stride
+    return cost * rng.uniform(0.9, 1.1)
+
+
+def drive(controller, costs, frames, seed=0):
+    rng = np.random.default_rng(seed)
+    for _ in range(frames):
+        controller.observe(synthetic_latency(controller.level, costs, rng))
+
+
+class FakeDetectorModel:
+    names = {0: "person"}
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = []
+
+    def __call__(self, images, **kwargs):
+        self.calls.append(kwargs["imgsz"])
+        return [self.name]
+
+
+class TestQualityController:
+    """Test stepping, hysteresis and switch logging"""
+
+    def test_slow_unit_steps_down_until_within_target(self):
+        log = []
+        controller = QualityController(VISION_LEVELS, target=0.02, log=log.append)
+        drive(controller, SLOW, 600)
+        assert controller.level.name == "n-480"  # 17 ms; n-640 needs 30 ms
+        assert [s.new.name for s in controller.switches] == ["n-640", "n-480"]
+        assert len(log) == 2 and "s-640 → n-640" in log[0]
+
+    def test_fast_unit_steps_up_to_the_best_level(self):
+        controller = QualityController(VISION_LEVELS, target=0.05, start=0, log=lambda _: None)
+        drive(controller, FAST, 600)
+        assert controller.level is VISION_LEVELS[-1]
+        assert all(s.latency < 0.05 * 0.6 for s in controller.switches)
+
+    def test_hysteresis_prevents_oscillation_at_a_boundary(self):
+        """Each level costs just under / just over target; the controller settles"""
+        levels = VISION_LEVELS[2:4]  # n-480 fits the target, n-640 does not
+        controller = QualityController(levels, target=0.025, start=0, window=20, up_below=0.9,
+                                       log=lambda _: None)
+        drive(controller, SLOW, 3000)
+        ups = [s for s in controller.switches if s.new is levels[1]]
+        assert controller.level is levels[0]
+        assert len(ups) <= 7  # each retry waits twice as long as the one before
+
+    def test_no_switch_before_enough_samples(self):
+        controller = QualityController(VISION_LEVELS, target=0.01, min_samples=10, log=lambda _: None)
+        for _ in range(9):
+            assert controller.observe(1.0) is None
+        assert controller.observe(1.0) is VISION_LEVELS[-2]
+
+    def test_listeners_see_each_switch(self):
+        seen = []
+        controller = QualityController(SPEECH_LEVELS, target=1.0, window=4, min_samples=2, log=lambda _: None)
+        controller.on_change(seen.append)
+        controller.observe(3.0)
+        controller.observe(3.0)
+        assert seen == [SPEECH_LEVELS[1]]
+
+    def test_invalid_hysteresis_band(self):
+        with pytest.raises(ValueError):
+            QualityController(VISION_LEVELS, target=0.1, up_below=1.5)
+
+
+class TestAdaptiveDetector:
+    """Test that levels change the model, input size and stride"""
+
+    def test_stride_reuses_results_and_reports_zero_cost(self):
+        ticks = iter(np.arange(0, 100, 0.05))
+        controller = QualityController(VISION_LEVELS, target=1.0, start="n-320/3", log=lambda _: None)
+        detector = AdaptiveDetector(controller, load=FakeDetectorModel, clock=lambda: next(ticks))
+        frame = np.zeros((48, 64, 3), np.uint8)
+        for _ in range(6):
+            detector(frame)
+        model = detector.detector(controller.level).model
+        assert model.calls == [320, 320]
+        assert list(controller._samples) == pytest.approx([0.05, 0.0, 0.0, 0.05, 0.0, 0.0])
+
+    def test_detect_ignores_the_stride(self):
+        """Callers that track between detections get a fresh result every call"""
+        ticks = iter(np.arange(0, 100, 0.05))
+        controller = QualityController(VISION_LEVELS, target=1.0, start="n-320/3", log=lambda _: None)
+        detector = AdaptiveDetector(controller, load=FakeDetectorModel, clock=lambda: next(ticks))
+        frame = np.zeros((48, 64, 3), np.uint8)
+        for _ in range(3):
+            detector.detect(frame)
+        assert detector.detector(controller.level).model.calls == [320, 320, 320]
+        assert list(controller._samples) == pytest.approx([0.05, 0.05, 0.05])
+
+    def test_switch_loads_the_next_model(self):
+        controller = QualityController(VISION_LEVELS, target=0.01, window=2, min_samples=1, log=lambda _: None)
+        loaded = []
+        detector = AdaptiveDetector(controller, load=lambda name: loaded.append(name) or FakeDetectorModel(name),
+                                    clock=iter(np.arange(0, 10, 0.5)).__next__)
+        frame = np.zeros((48, 64, 3), np.uint8)
+        assert detector(frame) == ["yolov8s"]
+        assert controller.level.name == "n-640"
+        assert detector(frame) == ["yolov8n"]
+        assert loaded == ["yolov8s", "yolov8n"]
+
+
+class TestSpeechAdaptation:
+    """Test Whisper size and window changes on a live transcriber"""
+
+    def test_levels_apply_to_transcriber(self):
+        controller = QualityController(SPEECH_LEVELS, target=1.0, window=2, min_samples=1, log=lambda _: None)
+        transcriber = StreamingTranscriber(object())
+        adapt_transcriber(transcriber, controller, load=lambda name: name)
+        assert transcriber.model == "whisper-base"
+        controller.observe(2.0)
+        controller.observe(2.0)
+        assert transcriber.model == "whisper-tiny"
+        assert transcriber.window_samples == 3 * 16000 and transcriber.step_samples == 16000
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,51 @@
+"""
+Soak tests: every mode's real loop on long replayed input
+Input is synthetic and unpaced, so a short run covers minutes of audio or video.
+Set AURA_SOAK_SECONDS (e.g. 14400) to soak each mode for hours of input instead.
+"""
+
+import math
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.replay import MODES, soak
+
+SECONDS = float(os.environ.get("AURA_SOAK_SECONDS", "60"))
+MAX_DRIFT = 2.0  # late latency over early latency
+MAX_GROWTH_MB = 25.0
+
+
+@pytest.fixture(autouse=True)
+def event_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("AURA_EVENT_DIR", str(tmp_path))
+
+
+class TestSoak:
+    """Test throughput, latency drift and memory growth per mode"""
+
+    @pytest.mark.parametrize("mode", list(MODES))
+    def test_mode_holds_up(self, mode):
+        if mode.endswith("object_detection"):
+            pytest.importorskip("cv2")
+        report = soak(mode, seconds=SECONDS, interval=0.05)
+        assert report["errors"] == []
+        assert report["input_s"] == pytest.approx(SECONDS, rel=0.02)
+        assert report["throughput"] > 0 and report["samples"] >= 3
+        assert not math.isnan(report["latency_drift"]) and report["latency_drift"] < MAX_DRIFT
+        assert report["memory_growth_mb"] < MAX_GROWTH_MB
+
+    def test_paced_replay_keeps_real_time_ratio(self):
+        report = soak("sound_alert", seconds=3, speed=10.0, interval=0.05)
+        assert report["errors"] == []
+        assert 5 < report["throughput"] <= 11  # audio seconds per wall second
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
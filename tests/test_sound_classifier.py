@@ -0,0 +1,104 @@
+"""
+Tests for the spectral sound classifier that labels loud-sound alerts
+Synthetic alarms, sirens, doorbells and knocks stand in for recordings
+"""
+
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules import synthetic_audio
+from modules.loudness import LoudnessMonitor
+from modules.ring_buffer import AudioRingBuffer
+from modules.sound_classifier import DEFAULT_LABEL, EventLabeler, SoundClassifier, mel_filterbank
+
+SR = 16000
+
+
+def in_room(sound, noise=0.01, lead=0.1, seed=0):
+    """Put a clip after a short lead-in and mix in room noise"""
+    audio = np.concatenate([np.zeros(int(lead * SR), np.float32), sound])
+    return audio + synthetic_audio.background(len(audio) / SR, level=noise, seed=seed)
+
+
+class TestSoundClassifier:
+    """Test the feature detectors on synthetic clips"""
+
+    @pytest.mark.parametrize("label", list(synthetic_audio.SOUNDS))
+    @pytest.mark.parametrize("noise", [0.0, 0.01])
+    def test_labels_synthetic_sounds(self, label, noise):
+        clip = in_room(synthetic_audio.SOUNDS[label](), noise)[:int(0.9 * SR)]
+        assert SoundClassifier().classify(clip).label == label
+
+    def test_plain_tone_and_noise_stay_generic(self):
+        """A steady test tone or a burst of noise is not guessed at"""
+        t = np.arange(SR) / SR
+        rng = np.random.default_rng(0)
+        for clip in (0.5 * np.sin(2 * np.pi * 1000 * t), rng.normal(0, 0.3, SR)):
+            assert SoundClassifier().classify(clip.astype(np.float32)).label == DEFAULT_LABEL
+
+    def test_batch_matches_single(self):
+        """Clips of different lengths share one FFT without changing results"""
+        classifier = SoundClassifier()
+        clips = [synthetic_audio.siren(0.9), synthetic_audio.knock(0.7), synthetic_audio.smoke_alarm(1.2)]
+        batch = classifier.classify_batch(clips)
+        for clip, result in zip(clips, batch):
+            single = classifier.classify(clip)
+            assert result.label == single.label
+            assert result.confidence == pytest.approx(single.confidence, abs=1e-6)
+
+    def test_mel_filterbank_covers_spectrum(self):
+        bank = mel_filterbank(SR, 512, 40)
+        assert bank.shape == (40, 257)
+        assert (bank.max(axis=1) > 0.5).all()
+
+    def test_within_realtime_budget(self):
+        """Classifying costs a small fraction of the audio's duration"""
+        classifier = SoundClassifier()
+        clips = [synthetic_audio.SOUNDS[label](1.0) for label in synthetic_audio.SOUNDS] * 4
+        start = time.process_time()
+        classifier.classify_batch(clips)
+        cpu = time.process_time() - start
+        assert cpu / len(clips) < 0.1
+
+
+class TestEventLabeler:
+    """Test labelling of loud events from the streaming ring buffer"""
+
+    def test_waits_for_context_then_labels(self):
+        monitor = LoudnessMonitor()
+        history = AudioRingBuffer(4 * SR)
+        labeler = EventLabeler(SoundClassifier(), history, after=0.8)
+        audio = in_room(synthetic_audio.doorbell(1.5), lead=0.5)
+        labelled = []
+        for start in range(0, len(audio), 160):
+            block = audio[start:start + 160, None]
+            history.write(block)
+            monitor.callback(block)
+            while not monitor.alerts.empty():
+                event = monitor.alerts.get()
+                labeler.add(event)
+                assert labeler.ready() == []
+            labelled += labeler.ready()
+        assert [e.label for e in labelled] == ["doorbell"]
+        assert labelled[0].confidence > 0.5
+
+    def test_flush_labels_short_recordings(self):
+        history = AudioRingBuffer(4 * SR)
+        history.write(in_room(synthetic_audio.knock(0.6)))
+        labeler = EventLabeler(SoundClassifier(), history, after=0.8)
+        labeler.add(type("Event", (), {"onset": 0.1, "label": None})())
+        assert labeler.ready() == []
+        event, = labeler.ready(flush=True)
+        assert event.label == "knock"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,123 @@
+"""
+Tests for streaming speech-to-text (live captions for deaf users)
+Runs fully offline: WAV files go through the same ring-buffer path as the microphone
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.audio_io import load_wav, save_wav
+from modules.ring_buffer import AudioRingBuffer
+from modules.streaming_stt import StreamingTranscriber, transcribe_file
+
+
+class FakeWhisper:
+    """Stands in for a Whisper model: 'transcribes' the window length"""
+
+    def __init__(self):
+        self.calls = []
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append(len(audio))
+        return {"text": f" {len(audio) / 16000:.1f} seconds"}
+
+
+class TestAudioRingBuffer:
+    """Test the preallocated capture buffer"""
+
+    def test_wraparound_keeps_newest_samples(self):
+        """Reads across the wrap point return samples in order"""
+        ring = AudioRingBuffer(10)
+        ring.write(np.arange(7, dtype=np.float32))
+        ring.write(np.arange(7, 14, dtype=np.float32))
+        assert ring.written == 14
+        assert ring.oldest == 4
+        np.testing.assert_array_equal(ring.latest(10), np.arange(4, 14))
+        np.testing.assert_array_equal(ring.read(8, 12), np.arange(8, 12))
+
+    def test_oversized_block_and_stale_reads_are_clamped(self):
+        """Blocks larger than the buffer keep only the tail"""
+        ring = AudioRingBuffer(4)
+        ring.write(np.arange(10, dtype=np.float32)[:, None])
+        assert ring.written == 10
+        np.testing.assert_array_equal(ring.read(0, 10), np.arange(6, 10))
+
+
+class TestStreamingTranscriber:
+    """Test incremental decoding of overlapping windows"""
+
+    def test_partial_captions_then_final(self):
+        """Partials arrive every step and a final caption closes each window"""
+        model = FakeWhisper()
+        stt = StreamingTranscriber(model, window=2.0, step=0.5, overlap=0.5)
+        captions = []
+        for _ in range(50):
+            stt.callback(np.zeros((1600, 1), dtype=np.float32))
+            caption = stt.poll()
+            if caption:
+                captions.append(caption)
+
+        partials = [c for c in captions if not c.final]
+        finals = [c for c in captions if c.final]
+        assert partials and finals
+        assert partials[0].text == "0.5 seconds"
+        assert finals[0].end - finals[0].start == pytest.approx(2.0)
+        # next window re-decodes the overlap so boundary words are not cut
+        assert finals[1].start == pytest.approx(finals[0].end - 0.5)
+
+    def test_flush_finalises_trailing_audio(self):
+        """Audio left when the stream stops still gets a final caption"""
+        stt = StreamingTranscriber(FakeWhisper(), window=5.0, step=0.5)
+        stt.callback(np.zeros(4000, dtype=np.float32))
+        caption = stt.flush()
+        assert caption.final
+        assert stt.flush() is None
+
+    def test_latency_is_measured_from_newest_sample(self):
+        """Caption latency covers the decode time after the audio arrived"""
+        now = [0.0]
+
+        class SlowModel(FakeWhisper):
+            def transcribe(self, audio, **kwargs):
+                now[0] += 0.25
+                return super().transcribe(audio)
+
+        stt = StreamingTranscriber(SlowModel(), step=0.5, clock=lambda: now[0])
+        stt.callback(np.zeros(8000, dtype=np.float32))
+        caption = stt.poll()
+        assert caption.latency == pytest.approx(0.25)
+        assert stt.latency_stats()["p95"] == pytest.approx(0.25)
+
+
+class TestTranscribeFile:
+    """Test offline captioning of recorded WAV files"""
+
+    def test_wav_round_trip(self, tmp_path):
+        """Saved audio loads back at the requested sample rate"""
+        tone = 0.5 * np.sin(2 * np.pi * 440 * np.arange(8000) / 8000).astype(np.float32)
+        path = tmp_path / "tone.wav"
+        save_wav(path, tone, samplerate=8000)
+        audio = load_wav(path, samplerate=16000)
+        assert len(audio) == 16000
+        assert np.abs(audio).max() == pytest.approx(0.5, abs=0.01)
+
+    def test_file_goes_through_ring_buffer(self, tmp_path):
+        """A 3-second file produces partials, finals and latency stats"""
+        path = tmp_path / "speech.wav"
+        save_wav(path, np.zeros(3 * 16000, dtype=np.float32))
+        captions, stats = transcribe_file(path, FakeWhisper(), window=2.0, step=0.5, overlap=0.5)
+        assert any(not c.final for c in captions)
+        assert captions[-1].final
+        assert captions[-1].end == pytest.approx(3.0)
+        assert stats["count"] == len(captions)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
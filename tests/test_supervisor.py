@@ -0,0 +1,205 @@
+"""
+Tests for the asyncio supervisor that runs several modes at once
+File-backed sources and fake models stand in for the microphone, camera and weights
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules import synthetic_audio
+from modules.audio_bus import AudioBus, FileCapture
+from modules.frame_bus import VideoSource
+from modules.model_registry import registry
+from modules.replay import Result
+from modules.supervisor import Supervisor, captions, detection, format_report, sound_alerts
+
+SR = 16000
+
+
+class FakeWhisper:
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe(self, audio, **kwargs):
+        self.calls += 1
+        return {"text": "hello"}
+
+
+class FakeYolo:
+    names = {0: "person", 56: "chair"}
+
+    def __call__(self, images, **kwargs):
+        images = images if isinstance(images, list) else [images]
+        return [Result(self.names, [[10, 10, 50, 80, 0.9, 56]], image) for image in images]
+
+
+def voiced(seconds):
+    t = np.arange(int(seconds * SR)) / SR
+    return sum(0.1 / k * np.sin(2 * np.pi * 140 * k * t) for k in range(1, 12)).astype(np.float32)
+
+
+@pytest.fixture(autouse=True)
+def event_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("AURA_EVENT_DIR", str(tmp_path / "events"))
+    return tmp_path / "events"
+
+
+@pytest.fixture
+def fake_models():
+    whisper = FakeWhisper()
+    registry.register("fake-whisper", lambda: whisper)
+    registry.register("fake-yolo", FakeYolo)
+    yield whisper
+    registry.evict("fake-whisper")
+    registry.evict("fake-yolo")
+
+
+class TestSupervisor:
+    """Test concurrency, shared sources and cancellation"""
+
+    def test_audio_consumers_share_one_stream(self, fake_models, capsys):
+        """Captions and alerts both see every block of the same microphone"""
+        audio = np.concatenate([voiced(2.0), synthetic_audio.doorbell(1.5), np.zeros(SR, np.float32)])
+        sup = Supervisor(mic=AudioBus(FileCapture(audio), SR))
+        sup.add("captions", captions(model="fake-whisper", window=2.0, step=0.5, overlap=0.5))
+        sup.add("alerts", sound_alerts())
+        report = asyncio.run(sup.run(duration=10))
+
+        out = capsys.readouterr().out
+        assert "📝 hello" in out
+        assert "LOUD SOUND DETECTED" in out and "DOORBELL" in out
+        assert fake_models.calls > 0
+        assert report["captions"]["items"] > 0 and report["alerts"]["items"] >= 1
+        assert all(r["error"] is None and r["overruns"] == 0 for r in report.values())
+
+    def test_slow_captions_catch_up(self):
+        """A decode slower than the step covers all audio that arrived meanwhile"""
+        calls = []
+
+        class SlowWhisper:
+            def transcribe(self, audio, **kwargs):
+                calls.append(len(audio))
+                time.sleep(0.3)
+                return {"text": "hello"}
+
+        registry.register("slow-whisper", SlowWhisper)
+        try:
+            audio = np.tile(voiced(2.0), 4)
+            sup = Supervisor(mic=AudioBus(FileCapture(audio, realtime=True, speed=4.0), SR))
+            sup.add("captions", captions(model="slow-whisper", window=5.0, step=0.5, overlap=1.0, use_vad=False))
+            report = asyncio.run(sup.run(duration=10))
+        finally:
+            registry.evict("slow-whisper")
+        assert report["captions"]["error"] is None
+        assert 0 < len(calls) < 10  # one decode per 0.5 s step would be ~16
+
+    def test_consumers_write_the_event_log(self, fake_models, event_dir, capsys):
+        """Transcripts, alerts and detections from combined mode are saved"""
+        from modules.event_log import EventLog
+        audio = np.concatenate([voiced(2.0), synthetic_audio.doorbell(1.5), np.zeros(SR, np.float32)])
+        frames = [np.full((48, 64, 3), 100, np.uint8)] * 5
+        camera = VideoSource(frames, fps=100).open_bus()
+        sup = Supervisor(mic=AudioBus(FileCapture(audio), SR), camera=camera)
+        sup.add("captions", captions(model="fake-whisper", window=2.0, step=0.5, overlap=0.5))
+        sup.add("alerts", sound_alerts())
+        sup.add("detection", detection(model="fake-yolo", config=None, max_stale=60))
+        try:
+            asyncio.run(sup.run(duration=10))
+        finally:
+            camera.release()
+        log = EventLog(event_dir)
+        assert "hello" in [text for _, text in log.transcripts()]
+        assert "doorbell" in [log.labels[i] for i in log.query(kind="alert")["label"]]
+        assert [log.labels[i] for i in log.query(kind="detection")["label"]] == ["chair"]
+
+    def test_combined_mode_runs_on_replayed_devices(self, capsys):
+        """Combined mode opens its microphone and camera through the device layer"""
+        from modules import supervisor
+        from modules.devices import ReplayDevices
+        from modules.replay import alert_scene
+        devices = ReplayDevices(audio=alert_scene(6), speed=None)
+        sup = supervisor.build(["alerts", "detection"], devices=devices)
+        sup.camera.release()
+        assert len(devices.microphones) == 1 and len(devices.cameras) == 1
+        assert sup.camera.shape == (480, 640, 3)
+
+        devices = ReplayDevices(audio=alert_scene(6), speed=None)
+        report = supervisor.run(["alerts"], duration=10, devices=devices)
+        assert "LOUD SOUND DETECTED" in capsys.readouterr().out
+        assert report["alerts"]["items"] >= 1 and devices.input_seconds == pytest.approx(6.0)
+
+    def test_detection_reports_changes_only(self, fake_models, capsys):
+        frames = [np.full((48, 64, 3), 100, np.uint8)] * 5
+        camera = VideoSource(frames, fps=100).open_bus()
+        sup = Supervisor(camera=camera)
+        sup.add("detection", detection(model="fake-yolo", config=None))
+        try:
+            report = asyncio.run(sup.run(duration=10))
+        finally:
+            camera.release()
+        assert capsys.readouterr().out.count("🎯 Detected: chair") == 1
+        assert report["detection"]["items"] >= 1
+        assert "detection" in format_report(report)
+
+    def test_blocking_work_does_not_stall_other_tasks(self):
+        ticks = []
+
+        async def slow(sup, stats):
+            await sup.offload(stats, time.sleep, 0.3)
+
+        async def ticker(sup, stats):
+            while True:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+
+        sup = Supervisor().add("slow", slow).add("ticker", ticker)
+        asyncio.run(sup.run(duration=0.3))
+        assert len(ticks) > 10
+
+    def test_stop_cancels_tasks_cleanly(self):
+        cleaned = []
+
+        async def forever(sup, stats):
+            try:
+                await asyncio.Event().wait()
+            finally:
+                cleaned.append(True)
+
+        sup = Supervisor().add("forever", forever)
+        threading.Timer(0.1, sup.stop).start()
+        started = time.monotonic()
+        asyncio.run(sup.run())
+        assert cleaned == [True]
+        assert time.monotonic() - started < 2.0
+
+    def test_failing_task_does_not_stop_others(self, capsys):
+        async def broken(sup, stats):
+            raise RuntimeError("boom")
+
+        async def worker(sup, stats):
+            for _ in range(3):
+                with stats.cpu():
+                    sum(range(10000))
+                stats.record(0.001)
+                await asyncio.sleep(0.01)
+
+        sup = Supervisor().add("broken", broken).add("worker", worker)
+        report = asyncio.run(sup.run(duration=5))
+        assert "❌ Error in broken: boom" in capsys.readouterr().out
+        assert report["worker"]["items"] == 3
+        assert report["worker"]["cpu_s"] > 0
+        assert 0 < report["worker"]["cpu_share"] <= 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
@@ -0,0 +1,125 @@
+"""
+Tests for the multi-object tracker
+Only objects entering or leaving the scene should be announced to blind users
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.tracker import IoUTracker, centroid_distance, draw_tracks, greedy_assign, iou_matrix
+
+PERSON, CHAIR = 0, 56
+
+
+class TestAssociation:
+    """Test the vectorized cost matrix helpers"""
+
+    def test_iou_matrix(self):
+        a = np.array([[0, 0, 10, 10]])
+        b = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]])
+        np.testing.assert_allclose(iou_matrix(a, b), [[1.0, 50 / 150, 0.0]])
+        assert iou_matrix(np.zeros((0, 4)), b).shape == (0, 3)
+
+    def test_centroid_distance_is_scale_free(self):
+        a = np.array([[0, 0, 30, 40]])
+        b = np.array([[50, 0, 80, 40]])
+        assert centroid_distance(a, b)[0, 0] == pytest.approx(1.0)
+
+    def test_greedy_assign_prefers_cheapest_pairs(self):
+        cost = np.array([[0.1, 0.2], [0.15, 0.9]])
+        rows, cols = greedy_assign(cost, max_cost=0.5)
+        assert dict(zip(rows.tolist(), cols.tolist())) == {0: 0}
+
+
+class TestIoUTracker:
+    """Test track lifecycle"""
+
+    def test_static_scene_appears_once(self):
+        """A person standing still is announced once, not every frame"""
+        tracker = IoUTracker(min_hits=2)
+        box = [[100, 100, 200, 300]]
+        appeared = []
+        for _ in range(10):
+            appeared += tracker.update(box, [PERSON]).appeared
+        assert len(appeared) == 1
+        assert len(tracker.visible()) == 1
+
+    def test_ids_follow_moving_objects(self):
+        """A walking person keeps the same track id"""
+        tracker = IoUTracker(min_hits=1)
+        ids = set()
+        for step in range(10):
+            x = 100 + step * 15
+            update = tracker.update([[x, 100, x + 100, 300]], [PERSON])
+            ids.update(t.id for t in update.tracks)
+        assert ids == {1}
+
+    def test_fast_mover_matched_by_centroid(self):
+        """No overlap between frames still keeps the track"""
+        tracker = IoUTracker(min_hits=1, max_centroid=0.8)
+        tracker.update([[0, 0, 50, 50]], [PERSON])
+        update = tracker.update([[52, 0, 102, 50]], [PERSON])
+        assert [t.id for t in update.tracks] == [1]
+        assert not update.appeared
+
+    def test_classes_are_not_mixed(self):
+        """A chair in the same place as a person is a new object"""
+        tracker = IoUTracker(min_hits=1)
+        tracker.update([[0, 0, 50, 50]], [PERSON])
+        update = tracker.update([[0, 0, 50, 50], [0, 0, 50, 50]], [PERSON, CHAIR])
+        assert [t.cls for t in update.appeared] == [CHAIR]
+
+    def test_departure_after_missed_frames(self):
+        """An object is reported gone once it has been missing long enough"""
+        tracker = IoUTracker(min_hits=1, max_missed=2)
+        tracker.update([[0, 0, 50, 50]], [CHAIR])
+        departed = []
+        for _ in range(4):
+            departed += tracker.update(np.zeros((0, 4)), []).departed
+        assert [t.cls for t in departed] == [CHAIR]
+        assert tracker.tracks == []
+
+    def test_unconfirmed_flicker_is_silent(self):
+        """A one-frame false positive neither appears nor departs"""
+        tracker = IoUTracker(min_hits=2, max_missed=0)
+        assert not tracker.update([[0, 0, 50, 50]], [CHAIR]).appeared
+        assert not tracker.update(np.zeros((0, 4)), []).departed
+
+    def test_predict_moves_tracks_between_detections(self):
+        """Skipped frames extrapolate along the last motion"""
+        tracker = IoUTracker(min_hits=1)
+        tracker.update([[0, 0, 50, 50]], [PERSON])
+        tracker.update([[30, 0, 80, 50]], [PERSON])
+        update = tracker.predict(steps=1 / 3)
+        np.testing.assert_allclose(update.tracks[0].box, [40, 0, 90, 50])
+
+    def test_predictions_do_not_skew_velocity(self):
+        """Velocity comes from detected boxes, not the predicted ones in between"""
+        tracker = IoUTracker(min_hits=1)
+        for x in range(0, 150, 30):
+            update = tracker.update([[x, 0, x + 50, 50]], [PERSON])
+            np.testing.assert_allclose(update.tracks[0].box, [x, 0, x + 50, 50])
+            for _ in range(2):
+                update = tracker.predict(steps=1 / 3)
+        np.testing.assert_allclose(update.tracks[0].velocity, [30, 0, 30, 0])
+        np.testing.assert_allclose(update.tracks[0].box, [140, 0, 190, 50])
+
+    def test_draw_tracks(self):
+        """Overlay works on the tracked frames where YOLO did not run"""
+        pytest.importorskip("cv2")
+        tracker = IoUTracker(min_hits=1)
+        update = tracker.update([[10, 10, 40, 40]], [PERSON])
+        frame = np.zeros((64, 64, 3), np.uint8)
+        canvas = draw_tracks(frame, update.tracks, {PERSON: "person"})
+        assert canvas.any() and not frame.any()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])
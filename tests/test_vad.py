@@ -0,0 +1,134 @@
+"""
+Tests for the voice activity gate in front of Whisper
+Silence and background hum should never reach the speech model
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from modules.streaming_stt import StreamingTranscriber
+from modules.vad import VoiceActivityDetector
+
+SR = 16000
+
+
+def voiced(seconds, f0=140.0):
+    """Harmonic signal with a speech-like spectrum"""
+    t = np.arange(int(seconds * SR)) / SR
+    return sum(0.1 / k * np.sin(2 * np.pi * f0 * k * t) for k in range(1, 12)).astype(np.float32)
+
+
+def hum(seconds, freq=60.0):
+    """Mains hum from a fridge or fan"""
+    t = np.arange(int(seconds * SR)) / SR
+    return (0.2 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+class TestVoiceActivityDetector:
+    """Test the frame-level speech decision"""
+
+    def test_silence_hum_and_noise_are_rejected(self):
+        """Background sounds produce no speech frames"""
+        vad = VoiceActivityDetector()
+        rng = np.random.default_rng(0)
+        for audio in (np.zeros(SR, dtype=np.float32), hum(1.0),
+                      rng.normal(0, 0.05, SR).astype(np.float32)):
+            assert not vad.speech_mask(audio).any()
+
+    def test_speech_segment_is_trimmed_and_padded(self):
+        """Only the speech plus padding is kept"""
+        vad = VoiceActivityDetector(pad_ms=200, hangover_ms=0)
+        audio = np.concatenate([np.zeros(2 * SR, np.float32), voiced(1.0), np.zeros(2 * SR, np.float32)])
+        (start, stop), = vad.segments(audio)
+        assert start == pytest.approx(2 * SR - 0.2 * SR, abs=vad.frame)
+        assert stop == pytest.approx(3 * SR + 0.2 * SR, abs=vad.frame)
+
+    def test_hangover_bridges_short_pauses(self):
+        """A pause shorter than the hangover does not split the segment"""
+        gap = np.zeros(int(0.15 * SR), np.float32)
+        audio = np.concatenate([voiced(0.5), gap, voiced(0.5)])
+        assert len(VoiceActivityDetector(pad_ms=0, hangover_ms=300).segments(audio)) == 1
+        assert len(VoiceActivityDetector(pad_ms=0, hangover_ms=0).segments(audio)) == 2
+
+    def test_counters_track_seconds_saved(self):
+        """Dropped and decoded seconds add up to the input"""
+        vad = VoiceActivityDetector(pad_ms=0, hangover_ms=0)
+        vad.extract(np.zeros(3 * SR, np.float32))
+        vad.extract(voiced(1.0))
+        stats = vad.stats
+        assert stats["blocks_skipped"] == 1
+        assert stats["seconds_in"] == pytest.approx(4.0)
+        assert stats["seconds_decoded"] + stats["seconds_dropped"] == pytest.approx(4.0)
+        assert stats["fraction_saved"] > 0.7
+
+
+class TestGatedStreaming:
+    """Test the gate inside live captioning"""
+
+    def test_silent_windows_never_reach_the_model(self):
+        """Whisper is only called once speech arrives"""
+        calls = []
+
+        class Model:
+            def transcribe(self, audio, **kwargs):
+                calls.append(len(audio))
+                return {"text": "hello"}
+
+        stt = StreamingTranscriber(Model(), window=2.0, step=0.5, vad=VoiceActivityDetector())
+        for block in np.split(hum(3.0), 30):
+            stt.callback(block)
+            stt.poll()
+        assert calls == []
+
+        stt.callback(voiced(0.5))
+        assert stt.poll().text == "hello"
+        assert len(calls) == 1
+
+    def test_silent_final_window_finalises_last_caption(self):
+        """A partial caption is not left dangling when the final window is rejected"""
+        class ScriptedVad:
+            def __init__(self, *bounds):
+                self.bounds = list(bounds)
+
+            def trim_bounds(self, audio, new=None):
+                return self.bounds.pop(0)
+
+        class Model:
+            def transcribe(self, audio, **kwargs):
+                return {"text": "hello"}
+
+        stt = StreamingTranscriber(Model(), window=2.0, step=0.5, vad=ScriptedVad((0, SR // 2), (0, 0)))
+        stt.callback(voiced(0.5))
+        partial = stt.poll()
+        assert partial.text == "hello" and not partial.final
+        stt.callback(np.zeros(int(1.5 * SR), np.float32))
+        final = stt.poll()
+        assert final.text == "hello" and final.final
+        assert stt.flush() is None
+
+    def test_redecoded_audio_is_counted_once(self):
+        """Growing and overlapping windows don't inflate the seconds counters"""
+        class Model:
+            def transcribe(self, audio, **kwargs):
+                return {"text": "hello"}
+
+        vad = VoiceActivityDetector()
+        stt = StreamingTranscriber(Model(), window=2.0, step=0.5, overlap=0.5, vad=vad)
+        for block in np.split(np.concatenate([voiced(2.0), hum(2.0)]), 8):
+            stt.callback(block)
+            stt.poll()
+        stats = vad.stats
+        assert stats["seconds_in"] == pytest.approx(4.0)
+        assert stats["seconds_decoded"] + stats["seconds_dropped"] == pytest.approx(4.0)
+        assert stats["seconds_dropped"] > 1.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v", "--tb=short"])